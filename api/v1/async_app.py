@@ -0,0 +1,333 @@
+#!/usr/bin/python3
+""" ASGI Application, the API served on the asyncio storage
+
+The endpoints of api.v1.app, whose views await the storage instead of
+blocking a thread on it, so that the requests in flight are limited by
+the database connections and not by threads. The lists are read, paged
+and encoded through the helpers of api.v1.views.pagination, as in
+api.v1.app. Run it with an ASGI server, for example:
+uvicorn api.v1.async_app:app
+"""
+from api.v1.views.pagination import STREAM_BATCH, encode_page
+from api.v1.views.pagination import encode_piece, end_piece, parse_limit
+from api.v1.views.pagination import related_page
+from collections import namedtuple
+from datetime import datetime
+import json
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from os import environ
+import re
+from urllib.parse import parse_qs
+
+
+def async_storage():
+    """Return the asyncio storage of the storage models uses."""
+    if models.storage_t == "db":
+        from models.engine.async_db_storage import AsyncDBStorage
+        if models.engine_t == "sqlite":
+            return AsyncDBStorage('sqlite+aiosqlite:///' +
+                                  environ.get('HBNB_SQLITE_PATH', 'hbnb.db'))
+        return AsyncDBStorage()
+    from models.engine.async_file_storage import AsyncFileStorage
+    return AsyncFileStorage(models.storage)
+
+
+storage = async_storage()
+
+# cls: the class of the objects of the collection
+# parent: the collection the objects are listed and created under, with
+#     their key to it, or None for a top level collection
+# required: the keys a new object needs
+# references: keys of a new object that must name an existing object
+# ignore: the keys PUT does not change
+Resource = namedtuple("Resource",
+                      "cls parent key required references ignore")
+resources = {
+    "amenities": Resource(Amenity, None, None, ["name"], {}, []),
+    "cities": Resource(City, "states", "state_id", ["name"], {},
+                       ["state_id"]),
+    "places": Resource(Place, "cities", "city_id", ["user_id", "name"],
+                       {"user_id": User}, ["user_id", "city_id"]),
+    "states": Resource(State, None, None, ["name"], {}, []),
+    "users": Resource(User, None, None, ["email", "password"], {},
+                      ["email"]),
+}
+names = {"amenities": Amenity, "cities": City, "places": Place,
+         "reviews": Review, "states": State, "users": User}
+
+
+class HTTPError(Exception):
+    """ An error answered with a JSON body """
+
+    def __init__(self, status, message):
+        """Instantiate an HTTPError of status with message"""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def resource(name, top_level=False):
+    """Return the Resource of collection name, 404 if there is none."""
+    if name not in resources or top_level and resources[name].parent:
+        raise HTTPError(404, "Not found")
+    return resources[name]
+
+
+async def get_or_404(cls, id):
+    """Return the cls object with id, 404 if there is none."""
+    obj = await storage.get(cls, id)
+    if obj is None:
+        raise HTTPError(404, "Not found")
+    return obj
+
+
+def page_args(query):
+    """Read the ?limit=&cursor= arguments, 400 for a bad limit."""
+    try:
+        limit = parse_limit(query.get('limit', [None])[0])
+    except ValueError as error:
+        raise HTTPError(400, str(error))
+    return limit, query.get('cursor', [None])[0]
+
+
+def paged(objs, limit):
+    """Return the JSON list of a page of objects and its headers.
+
+    objs has one more object than limit when there is a next page, whose
+    cursor goes in the X-Next-Cursor header, see encode_page().
+    """
+    body, cursor = encode_page(objs, limit)
+    headers = []
+    if cursor is not None:
+        headers.append((b"x-next-cursor", cursor.encode()))
+    return 200, body, headers
+
+
+async def streamed(objs):
+    """Yield the JSON list of the objects of the asynchronous iterator
+    objs, STREAM_BATCH objects at a time, see streamed_response()."""
+    empty = True
+    batch = []
+    async for obj in objs:
+        batch.append(obj)
+        if len(batch) == STREAM_BATCH:
+            yield encode_piece(batch, empty)
+            empty = False
+            batch = []
+    if batch:
+        yield encode_piece(batch, empty)
+        empty = False
+    yield end_piece(empty)
+
+
+async def status_api(request):
+    """ Status of API """
+    return 200, {"status": "OK"}, []
+
+
+async def counter_api(request):
+    """ Retrieves the number of each objects by type """
+    # live counters, as in api.v1.app, no query on each request
+    counts = await storage.counts()
+    return 200, {name: counts[cls.__name__]
+                 for name, cls in names.items()}, []
+
+
+async def list_objects(request, name):
+    """Return a top level collection, a page of it with ?limit=&cursor=.
+
+    The whole collection is streamed as it is read, see streamed().
+    """
+    cls = resource(name, True).cls
+    limit, cursor = page_args(request["query"])
+    if limit is None and cursor is None:
+        return 200, streamed(storage.iter(cls)), []
+    objs = await storage.all(cls, limit=None if limit is None else limit + 1,
+                             after=cursor)
+    return paged(list(objs.values()), limit)
+
+
+async def list_related(request, parent, parent_id, name):
+    """Return the objects of collection name under a parent object.
+
+    A page is read by a keyset query bounded by limit, see related_page().
+    """
+    child = resource(name)
+    if child.parent != parent:
+        raise HTTPError(404, "Not found")
+    limit, cursor = page_args(request["query"])
+    await get_or_404(resource(parent).cls, parent_id)
+    objs = await storage.filter(child.cls, **related_page(
+        child.key, parent_id, limit, cursor))
+    return paged(list(objs.values()), limit)
+
+
+async def get_object(request, name, id):
+    """Return an object of collection name."""
+    obj = await get_or_404(resource(name).cls, id)
+    return 200, obj.to_dict(), []
+
+
+async def delete_object(request, name, id):
+    """Delete an object of collection name."""
+    obj = await get_or_404(resource(name).cls, id)
+    await storage.delete(obj)
+    await storage.save()
+    return 200, {}, []
+
+
+async def create(data, name, **keys):
+    """Create an object of collection name from the JSON data of a POST."""
+    res = resources[name]
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Not a JSON")
+    for key in res.required:
+        if key not in data:
+            raise HTTPError(400, "Missing {}".format(key))
+    for key, cls in res.references.items():
+        await get_or_404(cls, data[key])
+    data.update(keys)
+    obj = res.cls(**data)
+    storage.new(obj)
+    await storage.save()
+    return 201, obj.to_dict(), []
+
+
+async def create_object(request, name):
+    """Create an object of a top level collection."""
+    resource(name, True)
+    return await create(request["json"], name)
+
+
+async def create_related(request, parent, parent_id, name):
+    """Create an object of collection name under a parent object."""
+    child = resource(name)
+    if child.parent != parent:
+        raise HTTPError(404, "Not found")
+    await get_or_404(resource(parent).cls, parent_id)
+    return await create(request["json"], name, **{child.key: parent_id})
+
+
+async def update_object(request, name, id):
+    """Update an object of collection name."""
+    res = resource(name)
+    obj = await get_or_404(res.cls, id)
+    data = request["json"]
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Not a JSON")
+    for key, value in data.items():
+        if key not in ['id', 'created_at', 'updated_at'] + res.ignore:
+            setattr(obj, key, value)
+    obj.updated_at = datetime.utcnow()
+    storage.new(obj)
+    await storage.save()
+    return 200, obj.to_dict(), []
+
+
+routes = [
+    (r"/api/v1/status", {"GET": status_api}),
+    (r"/api/v1/stats", {"GET": counter_api}),
+    (r"/api/v1/(\w+)", {"GET": list_objects, "POST": create_object}),
+    (r"/api/v1/(\w+)/([^/]+)",
+     {"GET": get_object, "PUT": update_object, "DELETE": delete_object}),
+    (r"/api/v1/(\w+)/([^/]+)/(\w+)",
+     {"GET": list_related, "POST": create_related}),
+]
+
+
+async def dispatch(request):
+    """Return the status, payload and headers answering request.
+
+    The payload is a JSON value, the bytes of an encoded one, or an
+    asynchronous iterator of the pieces of an encoded one.
+    """
+    path = request["path"].rstrip("/")
+    for pattern, views in routes:
+        match = re.fullmatch(pattern, path)
+        if match is None:
+            continue
+        if request["method"] not in views:
+            raise HTTPError(405, "Method not allowed")
+        return await views[request["method"]](request, *match.groups())
+    raise HTTPError(404, "Not found")
+
+
+async def read_body(receive):
+    """Return the body of the request received through receive."""
+    body = b""
+    more = True
+    while more:
+        message = await receive()
+        body += message.get("body", b"")
+        more = message.get("more_body", False)
+    return body
+
+
+async def lifespan(receive, send):
+    """Open the storage when the server starts, close it when it stops."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await storage.reload()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await storage.dispose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ The ASGI application """
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+    body = await read_body(receive)
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        data = None
+    request = {"method": scope["method"], "path": scope["path"],
+               "query": parse_qs(scope.get("query_string", b"").decode()),
+               "json": data}
+    try:
+        try:
+            status, payload, headers = await dispatch(request)
+        except HTTPError as error:
+            status, payload = error.status, {"error": error.message}
+            headers = []
+        headers = [(b"content-type", b"application/json")] + headers
+        if hasattr(payload, "__aiter__"):
+            await send({"type": "http.response.start", "status": status,
+                        "headers": headers})
+            async for piece in payload:
+                await send({"type": "http.response.body", "body": piece,
+                            "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode()
+        headers.append((b"content-length", str(len(payload)).encode()))
+        await send({"type": "http.response.start", "status": status,
+                    "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
+    finally:
+        await storage.close()
+
+
+if __name__ == "__main__":
+    """ Main Function """
+    import uvicorn
+    host = environ.get('HBNB_API_HOST')
+    port = environ.get('HBNB_API_PORT')
+    if not host:
+        host = '0.0.0.0'
+    if not port:
+        port = '5000'
+    uvicorn.run(app, host=host, port=int(port))
@@ -3,6 +3,7 @@
 Task 9
 """
 from api.v1.views import app_views
+from api.v1.views.pagination import list_response
 from flask import jsonify, abort, request, make_response
 from models import storage
 from models.amenity import Amenity
@@ -12,13 +13,10 @@ from models.amenity import Amenity
                  strict_slashes=False)
 def amenities_get():
     """
-    Retrieves the list of all Amenity objects.
+    Retrieves the list of all Amenity objects, or a page of them
+    when ?limit=&cursor= are given.
     """
-    all_amenities = storage.all(Amenity)
-    amenity_list = []
-    for amenity in all_amenities.values():
-        amenity_list.append(amenity.to_dict())
-    return make_response(jsonify(amenity_list), 200)
+    return make_response(list_response(Amenity), 200)
 
 
 @app_views.route("/amenities/<amenity_id>", methods=["GET"],
@@ -79,6 +77,6 @@ def amenity_put(id):
         for key, value in req_dict.items():
             if key not in ignore_keys:
                 setattr(amenity, key, value)
-        storage.save()
+        amenity.save()
         return make_response(jsonify(amenity.to_dict()), 200)
     return make_response(jsonify({"error": "Not a JSON"}), 400)
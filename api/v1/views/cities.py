@@ -3,6 +3,7 @@
 from flask import Flask, request, jsonify, abort, make_response
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pagination import related_response
 from models.state import State
 from models.city import City
 
@@ -16,18 +17,13 @@ def get_cities_by_state(state_id):
             state_id (str): The ID of the state to retrieve cities for.
 
         Returns:
-            JSON: A JSON representation of all cities in the specified state.
+            JSON: A JSON representation of all cities in the specified state,
+            or of a page of them when ?limit=&cursor= are given.
 
         Raises:
             404: If the specified state is not found.
     """
-    state = storage.get(State, state_id)
-    if state is None:
-        return abort(404)
-    list_cities = []
-    for city in state.cities:
-        list_cities.append(city.to_dict())
-    return jsonify(list_cities)
+    return related_response(State, state_id, "cities", City, "state_id")
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'])
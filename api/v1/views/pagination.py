@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+""" pagination.py - keyset pagination of the list endpoints """
+from flask import Response, abort, jsonify, make_response, request
+from flask import stream_with_context
+import itertools
+from models import storage
+from models.engine.serializer import encode_many
+
+# objects encoded per piece of a streamed list
+STREAM_BATCH = 1000
+
+
+def parse_limit(limit):
+    """Read the value of a ?limit= argument.
+
+    Args:
+        limit (str): The argument, None when it is not given.
+
+    Returns:
+        int: The page size, None for no limit.
+
+    Raises:
+        ValueError: If limit is not a positive integer.
+    """
+    if limit is None:
+        return None
+    if not limit.isdigit() or int(limit) == 0:
+        raise ValueError("limit must be a positive integer")
+    return int(limit)
+
+
+def page_args():
+    """Read the ?limit=&cursor= arguments of the request.
+
+    Returns:
+        tuple: The page size, None for no limit, and the id after which
+        the page starts, None for the first page.
+
+    Raises:
+        400: With a JSON error, if limit is not a positive integer.
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as error:
+        abort(make_response(jsonify({"error": str(error)}), 400))
+    return limit, request.args.get('cursor')
+
+
+def encode_page(objs, limit):
+    """Encode a page of objects.
+
+    Args:
+        objs (list): The objects of the page, ordered by id, with one more
+            object than limit when there is a next page.
+        limit (int): The page size, None for no limit.
+
+    Returns:
+        tuple: The JSON list of the objects of the page, encoded by
+        encode_many(), and the cursor of the next page, None if there is
+        none.
+    """
+    if limit is None or len(objs) <= limit:
+        return encode_many(objs), None
+    objs = objs[:limit]
+    return encode_many(objs), objs[-1].id
+
+
+def paged_response(objs, limit):
+    """Build the JSON list of a page of objects.
+
+    Args:
+        objs (list): See encode_page.
+        limit (int): The page size, None for no limit.
+
+    Returns:
+        Response: The JSON list of the objects, with the cursor of the
+        next page in the X-Next-Cursor header when there is one.
+    """
+    body, cursor = encode_page(objs, limit)
+    response = Response(body, mimetype='application/json')
+    if cursor is not None:
+        response.headers['X-Next-Cursor'] = cursor
+    return response
+
+
+def encode_piece(batch, first):
+    """Encode a batch of objects of a streamed JSON list.
+
+    Args:
+        batch (list): The next objects of the list, at least one.
+        first (bool): Whether they are the first objects of the list.
+
+    Returns:
+        bytes: The objects, encoded by encode_many(), after the opening
+        bracket of the list if first, else after a comma. The list ends
+        with the bytes of end_piece().
+    """
+    return (b'[' if first else b',') + encode_many(batch)[1:-1]
+
+
+def end_piece(empty):
+    """Return the end of a streamed JSON list, the whole list if empty."""
+    return b'[]' if empty else b']'
+
+
+def streamed_response(objs):
+    """Stream the JSON list of objects as they are read.
+
+    Args:
+        objs (iterable): The objects to list, read one at a time.
+
+    Returns:
+        Response: A JSON list written while objs is iterated, so that the
+        whole list is never held in memory, STREAM_BATCH objects at a time.
+    """
+    def generate():
+        """yield the JSON list piece by piece"""
+        empty = True
+        remaining = iter(objs)
+        batches = iter(lambda: list(itertools.islice(remaining,
+                                                     STREAM_BATCH)), [])
+        for batch in batches:
+            yield encode_piece(batch, empty)
+            empty = False
+        yield end_piece(empty)
+    return Response(stream_with_context(generate()),
+                    mimetype='application/json')
+
+
+def list_response(cls):
+    """Return the page of cls objects the request asks for.
+
+    Args:
+        cls (class): The class of the objects to list.
+
+    Returns:
+        Response: See paged_response.
+    """
+    limit, cursor = page_args()
+    if limit is None and cursor is None:
+        return streamed_response(storage.iter(cls))
+    page = storage.all(cls, limit=None if limit is None else limit + 1,
+                       after=cursor)
+    return paged_response(list(page.values()), limit)
+
+
+def related_response(parent, parent_id, name, cls, key):
+    """Return the objects of a relationship, or the page the request asks
+    for.
+
+    Args:
+        parent (class): The class of the object the relationship is of.
+        parent_id (str): The id of that object.
+        name (str): The relationship, listing cls objects.
+        cls (class): The class of the objects to list.
+        key (str): The foreign key of cls to parent.
+
+    Returns:
+        Response: See paged_response. The whole relationship is read
+        along with its parent. A page is read by a keyset query on the
+        foreign key, ordered by id and bounded by limit, so that its cost
+        does not grow with the rest of the relationship.
+
+    Raises:
+        404: If there is no parent object with parent_id.
+    """
+    limit, cursor = page_args()
+    if limit is None and cursor is None:
+        obj = storage.get(parent, parent_id, load={name: "joined"})
+        if obj is None:
+            abort(404)
+        return paged_response(list(getattr(obj, name)), None)
+    if storage.get(parent, parent_id) is None:
+        abort(404)
+    page = storage.filter(cls, **related_page(key, parent_id, limit, cursor))
+    return paged_response(list(page.values()), limit)
+
+
+def related_page(key, parent_id, limit, cursor):
+    """Return the arguments of the filter() reading a page of objects by
+    their foreign key.
+
+    Args:
+        key (str): The foreign key.
+        parent_id (str): The id it equals.
+        limit (int): The page size, None for no limit.
+        cursor (str): The id after which the page starts, None for the
+            first page.
+
+    Returns:
+        dict: The criteria, with a limit one over the page size so that
+        encode_page() knows whether there is a next page.
+    """
+    criteria = {key: parent_id,
+                "limit": None if limit is None else limit + 1}
+    if cursor is not None:
+        criteria["id__gt"] = cursor
+    return criteria
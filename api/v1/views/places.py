@@ -3,6 +3,7 @@
 Task 11
 """
 from api.v1.views import app_views
+from api.v1.views.pagination import related_response
 from flask import jsonify, abort, request, make_response
 from models import storage
 from models.place import Place
@@ -14,16 +15,10 @@ from models.user import User
                  strict_slashes=False)
 def places_get(city_id):
     """
-    Retrieves list of all Place objects linked to a City.
+    Retrieves list of all Place objects linked to a City, or a page
+    of them when ?limit=&cursor= are given.
     """
-    city = storage.get(City, city_id)
-    if city is None:
-        abort(404)
-    else:
-        place_list = []
-        for place in city.places:
-            place_list.append(place.to_dict())
-        return jsonify(place_list)
+    return related_response(City, city_id, "places", Place, "city_id")
 
 
 @app_views.route("/places/<string:place_id>", methods=["GET"],
@@ -77,7 +72,7 @@ def place_post(city_id):
         abort(404)
     else:
         new_place = Place(**place_data)
-        storage.save()
+        new_place.save()
         return make_response(jsonify(new_place.to_dict()), 201)
 
 
@@ -96,5 +91,5 @@ def place_put(place_id):
     for key, value in request.get_json().items():
         if key not in ignore_keys:
             setattr(place, key, value)
-    storage.save()
+    place.save()
     return make_response(jsonify(place.to_dict()), 200)
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """ states.py - Module for handling state-related API endpoints """
 from api.v1.views import app_views
+from api.v1.views.pagination import list_response
 from models import storage
 from models.state import State
 from flask import jsonify, abort, request
@@ -13,7 +14,8 @@ def get_states(state_id):
 
     Args:
         state_id (str): The ID of the state to retrieve details for.
-            If set to None, returns a list of all states.
+            If set to None, returns a list of all states, a page of them
+            when ?limit=&cursor= are given.
 
     Returns:
         JSON: A JSON representation of the state details or a list of states.
@@ -27,8 +29,7 @@ def get_states(state_id):
             abort(404)
         return jsonify(state.to_dict())
     else:
-        states = storage.all(State).values()
-        return jsonify([state.to_dict() for state in states])
+        return list_response(State)
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'])
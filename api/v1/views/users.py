@@ -3,6 +3,7 @@
 Task 10
 """
 from api.v1.views import app_views
+from api.v1.views.pagination import list_response
 from flask import jsonify, abort, request, make_response
 from models import storage
 from models.user import User
@@ -12,13 +13,10 @@ from models.user import User
                  strict_slashes=False)
 def users_get():
     """
-    Retrieves list of all User objects.
+    Retrieves list of all User objects, or a page of them
+    when ?limit=&cursor= are given.
     """
-    all_users = storage.all(User)
-    user_list = []
-    for user in all_users.values():
-        user_list.append(user.to_dict())
-    return jsonify(user_list)
+    return list_response(User)
 
 
 @app_views.route("/users/<string:user_id>", methods=["GET"],
@@ -80,5 +78,5 @@ def user_put(user_id):
     for key, value in user_data.items():
         if key not in ignore_keys:
             setattr(user, key, value)
-    storage.save()
+    user.save()
     return make_response(jsonify(user.to_dict()), 200)
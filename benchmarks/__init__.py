@@ -0,0 +1,5 @@
+#!/usr/bin/python3
+"""
+Benchmarks of the storage engines, run from the repository root with
+python3 -m benchmarks.<name>
+"""
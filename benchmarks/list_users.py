@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Measures GET /api/v1/users/ with the JSON encodings cached or not
+
+usage: python3 -m benchmarks.list_users [number of users]
+
+It fills a FileStorage in a temporary directory with 50k users by
+default, then prints the time to encode them the way the list endpoints
+did before the serializer, one to_dict() and json.dumps() per object,
+with encode_many() on a cold and on a warm cache, and the time of the
+whole request served by the API.
+"""
+
+from api.v1.app import app
+from flask import json
+from models.engine import serializer
+from models.engine.file_storage import FileStorage
+from models.user import User
+import os
+import sys
+import tempfile
+import time
+
+
+def timed(func, *args):
+    """returns the seconds func(*args) took"""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def to_dict_encode(users):
+    """encodes users as the list endpoints did before the serializer"""
+    return "[" + ",".join(json.dumps(user.to_dict()) for user in users) + "]"
+
+
+def request():
+    """serves GET /api/v1/users/ and reads the whole body"""
+    response = app.test_client().get('/api/v1/users/')
+    assert response.status_code == 200
+    return response.get_data()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__journal_path = os.path.join(tmp, "journal")
+        storage = FileStorage()
+        storage.bulk_save([User(email="user{}@hbnb.io".format(i),
+                                password="pwd", first_name="First",
+                                last_name="Last {}".format(i))
+                           for i in range(n)])
+        users = list(storage.iter(User))
+        with app.app_context():
+            before = timed(to_dict_encode, users)
+        cold = timed(serializer.encode_many, users)
+        warm = timed(serializer.encode_many, users)
+        served = timed(request)
+    print("{} users".format(n))
+    print("{:<30} {:>9}".format("encoding", "time (s)"))
+    print("{:<30} {:>9.3f}".format("to_dict() + json.dumps()", before))
+    print("{:<30} {:>9.3f}".format("encode_many(), cold cache", cold))
+    print("{:<30} {:>9.3f}".format("encode_many(), warm cache", warm))
+    print("{:<30} {:>9.3f}".format("GET /api/v1/users/, warm", served))
+    print("speedup, warm cache: {:.1f}x".format(before / warm))
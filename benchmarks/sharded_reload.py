@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+"""
+Compares decoding a sharded FileStorage snapshot in one process and in
+a pool of worker processes
+
+usage: python3 -m benchmarks.sharded_reload [number of objects [workers]]
+
+It writes a sharded snapshot of that many Place records (400k and one
+worker per CPU by default), in both formats, and prints the time
+snapshot.read() takes with a single process and with the pool. The
+records come back from the workers pickled through pipes, so the pool
+only pays off with several CPUs and large shards.
+"""
+
+from benchmarks.snapshot_formats import make_records, timed
+from models.engine import snapshot
+import os
+import sys
+import tempfile
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    records = make_records(size)
+    print("{} records, {} CPUs".format(size, os.cpu_count()))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "file.json")
+        for fmt in snapshot.formats:
+            snapshot.write(path, records, fmt, shard_min=1)
+            single = timed(snapshot.read, path, 1)
+            pooled = timed(snapshot.read, path, workers)
+            print("{:6} 1 process {:7.3f}s  {} workers {:7.3f}s  "
+                  "speedup {:.2f}x".format(fmt, single, workers, pooled,
+                                           single / pooled))
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Compares the json and binary FileStorage snapshot formats
+
+usage: python3 -m benchmarks.snapshot_formats [number of objects ...]
+
+For each size (10k, 100k and 1M objects by default) it prints the time
+to save and load a snapshot of that many Place records, and the size of
+the file, in both formats.
+"""
+
+from datetime import datetime, timedelta
+from models.base_model import to_micros
+from models.engine import snapshot
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+
+def make_records(n):
+    """returns n Place records shaped like the ones FileStorage writes,
+    see BaseModel.to_record()"""
+    records = {}
+    start = datetime(2023, 8, 23, 14, 15, 47, 852978)
+    city_ids = [str(uuid.uuid4()) for i in range(100)]
+    user_ids = [str(uuid.uuid4()) for i in range(1000)]
+    for i in range(n):
+        id = str(uuid.uuid4())
+        stamp = to_micros(start + timedelta(seconds=i))
+        records["Place." + id] = {
+            "id": id, "created_at": stamp, "updated_at": stamp,
+            "__class__": "Place", "city_id": city_ids[i % 100],
+            "user_id": user_ids[i % 1000], "name": "Place {}".format(i),
+            "description": "A nice place to stay", "number_rooms": i % 5,
+            "number_bathrooms": i % 3, "max_guest": i % 8,
+            "price_by_night": 50 + i % 200, "latitude": 37.77 + i / 1e6,
+            "longitude": -122.41 - i / 1e6}
+    return records
+
+
+def timed(func, *args):
+    """returns the seconds func(*args) took"""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    print("{:>9} {:>7} {:>9} {:>9} {:>12}".format(
+        "objects", "format", "save (s)", "load (s)", "size (bytes)"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "file.json")
+        for n in sizes:
+            records = make_records(n)
+            for fmt in snapshot.formats:
+                save = timed(snapshot.write, path, records, fmt)
+                load = timed(snapshot.read, path)
+                print("{:>9} {:>7} {:>9.3f} {:>9.3f} {:>12}".format(
+                    n, fmt, save, load, os.path.getsize(path)))
@@ -7,8 +7,15 @@ from os import getenv
 
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
+# sqlite is a database storage too, whose models use the same mapping
+engine_t = storage_t
+if engine_t == "sqlite":
+    storage_t = "db"
 
-if storage_t == "db":
+if engine_t == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
@@ -3,7 +3,7 @@
 Contains class BaseModel
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 import models
 from os import getenv
 import sqlalchemy
@@ -11,7 +11,7 @@ from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
-time = "%Y-%m-%dT%H:%M:%S.%f"
+EPOCH = datetime(1970, 1, 1)
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -19,38 +19,112 @@ else:
     Base = object
 
 
+def to_micros(value):
+    """returns a datetime, or its isoformat() string, as microseconds
+    since the epoch; microseconds are returned as they are"""
+    if type(value) is int:
+        return value
+    if type(value) is str:
+        value = datetime.fromisoformat(value)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def from_micros(value):
+    """returns microseconds since the epoch as a datetime"""
+    return EPOCH + timedelta(microseconds=value)
+
+
+def isoformat(value):
+    """returns a datetime, or microseconds since the epoch, as the
+    timestamp string of to_dict()"""
+    if type(value) is int:
+        value = from_micros(value)
+    string = value.isoformat()
+    return string if value.microsecond else string + ".000000"
+
+
+class Timestamp:
+    """A datetime attribute kept as microseconds since the epoch
+
+    The object's __dict__ holds the integer, which is what file storage
+    writes and reads back without parsing; the datetime is only built
+    when the attribute is read. Assigning a datetime, an isoformat()
+    string or microseconds all store microseconds.
+    """
+
+    def __set_name__(self, owner, name):
+        """remembers the attribute name"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """returns the attribute of obj as a datetime"""
+        if obj is None:
+            return self
+        try:
+            return from_micros(obj.__dict__[self.name])
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, obj, value):
+        """stores value in obj as microseconds since the epoch"""
+        obj.__dict__[self.name] = to_micros(value)
+
+
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    else:
+        created_at = Timestamp()
+        updated_at = Timestamp()
 
     def __init__(self, *args, **kwargs):
-        """Initialization of the base model"""
+        """Initialization of the base model
+
+        The attributes are set through object.__setattr__(), which skips
+        the storage.touch() of __setattr__(): an object being built is
+        not stored yet, so it has no change to record.
+        """
         if kwargs:
             for key, value in kwargs.items():
-                if key != "__class__":
-                    setattr(self, key, value)
-            if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
-                self.created_at = datetime.utcnow()
-            if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
-                self.updated_at = datetime.utcnow()
+                if key not in ("__class__", "created_at", "updated_at"):
+                    object.__setattr__(self, key, value)
+            for key in ("created_at", "updated_at"):
+                value = kwargs.get(key, None)
+                if value is None or value == "":
+                    value = datetime.utcnow()
+                elif models.storage_t == "db" and type(value) is str:
+                    value = datetime.fromisoformat(value)
+                object.__setattr__(self, key, value)
             if kwargs.get("id", None) is None:
-                self.id = str(uuid.uuid4())
+                object.__setattr__(self, "id", str(uuid.uuid4()))
         else:
-            self.id = str(uuid.uuid4())
-            self.created_at = datetime.utcnow()
-            self.updated_at = self.created_at
+            object.__setattr__(self, "id", str(uuid.uuid4()))
+            object.__setattr__(self, "created_at", datetime.utcnow())
+            object.__setattr__(self, "updated_at", self.created_at)
+
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets the attribute and tells the storage the object changed
+
+            The storage keeps the changed objects, nothing is added to
+            __dict__. In DB mode the session tracks the changes.
+            """
+            object.__setattr__(self, name, value)
+            models.storage.touch(self)
 
     def __str__(self):
-        """String representation of the BaseModel class"""
+        """String representation of the BaseModel class, with datetimes
+        for the timestamps file storage keeps as microseconds"""
+        attrs = dict(self.__dict__)
+        for key in ("created_at", "updated_at"):
+            if type(attrs.get(key)) is int:
+                attrs[key] = from_micros(attrs[key])
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
-                                         self.__dict__)
+                                         attrs)
 
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
@@ -62,9 +136,22 @@ class BaseModel:
         """returns a dictionary containing all keys/values of the instance"""
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = isoformat(new_dict["created_at"])
+        if "updated_at" in new_dict:
+            new_dict["updated_at"] = isoformat(new_dict["updated_at"])
+        new_dict["__class__"] = self.__class__.__name__
+        if "_sa_instance_state" in new_dict:
+            del new_dict["_sa_instance_state"]
+        return new_dict
+
+    def to_record(self):
+        """returns the dictionary file storage saves: to_dict() with the
+        timestamps as microseconds since the epoch"""
+        new_dict = self.__dict__.copy()
+        if "created_at" in new_dict:
+            new_dict["created_at"] = to_micros(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = to_micros(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""
+Contains the class AsyncDBStorage
+"""
+
+import asyncio
+from models.base_model import Base
+from models.engine.counters import RowCounters
+from models.engine.criteria import operators, parse as parse_criteria
+from models.engine.db_storage import DBStorage, classes
+from models.engine.migrations import upgrade
+from models.engine.pool import pool_options
+from os import getenv
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class AsyncDBStorage:
+    """interacts with the database through an asyncio driver
+
+    The methods that reach the database are coroutines: a request waiting
+    on a query gives the event loop to the others instead of holding a
+    thread. Each asyncio task has its own session, like each thread has
+    with DBStorage. Relationships are not loaded on access, use filter()
+    for the objects of a relationship. count() and counts() read live
+    counters, as DBStorage does.
+    """
+    __engine = None
+    __session = None
+
+    def __init__(self, url=None):
+        """Instantiate an AsyncDBStorage object
+
+        url is the SQLAlchemy database URL with an asyncio driver, by
+        default the MySQL database described by the HBNB_MYSQL_*
+        environment variables through aiomysql.
+        """
+        if url is None:
+            url = 'mysql+aiomysql://{}:{}@{}/{}'.format(
+                getenv('HBNB_MYSQL_USER'), getenv('HBNB_MYSQL_PWD'),
+                getenv('HBNB_MYSQL_HOST'), getenv('HBNB_MYSQL_DB'))
+        options = pool_options()
+        # asyncio engines need a pool of their own, the sizes still apply
+        del options["poolclass"]
+        self.__engine = create_async_engine(url, **options)
+        if url.startswith('sqlite'):
+            event.listen(self.__engine.sync_engine, "connect",
+                         DBStorage._sqlite_pragmas)
+        self.__counts = RowCounters(
+            classes, float(getenv('HBNB_DB_COUNT_RECONCILE', 60)))
+
+    async def all(self, cls=None, limit=None, after=None):
+        """returns the objects of cls, or of every class, by key
+
+        With limit or after, returns at most limit objects ordered by id,
+        starting after the id after, as DBStorage.all() does.
+        """
+        names = [name for name in sorted(classes)
+                 if cls is None or cls is classes[name] or cls == name]
+        if cls is not None and after is not None:
+            after = names[0] + "." + after
+        objs = {}
+        for name in names:
+            if limit is not None and len(objs) >= limit:
+                break
+            after_name, _, after_id = (after or "").partition(".")
+            if after is not None and name < after_name:
+                continue
+            query = select(classes[name]).order_by(classes[name].id)
+            if after is not None and name == after_name:
+                query = query.where(classes[name].id > after_id)
+            if limit is not None:
+                query = query.limit(limit - len(objs))
+            for obj in (await self.__session.execute(query)).scalars():
+                objs[name + "." + obj.id] = obj
+        return objs
+
+    async def iter(self, cls=None, batch_size=None):
+        """yields the objects of cls, or of every class, ordered by key
+
+        Rows are fetched batch_size at a time (HBNB_ITER_BATCH_SIZE, 1000
+        by default), as in DBStorage.iter().
+        """
+        if batch_size is None:
+            batch_size = int(getenv('HBNB_ITER_BATCH_SIZE', 1000))
+        for name in sorted(classes):
+            if cls is None or cls is classes[name] or cls == name:
+                query = select(classes[name]).order_by(classes[name].id)
+                result = await self.__session.stream_scalars(
+                    query, execution_options={"yield_per": batch_size})
+                async for obj in result:
+                    yield obj
+
+    async def filter(self, cls, limit=None, **criteria):
+        """returns the cls objects matching criteria, by key
+
+        See models.engine.criteria for the criteria, which become the
+        WHERE clause of a single query. With limit, returns the first
+        limit matches ordered by id.
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = select(cls)
+        for attr, op, value in parse_criteria(criteria):
+            column = getattr(cls, attr)
+            if op == "in":
+                query = query.where(column.in_(value))
+            else:
+                query = query.where(operators[op](column, value))
+        if limit is not None:
+            query = query.order_by(cls.id).limit(limit)
+        result = await self.__session.execute(query)
+        return {cls.__name__ + "." + obj.id: obj for obj in result.scalars()}
+
+    async def get(self, cls, id):
+        """returns the cls object with id, None if there is none"""
+        if cls not in classes.values():
+            return None
+        return await self.__session.get(cls, id)
+
+    async def count(self, cls=None):
+        """returns the number of objects of cls, or of every class"""
+        if cls:
+            name = cls if isinstance(cls, str) else cls.__name__
+            return (await self.counts())[name]
+        return sum((await self.counts()).values())
+
+    async def counts(self):
+        """returns the number of objects of every class, without a query
+
+        See DBStorage.counts(): the counters follow the commits of this
+        storage and are reconciled every HBNB_DB_COUNT_RECONCILE seconds.
+        """
+        if self.__counts.due():
+            await self.reconcile()
+        return self.__counts.totals(self.__session().sync_session)
+
+    async def reconcile(self):
+        """counts the rows of every class again and corrects the counters,
+        returns the drift found, see DBStorage.reconcile()"""
+        async with self.__engine.connect() as conn:
+            return await conn.run_sync(self.__counts.reconcile)
+
+    def new(self, obj):
+        """add the object to the session of the current task"""
+        self.__session.add(obj)
+
+    async def save(self):
+        """commit all changes of the session of the current task"""
+        await self.__session.commit()
+
+    async def delete(self, obj=None):
+        """delete obj from the session of the current task if not None"""
+        if obj is not None:
+            await self.__session.delete(obj)
+
+    async def reload(self):
+        """creates the missing tables and applies the schema migrations"""
+        async with self.__engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(upgrade)
+        # the events of the asyncio sessions are those of their sync ones
+        sync_factory = sessionmaker()
+        self.__counts.listen(sync_factory)
+        factory = async_sessionmaker(self.__engine, expire_on_commit=False,
+                                     sync_session_class=sync_factory)
+        self.__session = async_scoped_session(
+            factory, scopefunc=asyncio.current_task)
+        await self.reconcile()
+
+    async def close(self):
+        """ends the session of the current task"""
+        await self.__session.remove()
+
+    async def dispose(self):
+        """closes the connections of the pool"""
+        await self.__engine.dispose()
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Contains the class AsyncFileStorage
+"""
+
+import asyncio
+from models.engine.file_storage import FileStorage
+
+
+class AsyncFileStorage:
+    """asyncio interface to the objects of a FileStorage
+
+    The objects live in memory, so reading them does not wait and the
+    reads are answered directly. save(), reload() and close() touch the
+    disk and run in a worker thread while the event loop goes on.
+    """
+
+    def __init__(self, storage=None):
+        """Instantiate an AsyncFileStorage over storage, a FileStorage"""
+        self.__storage = FileStorage() if storage is None else storage
+
+    async def all(self, cls=None, limit=None, after=None):
+        """returns the objects of cls, or of every class, by key"""
+        return self.__storage.all(cls, limit=limit, after=after)
+
+    async def iter(self, cls=None):
+        """yields the objects of cls, or of every class, ordered by key"""
+        for obj in self.__storage.iter(cls):
+            yield obj
+
+    async def filter(self, cls, limit=None, **criteria):
+        """returns the cls objects matching criteria, by key, the first
+        limit of them ordered by id with limit"""
+        return self.__storage.filter(cls, limit, **criteria)
+
+    async def get(self, cls, id):
+        """returns the cls object with id, None if there is none"""
+        return self.__storage.get(cls, id)
+
+    async def count(self, cls=None):
+        """returns the number of objects of cls, or of every class"""
+        return self.__storage.count(cls)
+
+    async def counts(self):
+        """returns the number of objects of every class"""
+        return self.__storage.counts()
+
+    async def reconcile(self):
+        """corrects the counters of the class partitions, returns the
+        drift found"""
+        return self.__storage.reconcile()
+
+    def new(self, obj):
+        """adds obj to the objects"""
+        self.__storage.new(obj)
+
+    async def save(self):
+        """writes the objects to the JSON file in a worker thread"""
+        await asyncio.to_thread(self.__storage.save)
+
+    async def delete(self, obj=None):
+        """deletes obj from the objects if not None"""
+        self.__storage.delete(obj)
+
+    async def reload(self):
+        """reads the objects from the JSON file in a worker thread"""
+        await asyncio.to_thread(self.__storage.reload)
+
+    async def close(self):
+        """reads the JSON file again, if it changed, in a worker thread"""
+        await asyncio.to_thread(self.__storage.close)
+
+    async def dispose(self):
+        """nothing to release, the objects stay in memory"""
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Contains the ObjectCache class
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class ObjectCache:
+    """bounded LRU cache of values keyed by (class name, id)
+
+    Entries older than ttl seconds are treated as missing, so changes made
+    by another process are seen after at most ttl seconds. A size of 0
+    disables the cache: get() always misses and put() keeps nothing.
+    """
+
+    def __init__(self, size=1024, ttl=30):
+        """Instantiate an ObjectCache of at most size entries"""
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """returns the value cached for key, or None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self.__entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """caches value for key, evicting the least recently used entry"""
+        if self.size <= 0:
+            return
+        with self.__lock:
+            self.__entries[key] = (time.monotonic(), value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.size:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """forgets the value cached for key"""
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        """forgets every cached value"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        """returns the number of hits, misses and cached entries"""
+        return {"size": len(self.__entries), "max_size": self.size,
+                "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the RowCounters class
+"""
+
+from sqlalchemy import event, func, literal, select, union_all
+import threading
+import time
+
+
+class RowCounters:
+    """live number of rows of each class of a database
+
+    The counters follow the commits of the sessions made by the session
+    factories given to listen(), and are recounted by reconcile() every
+    reconcile_every seconds to catch up with the other writers. 0 only
+    recounts when reconcile() is called.
+    """
+
+    def __init__(self, classes, reconcile_every=60):
+        """Instantiate RowCounters of classes, a dict of name -> class"""
+        self.classes = classes
+        self.reconcile_every = reconcile_every
+        self.__counts = dict.fromkeys(classes, 0)
+        self.__lock = threading.Lock()
+        self.__reconciled = None
+
+    def listen(self, factory):
+        """follows the flushes and commits of the sessions of factory"""
+        event.listen(factory, "after_flush", self._track_flush)
+        event.listen(factory, "after_commit", self._track_commit)
+        event.listen(factory, "after_transaction_end", self._track_discard)
+
+    def due(self):
+        """returns whether the counters are to be recounted"""
+        return self.__reconciled is None or (
+            self.reconcile_every > 0 and
+            time.monotonic() - self.__reconciled >= self.reconcile_every)
+
+    def totals(self, session):
+        """returns the number of rows of every class seen from session
+
+        The changes of session not committed yet are added, so that a
+        request counts its own writes.
+        """
+        with self.__lock:
+            totals = dict(self.__counts)
+        for name, delta in session.info.get("count_deltas", {}).items():
+            totals[name] += delta
+        for objs, delta in ((session.new, 1), (session.deleted, -1)):
+            for obj in objs:
+                if obj.__class__.__name__ in totals:
+                    totals[obj.__class__.__name__] += delta
+        return totals
+
+    def reconcile(self, conn):
+        """counts the rows of every class on conn and corrects the counters
+
+        Returns the drift found: the counter minus the rows counted, for
+        each class whose counter was off.
+        """
+        query = union_all(*[select(literal(name), func.count(cls.id))
+                            for name, cls in self.classes.items()])
+        rows = dict.fromkeys(self.classes, 0)
+        for name, count in conn.execute(query):
+            rows[name] = count
+        with self.__lock:
+            drift = {name: self.__counts[name] - rows[name]
+                     for name in self.classes
+                     if self.__counts[name] != rows[name]}
+            self.__counts.update(rows)
+            self.__reconciled = time.monotonic()
+        return drift
+
+    def count_pending(self, session, name, delta):
+        """adds delta to the uncommitted change of the rows of class name,
+        for the rows session writes without flushing objects"""
+        if name in self.classes:
+            deltas = session.info.setdefault("count_deltas", {})
+            deltas[name] = deltas.get(name, 0) + delta
+
+    def _track_flush(self, session, flush_context):
+        """records how many rows of each class a flush added or removed"""
+        for objs, delta in ((session.new, 1), (session.deleted, -1)):
+            for obj in objs:
+                self.count_pending(session, obj.__class__.__name__, delta)
+
+    def _track_commit(self, session):
+        """applies the changes of the committed transaction to the counters"""
+        deltas = session.info.pop("count_deltas", None)
+        if deltas:
+            with self.__lock:
+                for name, delta in deltas.items():
+                    self.__counts[name] += delta
+
+    def _track_discard(self, session, transaction):
+        """drops the changes of a transaction ended without a commit"""
+        if transaction.parent is None:
+            session.info.pop("count_deltas", None)
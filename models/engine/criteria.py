@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""
+Parses and evaluates the criteria of storage.filter()
+
+A criterion is a keyword argument attr=value, for objects whose attr
+equals value, or attr__<operator>=value with one of the operators below.
+"""
+
+import operator
+
+# operators of the criteria, by suffix
+operators = {"eq": operator.eq, "in": lambda value, values: value in values,
+             "gt": operator.gt, "gte": operator.ge,
+             "lt": operator.lt, "lte": operator.le}
+
+
+def parse(criteria):
+    """returns the (attr, operator name, value) triples of criteria"""
+    predicates = []
+    for name, value in criteria.items():
+        attr, _, op = name.partition("__")
+        op = op or "eq"
+        if op not in operators:
+            raise ValueError("unknown filter operator: {}".format(name))
+        if op == "in":
+            value = list(value)
+        predicates.append((attr, op, value))
+    return predicates
+
+
+def matches(value, op, operand):
+    """returns whether value satisfies the criterion op operand
+
+    None only matches equality to None or a list containing it, and a
+    value that cannot be compared with operand never matches.
+    """
+    if value is None and op not in ("eq", "in"):
+        return False
+    try:
+        return operators[op](value, operand)
+    except TypeError:
+        return False
@@ -3,21 +3,36 @@
 Contains the class DBStorage
 """
 
+import atexit
+import itertools
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.cache import ObjectCache
+from models.engine.counters import RowCounters
+from models.engine.criteria import operators, parse as parse_criteria
+from models.engine.flusher import durabilities
+from models.engine.migrations import migrate
+from models.engine.pool import PoolMonitor, pool_options
+from models.engine.routing import ReplicaSet, RoutingSession
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm.util import identity_key
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# eager loading strategies accepted by the load argument of all() and get()
+strategies = {"selectin": selectinload, "joined": joinedload}
 
 
 class DBStorage:
@@ -25,69 +40,463 @@ class DBStorage:
     __engine = None
     __session = None
 
-    def __init__(self):
-        """Instantiate a DBStorage object"""
+    def __init__(self, url=None, replicas=None):
+        """Instantiate a DBStorage object
+
+        url is the SQLAlchemy database URL, by default the MySQL database
+        described by the HBNB_MYSQL_* environment variables. replicas is
+        a list of URLs of read replicas of it, by default the comma
+        separated HBNB_MYSQL_REPLICAS.
+        """
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        if url is None:
+            url = 'mysql+mysqldb://{}:{}@{}/{}'.format(HBNB_MYSQL_USER,
+                                                       HBNB_MYSQL_PWD,
+                                                       HBNB_MYSQL_HOST,
+                                                       HBNB_MYSQL_DB)
+        self.__engine = self._create_engine(url)
+        self.__pool = PoolMonitor(self.__engine)
+        if replicas is None:
+            replicas = getenv('HBNB_MYSQL_REPLICAS', '').split(',')
+        self.__replicas = ReplicaSet(
+            [self._create_engine(replica.strip())
+             for replica in replicas if replica.strip()],
+            float(getenv('HBNB_MYSQL_REPLICA_MAX_LAG', 5)),
+            float(getenv('HBNB_MYSQL_REPLICA_CHECK', 1)))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+        self.__durability = getenv('HBNB_STORAGE_DURABILITY', 'sync')
+        if self.__durability not in durabilities:
+            raise ValueError("unknown durability: {}".
+                             format(self.__durability))
+        self.__flush_delay = int(getenv('HBNB_STORAGE_FLUSH_MS', 50)) / 1000
+        self.__saves = 0
+        self.__commits = 0
+        if self.__durability != "sync":
+            atexit.register(self.flush)
+        self.__cache = ObjectCache(int(getenv('HBNB_DB_CACHE_SIZE', 1024)),
+                                   float(getenv('HBNB_DB_CACHE_TTL', 30)))
+        # committed rows of each class, kept by the session events
+        self.__counts = RowCounters(
+            classes, float(getenv('HBNB_DB_COUNT_RECONCILE', 60)))
+
+    def _create_engine(self, url):
+        """returns an engine on url with the configured pool"""
+        options = pool_options()
+        if url.startswith('sqlite'):
+            engine = create_engine(
+                url, connect_args={"check_same_thread": False}, **options)
+            event.listen(engine, "connect", self._sqlite_pragmas)
+            return engine
+        return create_engine(url, **options)
+
+    @staticmethod
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        """puts each new SQLite connection in WAL mode with foreign keys"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, limit=None, after=None, load=None):
+        """query on the current database session
+
+        With limit or after, returns at most limit objects ordered by id,
+        starting after the id after, with one keyset query per class.
+        Without cls, the objects are ordered by key and after is a
+        <class name>.id key.
+
+        load names the relationships to load along with the objects, see
+        _load_options(), instead of with one query per object when first
+        accessed. Without cls it applies to the classes that have them.
+        """
+        if limit is not None or after is not None:
+            return self._page(cls, limit, after, load)
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                objs = self._query(classes[clss], load, cls is None).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def filter(self, cls, limit=None, **criteria):
+        """returns the cls objects matching criteria, by key
+
+        See models.engine.criteria for the criteria, which become the
+        WHERE clause of a single query. With limit, returns the first
+        limit matches ordered by id.
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self.__session.query(cls)
+        for attr, op, value in parse_criteria(criteria):
+            column = getattr(cls, attr)
+            if op == "in":
+                query = query.filter(column.in_(value))
+            else:
+                query = query.filter(operators[op](column, value))
+        if limit is not None:
+            query = query.order_by(cls.id).limit(limit)
+        return {cls.__name__ + "." + obj.id: obj for obj in query}
+
+    def iter(self, cls=None, batch_size=None, load=None):
+        """yields the objects of cls, or of every class, ordered by key
+
+        Rows are fetched batch_size at a time (HBNB_ITER_BATCH_SIZE, 1000
+        by default) from a server-side cursor where the driver has one, so
+        memory does not grow with the table as it does with all(). load
+        is as in all(), but only the selectin strategy streams.
+        """
+        if batch_size is None:
+            batch_size = int(getenv('HBNB_ITER_BATCH_SIZE', 1000))
+        for name in sorted(classes):
+            if cls is None or cls is classes[name] or cls == name:
+                query = select(classes[name]).order_by(classes[name].id)
+                if load:
+                    query = query.options(*self._load_options(
+                        classes[name], load, cls is None))
+                yield from self.__session.execute(
+                    query, execution_options={"yield_per": batch_size}
+                ).scalars()
+
+    def _query(self, cls, load=None, partial=False):
+        """returns a query of cls loading the relationships named by load"""
+        query = self.__session.query(cls)
+        if load:
+            query = query.options(*self._load_options(cls, load, partial))
+        return query
+
+    def _load_options(self, cls, load, partial=False):
+        """returns the loader options of cls for the relationships in load
+
+        load is a list of relationship names, loaded with the selectin
+        strategy, or a dictionary from names to strategies, selectin or
+        joined. A dotted name such as "places.reviews" loads a chain of
+        relationships. With partial, names cls does not have are skipped.
+        """
+        if not isinstance(load, dict):
+            load = dict.fromkeys(load, "selectin")
+        options = []
+        for path, strategy in load.items():
+            if strategy not in strategies:
+                raise ValueError("unknown loading strategy: {}".
+                                 format(strategy))
+            option = None
+            target = cls
+            for name in path.split("."):
+                attr = getattr(target, name, None)
+                if not isinstance(getattr(attr, "property", None),
+                                  sqlalchemy.orm.RelationshipProperty):
+                    if partial and option is None:
+                        break
+                    raise AttributeError("{} has no relationship {}".
+                                         format(target.__name__, name))
+                loader = strategies[strategy]
+                option = loader(attr) if option is None else \
+                    getattr(option, loader.__name__)(attr)
+                target = attr.property.mapper.class_
+            if option is not None:
+                options.append(option)
+        return options
+
+    def _page(self, cls, limit, after, load=None):
+        """returns a page of objects of cls, or of every class, by key"""
+        page = {}
+        if cls is not None:
+            name = cls if isinstance(cls, str) else cls.__name__
+            names = [name]
+            if after is not None:
+                after = name + "." + after
+        else:
+            names = sorted(classes)
+        for name in names:
+            if limit is not None and len(page) >= limit:
+                break
+            after_name, _, after_id = (after or "").partition(".")
+            if after is not None and name < after_name:
+                continue
+            query = self._query(classes[name], load, cls is None)
+            if after is not None and name == after_name:
+                query = query.filter(classes[name].id > after_id)
+            query = query.order_by(classes[name].id)
+            if limit is not None:
+                query = query.limit(limit - len(page))
+            for obj in query:
+                page[name + "." + obj.id] = obj
+        return page
+
     def new(self, obj):
         """add the object to the current database session"""
+        self.__cache.invalidate((obj.__class__.__name__, obj.id))
         self.__session.add(obj)
 
+    def bulk_new(self, objs, cls=None):
+        """adds many objects, or dictionaries of cls, to the session
+
+        A dictionary without cls is of the class named by its __class__.
+        Returns the list of objects added.
+        """
+        objs = [self._instance(obj, cls) for obj in objs]
+        for obj in objs:
+            self.__cache.invalidate((obj.__class__.__name__, obj.id))
+        self.__session.add_all(objs)
+        return objs
+
+    def bulk_save(self, objs, cls=None, batch_size=None):
+        """inserts many objects, or dictionaries of cls, in batches
+
+        Each batch of batch_size rows (HBNB_BULK_BATCH_SIZE, 1000 by
+        default) is sent as one executemany INSERT per class and
+        committed, along with anything pending in the session. The objects
+        are not added to the session. Returns the number of rows and
+        batches, the time taken and the rows inserted per second.
+        """
+        if batch_size is None:
+            batch_size = int(getenv('HBNB_BULK_BATCH_SIZE', 1000))
+        start = time.perf_counter()
+        rows = batches = 0
+        objs = iter(objs)
+        while True:
+            batch = list(itertools.islice(objs, batch_size))
+            if not batch:
+                break
+            by_class = {}
+            for obj in batch:
+                obj = self._instance(obj, cls)
+                columns = sqlalchemy.inspect(obj.__class__).column_attrs
+                by_class.setdefault(obj.__class__, []).append({
+                    attr.key: getattr(obj, attr.key) for attr in columns
+                    if getattr(obj, attr.key) is not None})
+            for mapped, mappings in by_class.items():
+                self.__session.execute(insert(mapped), mappings)
+                self.__counts.count_pending(self.__session(),
+                                            mapped.__name__, len(mappings))
+            self.__session.commit()
+            self.__session().info.pop("first_save", None)
+            rows += len(batch)
+            batches += 1
+        seconds = time.perf_counter() - start
+        return {"rows": rows, "batches": batches, "seconds": seconds,
+                "rows_per_sec": rows / seconds if seconds else 0.0}
+
+    def _instance(self, obj, cls=None):
+        """returns obj, or a new cls object if obj is a dictionary"""
+        if isinstance(obj, dict):
+            if cls is None:
+                cls = classes[obj["__class__"]]
+            return cls(**obj)
+        return obj
+
+    def _invalidate_pending(self):
+        """drops the cached copies of the objects the session changed"""
+        session = self.__session()
+        for obj in list(session.new) + list(session.dirty) + \
+                list(session.deleted):
+            self.__cache.invalidate((obj.__class__.__name__, obj.id))
+
     def save(self):
-        """commit all changes of the current database session"""
-        self.__session.commit()
+        """commit all changes of the current database session
+
+        With the batched or async durability the changes are only flushed
+        to the database, and the saves of a request are merged into the
+        single commit made by close(). batched also commits as soon as the
+        oldest uncommitted save is HBNB_STORAGE_FLUSH_MS old.
+        """
+        self.__saves += 1
+        self._invalidate_pending()
+        if self.__durability == "sync":
+            self.__session.commit()
+            self.__commits += 1
+            return
+        self.__session.flush()
+        info = self.__session().info
+        first = info.setdefault("first_save", time.monotonic())
+        if (self.__durability == "batched" and
+                time.monotonic() - first >= self.__flush_delay):
+            self.flush()
+
+    def flush(self):
+        """commits what save() left pending in the current session"""
+        if self.__session is None:
+            return
+        if self.__session().info.pop("first_save", None) is not None:
+            self.__session.commit()
+            self.__commits += 1
+
+    def flush_stats(self):
+        """returns the durability and how many saves were merged away"""
+        return {"durability": self.__durability, "saves": self.__saves,
+                "flushes": self.__commits,
+                "merged": self.__saves - self.__commits}
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
+            self.__cache.invalidate((obj.__class__.__name__, obj.id))
             self.__session.delete(obj)
 
     def reload(self):
-        """reloads data from the database"""
+        """reloads data from the database
+
+        Creates the missing tables, then applies the schema migrations
+        the database has not had, see models.engine.migrations, and
+        reconciles the counters of count() with the tables.
+        """
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        migrate(self.__engine)
+        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False,
+                                    class_=RoutingSession,
+                                    replicas=self.__replicas)
+        event.listen(sess_factory, "after_flush", self._track_flush)
+        self.__counts.listen(sess_factory)
+        event.listen(sess_factory, "after_commit", self._track_commit)
+        event.listen(sess_factory, "after_transaction_end",
+                     self._track_discard)
         Session = scoped_session(sess_factory)
         self.__session = Session
+        self.reconcile()
 
     def close(self):
         """call remove() method on the private session attribute"""
+        self.flush()
         self.__session.remove()
 
-    def get(self, cls, id):
-        """ get a specific object based on class and id """
-        if cls in classes.values():
-            return self.__session.query(cls).filter(cls.id == id).first()
-        return None
+    def get(self, cls, id, load=None):
+        """ get a specific object based on class and id
+
+        An object already in the session is returned without a query, and
+        one read within the last HBNB_DB_CACHE_TTL seconds is rebuilt from
+        the column values kept in the cache and attached to the session.
+        Only rows read from the primary are cached: a lagging replica could
+        put back a row older than the write that dropped it from the cache.
+        load names relationships to read in the same round trips, as in
+        all(), and bypasses the cache.
+        """
+        if cls not in classes.values():
+            return None
+        session = self.__session()
+        obj = session.identity_map.get(identity_key(cls, id))
+        if obj is not None:
+            return obj
+        key = (cls.__name__, id)
+        values = self.__cache.get(key) if not load else None
+        if values is not None:
+            obj = cls(**values)
+            make_transient_to_detached(obj)
+            session.add(obj)
+            return obj
+        obj = self._query(cls, load).filter(cls.id == id).first()
+        if obj is not None and obj not in session.dirty and \
+                session.reads_primary():
+            self.__cache.put(key, {
+                attr.key: getattr(obj, attr.key)
+                for attr in sqlalchemy.inspect(cls).column_attrs})
+        return obj
+
+    def replica_stats(self):
+        """returns the reads served by each replica and their lag"""
+        return self.__replicas.stats()
+
+    def pool_stats(self):
+        """returns the connection pool occupancy, waits and ages"""
+        return self.__pool.stats()
+
+    def cache_stats(self):
+        """returns the hits and misses of the get() cache"""
+        return self.__cache.stats()
 
     def count(self, cls=None):
-        """ count objs from a class or every class """
-        count = 0
+        """ count objs from a class or every class, without a query """
         if cls:
-            count += len(self.__session.query(cls).all())
-            return count
-        else:
-            for each_class in classes:
-                count += len(self.__session.query(classes[each_class]).all())
-            return count
+            return self.counts()[self._class_name(cls)]
+        return sum(self.counts().values())
+
+    def counts(self):
+        """returns the number of objects of every class, without a query
+
+        The live counters hold the rows committed through this storage,
+        and are reconciled with the tables every HBNB_DB_COUNT_RECONCILE
+        seconds to catch up with the other writers. The changes of the
+        current session not committed yet are added, so that a request
+        counts its own writes.
+        """
+        if self.__counts.due():
+            self.reconcile()
+        return self.__counts.totals(self.__session())
+
+    def reconcile(self):
+        """counts the rows of every class again and corrects the counters
+
+        Returns the drift found: the counter minus the rows counted, for
+        each class whose counter was off, such as after writes made by
+        another process.
+        """
+        with self.__engine.connect() as conn:
+            return self.__counts.reconcile(conn)
+
+    def _class_name(self, cls):
+        """returns the name of cls, which may be a class or its name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def _track_flush(self, session, flush_context):
+        """records the rows a flush inserted, updated and deleted, until
+        commit"""
+        flushed = session.info.setdefault("flushed", {})
+        for state, objs in self._changes(session):
+            for obj in objs:
+                key = obj.__class__.__name__ + "." + obj.id
+                if state != "dirty" or key not in flushed:
+                    flushed[key] = state
+
+    def _track_commit(self, session):
+        """forgets the rows flushed by the committed transaction"""
+        session.info.pop("flushed", None)
+
+    def _track_discard(self, session, transaction):
+        """drops the changes of a transaction ended without a commit"""
+        if transaction.parent is None:
+            session.info.pop("flushed", None)
+
+    @staticmethod
+    def _changes(session):
+        """returns the new, dirty and deleted objects of session not
+        flushed yet, by state"""
+        return (("new", [obj for obj in session.new
+                         if obj.__class__.__name__ in classes]),
+                ("dirty", [obj for obj in session.dirty
+                           if obj.__class__.__name__ in classes and
+                           session.is_modified(obj)]),
+                ("deleted", [obj for obj in session.deleted
+                             if obj.__class__.__name__ in classes]))
+
+    def is_dirty(self, obj):
+        """returns whether obj is not in the session or has changes not
+        flushed"""
+        state = sqlalchemy.inspect(obj)
+        return not state.persistent or state.modified
+
+    def pending(self):
+        """returns the keys of the objects not committed yet
+
+        new lists the objects to insert, dirty the objects with changed
+        columns and deleted the objects to delete, whether the current
+        session flushed them already or not.
+        """
+        session = self.__session()
+        states = dict(session.info.get("flushed", {}))
+        for state, objs in self._changes(session):
+            for obj in objs:
+                key = obj.__class__.__name__ + "." + obj.id
+                if state != "dirty" or key not in states:
+                    states[key] = state
+        pending = {"new": [], "dirty": [], "deleted": []}
+        for key, state in states.items():
+            pending[state].append(key)
+        return {state: sorted(keys) for state, keys in pending.items()}
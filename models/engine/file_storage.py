@@ -3,19 +3,31 @@
 Contains the FileStorage class
 """
 
-import json
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
 import models
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, from_micros
 from models.city import City
+from models.engine.criteria import matches, parse as parse_criteria
+from models.engine.flusher import Flusher
+from models.engine.journal import Journal
+from models.engine import serializer, snapshot
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import os
+from os import getenv
+import threading
+import time
 
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# foreign keys indexed by FileStorage, by class name
+foreign_keys = {"City": ["state_id"], "Place": ["city_id"],
+                "Review": ["place_id"]}
 
 
 class FileStorage:
@@ -23,64 +35,676 @@ class FileStorage:
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # string - format of the snapshots written to the JSON file, json or
+    # binary, see models.engine.snapshot; reload() reads either
+    __format = getenv("HBNB_FILE_FORMAT", "json")
+    # bool - split snapshots of at least __shard_min objects into shards
+    __sharded = getenv("HBNB_FILE_SHARDS") == "1"
+    # int - number of objects from which a sharded snapshot is written
+    __shard_min = int(getenv("HBNB_FILE_SHARD_MIN", 100000))
+    # int - number of processes decoding the shards on reload
+    __workers = int(getenv("HBNB_FILE_WORKERS", os.cpu_count() or 1))
+    # string - path to the journal of mutations made since the JSON file
+    __journal_path = "file.json.journal"
+    # bool - append mutations to the journal instead of rewriting the file
+    __journaled = getenv("HBNB_FILE_JOURNAL") == "1"
+    # int - journal size in bytes past which it is compacted into the file
+    __journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX", 1024 * 1024))
+    # bool - keep reloaded records raw until their object is first accessed
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - class name mapped to the objects of that class by
+    # <class name>.id, None standing for a record not instantiated yet
+    __classes = {}
+    # dictionary - class name mapped to the sorted keys of its partition,
+    # sorted when first needed, then kept sorted as keys come and go
+    __sorted = {}
+    # int - keys added or removed at once past which the sorted key lists
+    # are dropped, to be sorted again once, instead of kept sorted key by key
+    __insort_max = 64
+    # dictionary - records not instantiated yet in lazy mode, by key
+    __unloaded = {}
+    # dictionary - keys changed since the last save, mapped to the object
+    # to write or to None when the object was deleted
+    __changes = {}
+    # dictionary - <class name>.<foreign key> mapped to a dictionary from
+    # each parent id to the keys of the objects referencing it
+    __indexes = {}
+    # dictionary - keys of the indexed objects mapped to the foreign key
+    # values they are indexed under, which may no longer be the current ones
+    __indexed = {}
+    # dictionary - fingerprint of the record of each key as last read from
+    # or written to the files, see _fingerprint(), or None until reload()
+    # first compares it, see _last_fingerprint(); the records themselves
+    # are not kept
+    __fingerprints = {}
+    # set - names of the classes with records in the journal, which the
+    # next snapshot must write again instead of keeping their shards
+    __journal_classes = set()
+    # tuple - identity of the JSON file and journal when last read or written
+    __stamp = None
+    # string - sync, batched or async, see models.engine.flusher
+    __durability = getenv("HBNB_STORAGE_DURABILITY", "sync")
+    # int - longest delay in ms before a batched save is written
+    __flush_ms = int(getenv("HBNB_STORAGE_FLUSH_MS", 50))
+    # Flusher - runs the writes requested by save(), created on first use
+    __flusher = None
+    # RLock - guards the dictionaries above against the flusher thread
+    __lock = threading.RLock()
+    # RLock - serializes the writes to the JSON file and journal
+    __write_lock = threading.RLock()
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def all(self, cls=None, limit=None, after=None, load=None):
+        """returns the dictionary __objects, or a copy of the cls partition
+
+        With limit or after, returns a new dictionary of at most limit
+        objects ordered by id, starting after the id after. Without cls,
+        the objects are ordered by key and after is a <class name>.id key.
+        load, the relationships DBStorage loads eagerly, is ignored: they
+        are index lookups here.
+        """
+        if limit is not None or after is not None:
+            return self._page(cls, limit, after)
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            partition = self.__classes.get(self._class_name(cls), {})
+            for key in [k for k, obj in partition.items() if obj is None]:
+                self._load(key)
+            return dict(partition)
+        for key in list(self.__unloaded):
+            self._load(key)
         return self.__objects
 
+    def iter(self, cls=None, batch_size=None, load=None):
+        """yields the objects of cls, or of every class, ordered by key
+
+        Nothing is copied: the objects come from the sorted key list of
+        each class partition, where each step looks up the key following
+        the last one, so that objects added or deleted during the
+        iteration neither repeat nor skip the others. An object deleted
+        during the iteration is skipped. batch_size and load are ignored.
+        """
+        names = sorted(classes) if cls is None else [self._class_name(cls)]
+        for name in names:
+            partition = self.__classes.get(name, {})
+            keys = self._sorted_keys(name)
+            key = ""
+            while True:
+                with self.__lock:
+                    i = bisect_right(keys, key)
+                    if i >= len(keys):
+                        break
+                    key = keys[i]
+                obj = partition.get(key)
+                if obj is None:
+                    if key not in partition:
+                        continue
+                    obj = self._load(key)
+                    if obj is None:
+                        continue
+                yield obj
+
+    def _page(self, cls, limit, after):
+        """returns a page of objects of cls, or of every class, by key"""
+        page = {}
+        if cls is not None:
+            name = self._class_name(cls)
+            names = [name]
+            if after is not None:
+                after = name + "." + after
+        else:
+            names = sorted(classes)
+        for name in names:
+            if limit is not None and len(page) >= limit:
+                break
+            if after is not None and name < after.partition(".")[0]:
+                continue
+            keys = self._sorted_keys(name)
+            start = bisect_right(keys, after) if after is not None else 0
+            end = None if limit is None else start + limit - len(page)
+            partition = self.__classes.get(name, {})
+            for key in keys[start:end]:
+                obj = partition.get(key)
+                page[key] = obj if obj is not None else self._load(key)
+        return page
+
+    def _sorted_keys(self, name):
+        """returns the sorted keys of the partition of class name"""
+        with self.__lock:
+            keys = self.__sorted.get(name)
+            if keys is None:
+                keys = sorted(self.__classes.get(name, ()))
+                self.__sorted[name] = keys
+            return keys
+
+    def _sort(self, name, key):
+        """inserts key in the sorted keys of class name, if sorted yet"""
+        keys = self.__sorted.get(name)
+        if keys is not None:
+            insort(keys, key)
+
+    def _class_name(self, cls):
+        """returns the name of cls, which may be a class or its name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def _add(self, key, obj):
+        """puts obj in __objects, its class partition and its indexes"""
+        self.__objects[key] = obj
+        partition = self.__classes.setdefault(obj.__class__.__name__, {})
+        if key not in partition:
+            self._sort(obj.__class__.__name__, key)
+        partition[key] = obj
+        self._index(key, obj.__class__.__name__, obj.__dict__)
+
+    def _add_unloaded(self, key, record):
+        """registers record under key without instantiating it"""
+        self.__unloaded[key] = record
+        partition = self.__classes.setdefault(record["__class__"], {})
+        if key not in partition:
+            self._sort(record["__class__"], key)
+        partition[key] = None
+        self._index(key, record["__class__"], record)
+
+    def _load(self, key):
+        """instantiates the unloaded record stored under key"""
+        with self.__lock:
+            record = self.__unloaded.pop(key, None)
+            if record is None:
+                return self.__objects.get(key)
+            obj = classes[record["__class__"]](**record)
+            self.__objects[key] = obj
+            self.__classes[record["__class__"]][key] = obj
+            return obj
+
+    def _remove(self, key):
+        """takes the object or unloaded record under key out of storage"""
+        obj = self.__objects.pop(key, None)
+        keys = self.__sorted.get(key.partition(".")[0])
+        if keys is not None:
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+        if obj is not None:
+            self.__classes.get(obj.__class__.__name__, {}).pop(key, None)
+            self._unindex(key)
+        elif key in self.__unloaded:
+            record = self.__unloaded.pop(key)
+            self.__classes[record["__class__"]].pop(key, None)
+            self._unindex(key)
+        return obj
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock:
+                if key in self.__unloaded:
+                    self._remove(key)
+                self._add(key, obj)
+                self.__changes[key] = obj
+
+    def touch(self, obj):
+        """records obj as changed since the last save if it is stored
+
+        BaseModel calls it on every attribute write, so that save() writes
+        the objects changed through setattr. Objects being built or not
+        stored yet are ignored. The cached JSON of the object is dropped,
+        and the object is indexed again if a foreign key changed.
+        """
+        name = obj.__class__.__name__
+        key = name + "." + obj.__dict__.get("id", "")
+        if self.__objects.get(key) is obj:
+            with self.__lock:
+                self.__changes[key] = obj
+                fks = self._keys(name, obj.__dict__)
+                if fks and self.__indexed.get(key) != fks:
+                    self._index(key, name, obj.__dict__)
+            serializer.forget(obj)
+
+    def is_dirty(self, obj):
+        """returns whether obj is not stored or has changes not saved"""
+        key = obj.__class__.__name__ + "." + obj.__dict__.get("id", "")
+        return self.__objects.get(key) is not obj or key in self.__changes
+
+    def pending(self):
+        """returns the keys of the objects the next save() writes
+
+        new lists the objects never written, dirty the objects changed
+        since they were last written or read, and deleted the objects
+        deleted since.
+        """
+        pending = {"new": [], "dirty": [], "deleted": []}
+        with self.__lock:
+            for key, obj in self.__changes.items():
+                if obj is None:
+                    pending["deleted"].append(key)
+                elif key in self.__fingerprints:
+                    pending["dirty"].append(key)
+                else:
+                    pending["new"].append(key)
+        return {state: sorted(keys) for state, keys in pending.items()}
+
+    def bulk_new(self, objs, cls=None):
+        """sets in __objects many objects, or dictionaries of cls
+
+        A dictionary without cls is of the class named by its __class__.
+        Returns the list of objects added.
+        """
+        objs = [self._instance(obj, cls) for obj in objs]
+        with self.__lock:
+            if len(objs) > self.__insort_max:
+                self.__sorted.clear()
+            for obj in objs:
+                self.new(obj)
+        return objs
+
+    def _instance(self, obj, cls=None):
+        """returns obj, or a new cls object if obj is a dictionary"""
+        if isinstance(obj, dict):
+            if cls is None:
+                cls = classes[obj["__class__"]]
+            return cls(**obj)
+        return obj
+
+    def bulk_save(self, objs, cls=None, batch_size=None):
+        """adds many objects, or dictionaries of cls, and saves them once
+
+        The objects are written by a single save() whatever batch_size,
+        which is accepted for compatibility with DBStorage. Returns the
+        number of rows and batches, the time taken and the rows added per
+        second.
+        """
+        start = time.perf_counter()
+        rows = len(self.bulk_new(objs, cls))
+        self.save()
+        seconds = time.perf_counter() - start
+        return {"rows": rows, "batches": 1, "seconds": seconds,
+                "rows_per_sec": rows / seconds if seconds else 0.0}
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path)
+
+        With the sync durability the file is written before returning.
+        batched and async hand the write to a background thread, which
+        merges the saves made until it runs into a single write.
+        """
+        self._flusher().request()
+
+    def _flusher(self):
+        """returns the Flusher running the writes, creating it if needed"""
+        with self.__lock:
+            if FileStorage.__flusher is None:
+                FileStorage.__flusher = Flusher(self._flush,
+                                                self.__durability,
+                                                self.__flush_ms)
+            return FileStorage.__flusher
+
+    def flush(self):
+        """writes what save() left pending without waiting for the delay,
+        raising the error of a background write that failed"""
+        if FileStorage.__flusher is not None:
+            FileStorage.__flusher.stop()
+
+    def flush_stats(self):
+        """returns the durability and how many saves were merged away"""
+        return self._flusher().stats()
+
+    def _flush(self):
+        """writes the changes made since the last write to the files
+
+        In journaled mode only the objects changed since the last write are
+        appended to the journal, which is compacted into the JSON file once
+        it grows past __journal_max bytes. The sync durability fsyncs each
+        append, like each snapshot. Changes that could not be written stay
+        pending for the next write.
+        """
+        with self.__write_lock:
+            if not self.__journaled:
+                self._write_snapshot()
+                return
+            with self.__lock:
+                pending = dict(self.__changes)
+                changes = [(key, obj.to_record() if obj is not None else None)
+                           for key, obj in pending.items()]
+                self.__changes.clear()
+            journal = Journal(self.__journal_path)
+            try:
+                journal.append(changes, fsync=self.__durability == "sync")
+            except BaseException:
+                self._restore(pending)
+                raise
+            with self.__lock:
+                self.__journal_classes.update(
+                    key.partition(".")[0] for key, record in changes)
+                for key, record in changes:
+                    if record is None:
+                        self.__fingerprints.pop(key, None)
+                    else:
+                        self.__fingerprints[key] = None
+            if journal.size() > self.__journal_max:
+                self.compact()
+            else:
+                FileStorage.__stamp = self._stamp()
+
+    def compact(self):
+        """folds the journal into a fresh JSON file and empties it"""
+        with self.__write_lock:
+            self._write_snapshot()
+            Journal(self.__journal_path).truncate()
+            FileStorage.__stamp = self._stamp()
+
+    def _write_snapshot(self):
+        """rewrites the JSON file with every object in __objects
+
+        Records that were never instantiated are written as read. The
+        fingerprints of the records written are left to be computed when
+        reload() compares them. A sharded snapshot keeps the shards of the
+        classes without changes since the last snapshot, neither pending
+        nor in the journal, when the file is the one last read or
+        written, and does not build the records of those classes. The
+        file is replaced atomically, see models.engine.snapshot; if that
+        fails, the changes stay pending.
+        """
+        with self.__write_lock:
+            sharded = self.__sharded and self.count() >= self.__shard_min
+            kept = {}
+            if sharded and self._stamp() == self.__stamp:
+                with self.__lock:
+                    changed = {key.partition(".")[0] for key in self.__changes}
+                    changed |= self.__journal_classes
+                kept = snapshot.kept_shards(self.__file_path, changed)
+            with self.__lock:
+                pending = dict(self.__changes)
+                journal_classes = set(self.__journal_classes)
+                changed = {key.partition(".")[0] for key in pending}
+                changed |= journal_classes
+                kept = {name: files for name, files in kept.items()
+                        if name not in changed and self.__classes.get(name)}
+                if kept:
+                    json_objects = {}
+                    for name, partition in self.__classes.items():
+                        if name in kept:
+                            continue
+                        for key, obj in partition.items():
+                            json_objects[key] = self.__unloaded[key] \
+                                if obj is None else obj.to_record()
+                else:
+                    json_objects = {key: obj.to_record()
+                                    for key, obj in self.__objects.items()}
+                    json_objects.update(self.__unloaded)
+                self.__changes.clear()
+                self.__journal_classes.clear()
+            try:
+                if sharded:
+                    by_class = {}
+                    for key, record in json_objects.items():
+                        by_class.setdefault(key.partition(".")[0],
+                                            {})[key] = record
+                    snapshot.write_shards(self.__file_path, by_class, kept,
+                                          self.__format)
+                else:
+                    snapshot.write(self.__file_path, json_objects,
+                                   self.__format)
+            except BaseException:
+                self._restore(pending, journal_classes)
+                raise
+            with self.__lock:
+                old = self.__fingerprints
+                for key in pending:
+                    if key not in json_objects:
+                        old.pop(key, None)
+                for key in json_objects:
+                    if key in pending or key not in old:
+                        old[key] = None
+            FileStorage.__stamp = self._stamp()
+
+    def _restore(self, pending, journal_classes=()):
+        """puts back the changes and journal classes a failed write took,
+        behind the changes made since"""
+        with self.__lock:
+            for key, obj in pending.items():
+                self.__changes.setdefault(key, obj)
+            self.__journal_classes.update(journal_classes)
+
+    @staticmethod
+    def _fingerprint(record):
+        """returns a hash of record, equal for records of equal content"""
+        return hash(repr(sorted(record.items())))
+
+    def _last_fingerprint(self, key):
+        """returns the fingerprint of the record of key as last read or
+        written, computed from the object if not yet, which is the record
+        as long as the object has no change pending"""
+        fingerprint = self.__fingerprints[key]
+        if fingerprint is None:
+            record = self.__unloaded.get(key)
+            if record is None:
+                record = self.__objects[key].to_record()
+            fingerprint = self._fingerprint(record)
+        return fingerprint
+
+    def _stamp(self):
+        """returns the inode, size and mtime of the JSON file and journal"""
+        stamp = ()
+        for path in (self.__file_path, self.__journal_path):
+            try:
+                st = os.stat(path)
+                stamp += ((st.st_ino, st.st_size, st.st_mtime_ns),)
+            except OSError:
+                stamp += (None,)
+        return stamp
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
-        try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
-            pass
+        """deserializes the JSON file, then its journal, to __objects
+
+        A missing file means an empty store, a corrupted one raises
+        SnapshotError. Only the records that differ from the ones last read
+        or written are instantiated again, and in lazy mode not before they
+        are first accessed through all(), get() or filter(). Only the
+        records of keys already in storage are fingerprinted, to be
+        compared: the others are new anyway. Objects whose
+        record is gone from the files are dropped, and objects that were
+        never saved are kept. Keys with a change not written yet, such as
+        a delete a batched save has not flushed, keep their change: the
+        files do not override it. The counters of count() are reconciled
+        with the objects once the files are read.
+        """
+        with self.__write_lock:
+            FileStorage.__stamp = self._stamp()
+            jo = snapshot.read(self.__file_path, self.__workers)
+            journal_classes = set()
+            for key, record in Journal(self.__journal_path).replay():
+                journal_classes.add(key.partition(".")[0])
+                if record is None:
+                    jo.pop(key, None)
+                else:
+                    jo[key] = record
+        with self.__lock:
+            pending = self.__changes
+            gone = [key for key in self.__fingerprints
+                    if key not in jo and key not in pending]
+            fingerprints = dict.fromkeys(jo)
+            stale = []
+            for key, record in jo.items():
+                if key in pending:
+                    continue
+                if key not in self.__fingerprints or (
+                        key not in self.__objects and
+                        key not in self.__unloaded):
+                    stale.append(key)
+                    continue
+                fingerprints[key] = self._fingerprint(record)
+                if self._last_fingerprint(key) != fingerprints[key]:
+                    stale.append(key)
+            if len(gone) + len(stale) > self.__insort_max:
+                self.__sorted.clear()
+            for key in gone:
+                self._remove(key)
+            for key in stale:
+                record = jo[key]
+                self._remove(key)
+                if self.__lazy:
+                    self._add_unloaded(key, record)
+                else:
+                    self._add(key, classes[record["__class__"]](**record))
+            self.__fingerprints.clear()
+            self.__fingerprints.update(fingerprints)
+            self.__journal_classes.clear()
+            self.__journal_classes.update(journal_classes)
+            self.reconcile()
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock:
+                if self._remove(key) is not None:
+                    self.__changes[key] = None
+
+    def _keys(self, name, values):
+        """returns the foreign key values of class name found in values
+
+        values is the object's __dict__ or its raw record, with the class
+        attribute default standing in for a missing foreign key.
+        """
+        return {attr: values.get(attr, getattr(classes[name], attr, None))
+                for attr in foreign_keys.get(name, ())}
+
+    def _index(self, key, name, values):
+        """adds key to the indexes of its class foreign keys, moving it
+        from the entries it was indexed under before"""
+        if name not in foreign_keys:
+            return
+        self._unindex(key)
+        fks = self._keys(name, values)
+        for attr, value in fks.items():
+            index = self.__indexes.setdefault(name + "." + attr, {})
+            index.setdefault(value, {})[key] = None
+        self.__indexed[key] = fks
+
+    def _unindex(self, key):
+        """removes key from the index entries it was indexed under"""
+        name = key.partition(".")[0]
+        for attr, value in self.__indexed.pop(key, {}).items():
+            index = self.__indexes.get(name + "." + attr)
+            keys = index.get(value) if index else None
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del index[value]
+
+    def filter(self, cls, limit=None, **criteria):
+        """returns the cls objects matching criteria, by key
+
+        See models.engine.criteria for the criteria. An equality or IN
+        criterion on the id or an indexed foreign key narrows the objects
+        checked to its matches, otherwise the objects of cls are scanned.
+        With limit, returns the first limit matches ordered by id, and
+        stops checking objects once they are found.
+        Unloaded records are checked raw and only the matching ones are
+        instantiated. Writing a foreign key moves the object to its new
+        index entry, see touch().
+        """
+        name = self._class_name(cls)
+        predicates = parse_criteria(criteria)
+        partition = self.__classes.get(name, {})
+        keys = None
+        for attr, op, value in predicates:
+            if op not in ("eq", "in"):
+                continue
+            values = [value] if op == "eq" else value
+            if attr == "id":
+                keys = [name + "." + str(v) for v in values]
+                break
+            if attr in foreign_keys.get(name, ()):
+                index = self.__indexes.get(name + "." + attr, {})
+                keys = [key for v in values for key in index.get(v, ())]
+                break
+        if keys is None:
+            keys = list(partition) if limit is None else \
+                self._sorted_keys(name)[:]
+        elif limit is not None:
+            keys = sorted(keys)
+        matched = {}
+        for key in dict.fromkeys(keys):
+            if limit is not None and len(matched) >= limit:
+                break
+            if key not in partition:
+                continue
+            obj = partition[key]
+            record = self.__unloaded.get(key) if obj is None else None
+            if obj is None and record is None:
+                continue
+            if all(matches(self._value(name, obj, record, attr), op, value)
+                   for attr, op, value in predicates):
+                matched[key] = obj if obj is not None else self._load(key)
+        return matched
+
+    def _value(self, name, obj, record, attr):
+        """returns attr of obj, or of its raw record when it is unloaded"""
+        if obj is not None:
+            return getattr(obj, attr, None)
+        value = record.get(attr, getattr(classes[name], attr, None))
+        if attr in ("created_at", "updated_at"):
+            if type(value) is int:
+                return from_micros(value)
+            if type(value) is str:
+                return datetime.fromisoformat(value)
+        return value
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() if the JSON file or journal changed since last read
+
+        Another process saving bumps the files' inode, size or mtime; when
+        none of them moved, __objects is already up to date.
+        """
+        if self._stamp() != self.__stamp:
+            self.reload()
 
-    def get(self, cls, id):
-        """ get a specific object based on class and id """
+    def get(self, cls, id, load=None):
+        """ get a specific object based on class and id, load is ignored """
         key = "{}.{}".format(cls.__name__, id)
         if key in self.__objects.keys():
             return self.__objects[key]
+        if key in self.__unloaded:
+            return self._load(key)
         return None
 
     def count(self, cls=None):
-        """ count objs from a class or every class """
+        """ count objs from a class or every class
+
+        The class partitions, which new() and delete() keep up to date,
+        are the live counters: counting reads their sizes.
+        """
         if cls is None:
-            return len(self.all())
+            return len(self.__objects) + len(self.__unloaded)
         else:
-            return len(self.all(cls))
+            return len(self.__classes.get(self._class_name(cls), ()))
+
+    def counts(self):
+        """returns the number of objects of every class"""
+        return {name: len(self.__classes.get(name, ())) for name in classes}
+
+    def reconcile(self):
+        """counts the objects of every class again and repairs the counters
+
+        Returns the drift found: the size of the class partition minus the
+        objects and unloaded records of that class, for each class whose
+        partition was off. Such a partition is rebuilt.
+        """
+        with self.__lock:
+            actual = {}
+            for key, obj in self.__objects.items():
+                actual.setdefault(obj.__class__.__name__, {})[key] = obj
+            for key, record in self.__unloaded.items():
+                actual.setdefault(record["__class__"], {})[key] = None
+            drift = {}
+            for name in set(actual) | set(self.__classes):
+                partition = self.__classes.get(name, {})
+                objs = actual.get(name, {})
+                if len(partition) != len(objs):
+                    drift[name] = len(partition) - len(objs)
+                if partition.keys() != objs.keys():
+                    self.__classes[name] = objs
+                    self.__sorted.pop(name, None)
+            return drift
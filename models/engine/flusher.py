@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+Contains the Flusher class
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+# durability levels understood by the storage engines
+durabilities = ("sync", "batched", "async")
+
+logger = logging.getLogger(__name__)
+
+
+class Flusher:
+    """calls a flush function on save requests, merging them when deferred
+
+    sync flushes in the caller's thread on every request. batched lets a
+    background thread flush at most delay_ms after the first request it
+    has not flushed yet, and async flushes in the background as soon as
+    possible, merging the requests made while a flush is running.
+    A background flush that fails is logged, counted in stats(), and
+    raised again by the next stop().
+    """
+
+    def __init__(self, flush, durability="sync", delay_ms=50):
+        """Instantiate a Flusher calling flush"""
+        if durability not in durabilities:
+            raise ValueError("unknown durability: {}".format(durability))
+        self.flush = flush
+        self.durability = durability
+        self.delay = delay_ms / 1000
+        self.saves = 0
+        self.flushes = 0
+        self.errors = 0
+        self.last_error = None
+        self.__unraised = None
+        self.__pending = 0
+        self.__first = None
+        self.__thread = None
+        self.__stopping = False
+        self.__cond = threading.Condition()
+        if durability != "sync":
+            atexit.register(self.stop)
+
+    def request(self):
+        """records a save and flushes now or schedules a flush"""
+        if self.durability == "sync":
+            self.saves += 1
+            self.flush()
+            self.flushes += 1
+            return
+        with self.__cond:
+            self.saves += 1
+            if self.__pending == 0:
+                self.__first = time.monotonic()
+            self.__pending += 1
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self._run,
+                                                 name="storage-flusher",
+                                                 daemon=True)
+                self.__thread.start()
+            self.__cond.notify()
+
+    def _run(self):
+        """background loop flushing the pending requests"""
+        while True:
+            with self.__cond:
+                while not self.__pending and not self.__stopping:
+                    self.__cond.wait()
+                if self.durability == "batched":
+                    deadline = self.__first + self.delay
+                    while not self.__stopping:
+                        left = deadline - time.monotonic()
+                        if left <= 0:
+                            break
+                        self.__cond.wait(left)
+                if not self.__pending and self.__stopping:
+                    return
+                self.__pending = 0
+            self._flush_now()
+
+    def _flush_now(self):
+        """calls flush, logging and keeping the error for stop() instead
+        of killing the thread"""
+        try:
+            self.flush()
+            self.flushes += 1
+        except Exception as e:
+            logger.exception("storage flush failed")
+            with self.__cond:
+                self.errors += 1
+                self.last_error = e
+                self.__unraised = e
+
+    def stop(self):
+        """flushes what is pending and stops the background thread
+
+        Raises the error of the last flush that failed since the previous
+        stop(), if any, once the thread is stopped.
+        """
+        with self.__cond:
+            pending = self.__pending
+            self.__pending = 0
+            self.__stopping = True
+            self.__cond.notify()
+        if self.__thread is not None:
+            self.__thread.join()
+        if pending:
+            self._flush_now()
+        with self.__cond:
+            self.__thread = None
+            self.__stopping = False
+            error, self.__unraised = self.__unraised, None
+        if error is not None:
+            raise error
+
+    def stats(self):
+        """returns the number of saves, flushes, saves merged away and
+        failed flushes, with the last error"""
+        return {"durability": self.durability, "saves": self.saves,
+                "flushes": self.flushes,
+                "merged": self.saves - self.flushes - self.__pending -
+                self.errors,
+                "errors": self.errors,
+                "last_error": None if self.last_error is None
+                else repr(self.last_error)}
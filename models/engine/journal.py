@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Contains the Journal class
+"""
+
+import json
+import os
+
+
+class JournalError(ValueError):
+    """raised when a journal record other than the last one is corrupted"""
+
+
+class Journal:
+    """append-only log of the mutations made since the last snapshot
+
+    Each line is a compact JSON array, either ["p", key, record] for an
+    object that was created or updated, or ["d", key] for a deleted one,
+    where key is <class name>.id and record is the object's to_dict().
+    """
+
+    def __init__(self, path):
+        """Instantiate a Journal writing to path"""
+        self.path = path
+
+    def append(self, changes, fsync=False):
+        """appends one record per (key, record) pair, None meaning delete
+
+        A torn last line left by a crash mid-append is cut off first, so
+        that the new records start on a line of their own. With fsync,
+        the records are on disk when append returns.
+        """
+        lines = []
+        for key, record in changes:
+            if record is None:
+                lines.append(json.dumps(["d", key]))
+            else:
+                lines.append(json.dumps(["p", key, record]))
+        if not lines:
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, 'r+b') as f:
+            f.seek(self._end(f))
+            f.truncate()
+            f.write(("\n".join(lines) + "\n").encode())
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _end(f):
+        """returns the offset just past the last complete line of f"""
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - 4096)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            end = start
+        return 0
+
+    def replay(self):
+        """yields (key, record) pairs in order, record None for a delete
+
+        A bad last line, torn by a crash mid-append, is ignored. A bad
+        line followed by others raises JournalError.
+        """
+        try:
+            f = open(self.path, 'r')
+        except FileNotFoundError:
+            return
+        with f:
+            number = 0
+            bad = None
+            for line in f:
+                number += 1
+                if bad is not None:
+                    raise JournalError("{}: bad record on line {}".format(
+                        self.path, bad))
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    bad = number
+                    continue
+                if entry[0] == "p":
+                    yield entry[1], entry[2]
+                else:
+                    yield entry[1], None
+
+    def size(self):
+        """returns the size of the journal file in bytes"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def truncate(self):
+        """empties the journal once its records are in a snapshot"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Versioned schema migrations of the database storage
+
+create_all() creates the missing tables but never changes an existing
+one. Each change to the schema of tables that may already hold data is a
+migration function below, applied once per database, in order, by
+migrate(). The schema_version table records the ones applied.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from models.base_model import Base
+from os import getenv
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.exc import IntegrityError
+
+metadata = MetaData()
+schema_version = Table("schema_version", metadata,
+                       Column("version", Integer, primary_key=True),
+                       Column("name", String(128), nullable=False),
+                       Column("applied_at", DateTime, nullable=False))
+# name of the MySQL lock held while migrating
+LOCK = "hbnb_schema_migrations"
+# seconds to wait for another process to finish migrating
+LOCK_TIMEOUT = int(getenv('HBNB_MIGRATE_LOCK_TIMEOUT', 60))
+
+
+def add_lookup_indexes(conn):
+    """indexes the columns relationships and filters look rows up by"""
+    for table in ("cities", "places", "reviews", "users"):
+        for index in Base.metadata.tables[table].indexes:
+            index.create(conn, checkfirst=True)
+
+
+# migrations in order, the schema version after each is its position + 1
+migrations = [add_lookup_indexes]
+
+
+def current_version(conn):
+    """returns the schema version of the database of connection conn"""
+    if not conn.dialect.has_table(conn, schema_version.name):
+        return 0
+    return conn.execute(
+        select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def upgrade(conn):
+    """applies on conn the migrations its database has not had yet
+
+    Each migration is followed by its schema_version row. Returns the
+    schema version of the database.
+    """
+    current = current_version(conn)
+    for number, migration in enumerate(migrations[current:], current + 1):
+        schema_version.create(conn, checkfirst=True)
+        migration(conn)
+        conn.execute(insert(schema_version).values(
+            version=number, name=migration.__name__,
+            applied_at=datetime.utcnow()))
+        current = number
+    return current
+
+
+def version(engine):
+    """returns the schema version of the database of engine"""
+    with engine.connect() as conn:
+        return current_version(conn)
+
+
+def migrate(engine):
+    """applies the migrations the database of engine has not had yet and
+    returns the schema version of the database
+
+    The migrations run in one transaction, but MySQL commits each DDL
+    statement on its own, so a failed migration may leave its changes
+    without its schema_version row. The migrations therefore only create
+    what is missing. Processes migrating at the same time, such as two
+    servers starting together, are serialized on MySQL by a named lock,
+    see lock(). On the other databases, a version row another process
+    inserted first makes the migration count as already applied.
+    """
+    with engine.connect() as conn:
+        with lock(conn):
+            try:
+                with conn.begin():
+                    return upgrade(conn)
+            except IntegrityError:
+                return current_version(conn)
+
+
+@contextmanager
+def lock(conn):
+    """holds the migration lock of the database of conn, on MySQL
+
+    GET_LOCK waits up to LOCK_TIMEOUT seconds for another process to
+    release it, then raises TimeoutError. The lock belongs to the
+    connection, not to a transaction. Other databases take no lock.
+    """
+    if conn.dialect.name != "mysql":
+        yield
+        return
+    locked = conn.execute(text("SELECT GET_LOCK(:name, :timeout)"),
+                          {"name": LOCK, "timeout": LOCK_TIMEOUT}).scalar()
+    conn.commit()
+    if locked != 1:
+        raise TimeoutError("schema migration lock {} not acquired within {} "
+                           "seconds".format(LOCK, LOCK_TIMEOUT))
+    try:
+        yield
+    finally:
+        conn.rollback()
+        conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK})
+        conn.commit()
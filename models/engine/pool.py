@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Contains the TimedQueuePool and PoolMonitor classes
+"""
+
+from os import getenv
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+import threading
+import time
+
+
+def pool_options():
+    """returns the create_engine() pool arguments set by HBNB_MYSQL_POOL_*"""
+    return {"poolclass": TimedQueuePool,
+            "pool_size": int(getenv('HBNB_MYSQL_POOL_SIZE', 5)),
+            "max_overflow": int(getenv('HBNB_MYSQL_POOL_OVERFLOW', 10)),
+            "pool_timeout": float(getenv('HBNB_MYSQL_POOL_TIMEOUT', 30)),
+            "pool_recycle": int(getenv('HBNB_MYSQL_POOL_RECYCLE', 3600)),
+            "pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING', '1') == '1'}
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that measures how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool with the arguments of QueuePool"""
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self.__lock = threading.Lock()
+
+    def _do_get(self):
+        """checks a connection out, timing the wait for a free one"""
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.__lock:
+                self.waits += 1
+                self.wait_time += elapsed
+                self.max_wait = max(self.max_wait, elapsed)
+                self.timeouts += timed_out
+
+
+class PoolMonitor:
+    """follows the connections of an engine's pool through pool events"""
+
+    def __init__(self, engine):
+        """Instantiate a PoolMonitor listening to the pool of engine"""
+        self.engine = engine
+        self.connects = 0
+        self.checkouts = 0
+        self.__opened = {}
+        self.__lock = threading.Lock()
+        event.listen(engine, "connect", self._connect)
+        event.listen(engine, "checkout", self._checkout)
+        event.listen(engine, "close", self._close)
+        event.listen(engine, "close_detached", self._close_detached)
+
+    def _connect(self, dbapi_connection, connection_record):
+        """records when a new DBAPI connection was opened"""
+        with self.__lock:
+            self.connects += 1
+            self.__opened[id(dbapi_connection)] = time.monotonic()
+
+    def _checkout(self, dbapi_connection, connection_record,
+                  connection_proxy):
+        """counts the checkouts"""
+        with self.__lock:
+            self.checkouts += 1
+
+    def _close(self, dbapi_connection, connection_record):
+        """forgets a DBAPI connection the pool closed"""
+        self._close_detached(dbapi_connection)
+
+    def _close_detached(self, dbapi_connection):
+        """forgets a detached DBAPI connection that was closed"""
+        with self.__lock:
+            self.__opened.pop(id(dbapi_connection), None)
+
+    def stats(self):
+        """returns the pool occupancy, checkout waits and connection ages"""
+        pool = self.engine.pool
+        now = time.monotonic()
+        with self.__lock:
+            ages = [now - opened for opened in self.__opened.values()]
+        stats = {"size": pool.size(), "checked_out": pool.checkedout(),
+                 "overflow": max(0, pool.overflow()),
+                 "connects": self.connects, "checkouts": self.checkouts,
+                 "connections": len(ages),
+                 "max_age": max(ages, default=0.0),
+                 "mean_age": sum(ages) / len(ages) if ages else 0.0}
+        if isinstance(pool, TimedQueuePool):
+            stats.update({"waits": pool.waits, "wait_time": pool.wait_time,
+                          "max_wait": pool.max_wait,
+                          "timeouts": pool.timeouts})
+        return stats
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+Contains the ReplicaSet and RoutingSession classes
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+import threading
+import time
+
+
+def replica_lag(engine):
+    """returns how many seconds engine lags behind its primary
+
+    MySQL replicas report it in SHOW REPLICA STATUS. Other databases have
+    no replication to measure and only need to answer. Returns None when
+    the replica is not replicating or cannot be reached.
+    """
+    try:
+        with engine.connect() as conn:
+            if engine.dialect.name != "mysql":
+                conn.exec_driver_sql("SELECT 1")
+                return 0.0
+            try:
+                row = conn.exec_driver_sql(
+                    "SHOW REPLICA STATUS").mappings().first()
+            except Exception:
+                row = conn.exec_driver_sql(
+                    "SHOW SLAVE STATUS").mappings().first()
+    except Exception:
+        return None
+    if row is None:
+        return None
+    lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+    return None if lag is None else float(lag)
+
+
+class ReplicaSet:
+    """read replicas handed out in turn, skipping the ones that lag
+
+    The lag of each replica is measured by probe at most every interval
+    seconds. A replica lagging more than max_lag seconds, or that could
+    not be probed, is skipped until it catches up.
+    """
+
+    def __init__(self, engines, max_lag=5, interval=1, probe=replica_lag):
+        """Instantiate a ReplicaSet of engines"""
+        self.engines = list(engines)
+        self.max_lag = max_lag
+        self.interval = interval
+        self.probe = probe
+        self.fallbacks = 0
+        self.__next = 0
+        self.__reads = [0] * len(self.engines)
+        self.__lags = [None] * len(self.engines)
+        self.__checked = [None] * len(self.engines)
+        self.__lock = threading.Lock()
+
+    def _lag(self, i):
+        """returns the lag of replica i, probing it if it is time"""
+        now = time.monotonic()
+        with self.__lock:
+            checked = self.__checked[i]
+            if checked is not None and now - checked < self.interval:
+                return self.__lags[i]
+            self.__checked[i] = now
+        lag = self.probe(self.engines[i])
+        with self.__lock:
+            self.__lags[i] = lag
+        return lag
+
+    def choose(self):
+        """returns the next replica not lagging, or None if they all lag"""
+        for attempt in range(len(self.engines)):
+            with self.__lock:
+                i = self.__next
+                self.__next = (i + 1) % len(self.engines)
+            lag = self._lag(i)
+            if lag is not None and lag <= self.max_lag:
+                with self.__lock:
+                    self.__reads[i] += 1
+                return self.engines[i]
+        with self.__lock:
+            self.fallbacks += 1
+        return None
+
+    def stats(self):
+        """returns the reads and last lag of each replica"""
+        with self.__lock:
+            replicas = [{"url": engine.url.render_as_string(
+                             hide_password=True),
+                         "reads": self.__reads[i], "lag": self.__lags[i]}
+                        for i, engine in enumerate(self.engines)]
+            return {"replicas": replicas, "fallbacks": self.fallbacks}
+
+
+class RoutingSession(Session):
+    """Session reading from a replica until it writes to the primary
+
+    The first read picks a replica from replicas, used by the following
+    reads for a consistent view. Flushes and INSERT, UPDATE or DELETE
+    statements go to the primary the session is bound to, and so do all
+    the reads after them, so a session sees its own writes.
+    """
+
+    def __init__(self, *args, replicas=None, **kwargs):
+        """Instantiate a RoutingSession reading from replicas"""
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """returns the engine a statement runs on"""
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if not self.replicas or not self.replicas.engines:
+            return primary
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["primary"] = True
+        if self.info.get("primary"):
+            return primary
+        if "replica" not in self.info:
+            self.info["replica"] = self.replicas.choose()
+        return self.info["replica"] or primary
+
+    def reads_primary(self):
+        """returns whether the reads of the session so far went to the
+        primary, which has every committed write, and not to a replica,
+        which may lag behind it"""
+        return bool(self.info.get("primary") or
+                    not self.info.get("replica"))
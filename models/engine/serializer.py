@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Encodes objects to the JSON of their to_dict(), caching each encoding
+
+The encoding of an object is kept along with its updated_at and served
+again while updated_at is unchanged and the storage reports the object
+clean, see is_dirty() of FileStorage, which also forget()s an object as
+soon as it changes. Entries go away with their objects.
+
+Only the objects of file storage are cached: the database storage builds
+new objects in every session, so their cached encodings would never be
+served again.
+"""
+
+import json
+import models
+from weakref import WeakKeyDictionary
+
+# object -> (updated_at, JSON bytes of its to_dict())
+_encoded = WeakKeyDictionary()
+# the compact, sorted output of jsonify()
+_encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
+def encode(obj):
+    """returns the JSON bytes of obj.to_dict(), from the cache if valid"""
+    return _encode_all([obj])[0]
+
+
+def encode_many(objs):
+    """returns the JSON array of the to_dict() of objs, as bytes
+
+    The encoding of each object is looked up in the cache and the array
+    is joined from them, without building the list of dictionaries.
+    """
+    return b"[" + b",".join(_encode_all(objs)) + b"]"
+
+
+def _encode_all(objs):
+    """returns the list of the JSON bytes of objs, caching the clean ones"""
+    encode_json = _encoder.encode
+    if models.storage_t == "db":
+        return [encode_json(obj.to_dict()).encode() for obj in objs]
+    is_dirty = models.storage.is_dirty
+    cached_get = _encoded.get
+    encoded = []
+    for obj in objs:
+        # the raw value, microseconds in file storage, saves building a
+        # datetime; an expired database object loads it again
+        stamp = obj.__dict__.get("updated_at")
+        if stamp is None:
+            stamp = obj.updated_at
+        cached = cached_get(obj)
+        dirty = is_dirty(obj)
+        if cached is not None and cached[0] == stamp and not dirty:
+            encoded.append(cached[1])
+            continue
+        data = encode_json(obj.to_dict()).encode()
+        if not dirty:
+            _encoded[obj] = (stamp, data)
+        encoded.append(data)
+    return encoded
+
+
+def forget(obj):
+    """drops the cached encoding of obj"""
+    _encoded.pop(obj, None)
+
+
+def stats():
+    """returns the number of objects whose encoding is cached"""
+    return {"size": len(_encoded)}
@@ -0,0 +1,518 @@
+#!/usr/bin/python3
+"""
+Reads and writes the snapshot files of FileStorage
+
+A snapshot is a one-line header followed by the records in one of two
+formats: json, the records dictionary as JSON text, or binary, where the
+records are grouped by class and stored column by column, timestamps as
+integer microseconds, read back as such, and ids as 16-byte UUIDs.
+
+A large snapshot can instead be a manifest listing shard files, each a
+snapshot of part of one class, which read() decodes in parallel.
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import glob
+from itertools import accumulate, repeat
+import json
+from models.base_model import to_micros
+import multiprocessing
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+# first bytes of a snapshot written with a checksum header
+MAGIC = b"HBNB-SNAPSHOT"
+# snapshot body formats
+formats = ("json", "binary")
+# first bytes of a binary body stored column by column
+COLUMNS = b"HBC2"
+# value tags of the binary format
+ABSENT, NONE, STR, INT, FLOAT, TRUE, FALSE, JSON = range(8)
+# records per shard above which a class is split over several shards
+SHARD_SIZE = 50000
+# timestamp standing for a missing created_at or updated_at
+NO_TIME = -2 ** 63
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+I64 = struct.Struct("<q")
+F64 = struct.Struct("<d")
+TIMES = struct.Struct("<qq")
+UUID = re.compile("[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-"
+                  "[0-9a-f]{12}")
+# stands for a missing value in a column
+_absent = object()
+
+
+class SnapshotError(ValueError):
+    """raised when a snapshot file is truncated or corrupted"""
+
+
+def write(path, records, fmt="json", shard_min=None, shard_size=SHARD_SIZE,
+          changed=None):
+    """atomically replaces path with a snapshot of records in format fmt
+
+    The snapshot goes to a temporary file next to path, is fsync'd, and
+    is renamed over path, so a crash leaves either the old or the new
+    snapshot, never a truncated one. Readers that opened the old file
+    keep reading it while a new one is written.
+
+    When shard_min is set and there are at least that many records, they
+    are written to shard files of at most about shard_size records of a
+    single class, and path becomes the manifest listing them. changed is
+    the set of class names whose records differ from the snapshot at path,
+    if known: the shards of the other classes it lists are kept as they
+    are instead of being written again.
+    """
+    if fmt not in formats:
+        raise ValueError("unknown snapshot format: {}".format(fmt))
+    if shard_min is None or len(records) < shard_min:
+        _write_file(path, _encode(records, fmt), fmt)
+        _remove_shards(path, ())
+        return
+    by_class = {}
+    for key, record in records.items():
+        by_class.setdefault(record["__class__"], {})[key] = record
+    kept = kept_shards(path, changed) if changed is not None else {}
+    write_shards(path, {name: group for name, group in by_class.items()
+                        if name not in kept},
+                 {name: files for name, files in kept.items()
+                  if name in by_class}, fmt, shard_size)
+
+
+def write_shards(path, by_class, kept, fmt="json", shard_size=SHARD_SIZE):
+    """atomically replaces path with a manifest of shards
+
+    by_class maps class names to their records by key, which are written
+    to new shards. kept maps the other class names to shard files of the
+    manifest at path, see kept_shards(), listed again as they are, so
+    that the records of those classes need not be built at all.
+    """
+    if fmt not in formats:
+        raise ValueError("unknown snapshot format: {}".format(fmt))
+    generation = "{:x}".format(time.time_ns())
+    files = []
+    for name, group in kept.items():
+        files.extend(group)
+    for name, group in by_class.items():
+        parts = [{} for i in range(-(-len(group) // shard_size))]
+        for key, record in group.items():
+            parts[zlib.crc32(key.encode()) % len(parts)][key] = record
+        for i, part in enumerate(parts):
+            file = "{}.shard-{}-{}-{}".format(os.path.basename(path),
+                                              generation, name, i)
+            _write_file(os.path.join(os.path.dirname(path), file),
+                        _encode(part, fmt), fmt)
+            files.append(file)
+    _write_file(path, json.dumps({"shards": files}).encode(), "shards")
+    _remove_shards(path, files)
+
+
+def kept_shards(path, changed):
+    """returns the shard files of the manifest at path, by class name,
+    of the classes not in changed"""
+    try:
+        files = _read_file(path)
+    except SnapshotError:
+        return {}
+    if not isinstance(files, list):
+        return {}
+    prefix = os.path.basename(path) + ".shard-"
+    kept = {}
+    for file in files:
+        name = file[len(prefix):].split("-")[1]
+        kept.setdefault(name, []).append(file)
+    directory = os.path.dirname(path)
+    return {name: group for name, group in kept.items()
+            if name not in changed and
+            all(os.path.exists(os.path.join(directory, file))
+                for file in group)}
+
+
+def _encode(records, fmt):
+    """returns the body of a snapshot of records in format fmt"""
+    if fmt == "binary":
+        return encode_binary(records)
+    return json.dumps(records).encode()
+
+
+def _remove_shards(path, keep):
+    """removes the shard files of path that are not listed in keep"""
+    for file in glob.glob(glob.escape(path) + ".shard-*"):
+        if os.path.basename(file) not in keep:
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+
+
+def _write_file(path, body, fmt):
+    """atomically replaces path with the header of fmt and body
+
+    Each write has a temporary file of its own, so processes saving at
+    the same time never write into each other's; it is removed if the
+    write fails.
+    """
+    header = "{} 1 {} crc32={:08x} len={}\n".format(
+        MAGIC.decode(), fmt, zlib.crc32(body), len(body)).encode()
+    directory, name = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(dir=directory or ".", prefix=name + ".")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            # mkstemp creates the file readable by its owner only
+            os.fchmod(f.fileno(), 0o644)
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def _fsync_dir(path):
+    """fsyncs the directory path so that a rename in it is durable"""
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read(path, workers=1):
+    """returns the records of the snapshot at path, {} if there is none
+
+    Files without a header, as written before snapshots had one, are
+    read as plain JSON. Raises SnapshotError when the checksum or length
+    in the header does not match, or when the JSON does not parse.
+
+    The shards of a manifest are decoded by a pool of up to workers
+    processes and merged, but only while the calling thread is the only
+    one: forking a process that runs other threads, such as the flusher
+    or the threads of a server, can deadlock the child on a lock one of
+    them held. Otherwise the shards are decoded in turn. A shard removed
+    by a concurrent write makes the manifest be read again.
+    """
+    for attempt in range(3):
+        records = _read_file(path)
+        if not isinstance(records, list):
+            return records
+        files = [os.path.join(os.path.dirname(path), file)
+                 for file in records]
+        try:
+            return _read_shards(files, workers)
+        except FileNotFoundError:
+            continue
+    raise SnapshotError("{}: shards keep being replaced".format(path))
+
+
+def _read_shards(files, workers):
+    """returns the merged records of the shard files"""
+    records = {}
+    if workers > 1 and len(files) > 1 and \
+            threading.active_count() == 1 and \
+            "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(min(workers, len(files)),
+                                 mp_context=context) as pool:
+            for part in pool.map(_read_file, files):
+                records.update(part)
+    else:
+        for file in files:
+            records.update(_read_file(file))
+    return records
+
+
+def _read_file(path):
+    """returns the records of a snapshot file, or a manifest's shards"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        if ".shard-" in os.path.basename(path):
+            raise
+        return {}
+    fmt = "json"
+    if data.startswith(MAGIC):
+        header, _, body = data.partition(b"\n")
+        fmt = header.split()[2].decode()
+        fields = dict(field.split(b"=", 1)
+                      for field in header.split()[3:] if b"=" in field)
+        if (int(fields.get(b"len", -1)) != len(body) or
+                int(fields.get(b"crc32", b"-1"), 16) != zlib.crc32(body)):
+            raise SnapshotError("{}: checksum mismatch".format(path))
+        data = body
+    try:
+        if fmt == "binary":
+            return decode_binary(data)
+        if fmt == "shards":
+            return json.loads(data)["shards"]
+        return json.loads(data)
+    except (ValueError, IndexError, KeyError, struct.error) as e:
+        raise SnapshotError("{}: {}".format(path, e))
+
+
+def _pack_str(parts, s):
+    """appends the length-prefixed UTF-8 encoding of s to parts"""
+    b = s.encode()
+    parts.append(U32.pack(len(b)))
+    parts.append(b)
+
+
+def _array(typecode, values):
+    """returns the little-endian bytes of an array of values"""
+    a = array(typecode, values)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tobytes()
+
+
+def _unarray(typecode, data):
+    """returns the list of the values of little-endian array bytes"""
+    a = array(typecode)
+    a.frombytes(data)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tolist()
+
+
+def encode_binary(records):
+    """returns the binary snapshot body of the records dictionary
+
+    The records are grouped by class and stored column by column, so that
+    each column is packed by a few calls over all its values: ids as
+    16-byte UUIDs, or as strings, then one column per attribute, see
+    _encode_column().
+    """
+    by_class = {}
+    for record in records.values():
+        by_class.setdefault(record["__class__"], []).append(record)
+    parts = [COLUMNS, U32.pack(len(by_class))]
+    for name, group in by_class.items():
+        _pack_str(parts, name)
+        parts.append(U32.pack(len(group)))
+        ids = [record["id"] for record in group]
+        if all(map(UUID.fullmatch, ids)):
+            parts.append(b"\x00")
+            parts.append(bytes.fromhex("".join(ids).replace("-", "")))
+        else:
+            parts.append(b"\x01")
+            _encode_column(parts, ids)
+        attrs = [attr for attr in dict.fromkeys(
+            attr for record in group for attr in record)
+            if attr not in ("__class__", "id")]
+        parts.append(U16.pack(len(attrs)))
+        for attr in attrs:
+            _pack_str(parts, attr)
+            values = [record.get(attr, _absent) for record in group]
+            if attr in ("created_at", "updated_at"):
+                values = [to_micros(value) if type(value) is str else value
+                          for value in values]
+            _encode_column(parts, values)
+    return b"".join(parts)
+
+
+def _encode_column(parts, values):
+    """appends the binary encoding of a column of values to parts
+
+    A column of strings is their UTF-8 text followed by their lengths,
+    one of integers or of floats an array of them, and any other column,
+    including one with missing values, the JSON list of the [row, value]
+    pairs of the values present.
+    """
+    kinds = set(map(type, values))
+    if kinds == {str}:
+        text = "".join(values).encode()
+        parts.append(bytes((STR,)) + U32.pack(len(text)))
+        parts.append(text)
+        parts.append(_array("I", map(len, values)))
+    elif kinds == {int} and -2 ** 63 <= min(values) and \
+            max(values) < 2 ** 63:
+        parts.append(bytes((INT,)))
+        parts.append(_array("q", values))
+    elif kinds == {float}:
+        parts.append(bytes((FLOAT,)))
+        parts.append(_array("d", values))
+    else:
+        parts.append(bytes((JSON,)))
+        _pack_str(parts, json.dumps([
+            [row, value] for row, value in enumerate(values)
+            if value is not _absent]))
+
+
+def _uuid_str(b):
+    """returns the canonical string of the 16 bytes of a UUID"""
+    h = b.hex()
+    return "{}-{}-{}-{}-{}".format(h[:8], h[8:12], h[12:16], h[16:20],
+                                   h[20:])
+
+
+def decode_binary(data):
+    """returns the records dictionary of a binary snapshot body"""
+    data = memoryview(data)
+    if data[:len(COLUMNS)] != COLUMNS:
+        return _decode_rows(data)
+    records = {}
+    count, = U32.unpack_from(data, len(COLUMNS))
+    pos = len(COLUMNS) + 4
+    for i in range(count):
+        name, pos = _unpack_str(data, pos)
+        nrecords, = U32.unpack_from(data, pos)
+        pos += 4
+        if data[pos] == 0:
+            h = data[pos + 1:pos + 1 + 16 * nrecords].hex()
+            pos += 1 + 16 * nrecords
+            ids = ["{}-{}-{}-{}-{}".format(h[i:i + 8], h[i + 8:i + 12],
+                                           h[i + 12:i + 16],
+                                           h[i + 16:i + 20],
+                                           h[i + 20:i + 32])
+                   for i in range(0, len(h), 32)]
+        else:
+            ids, pos = _decode_column(data, pos + 1, nrecords)
+        nattrs, = U16.unpack_from(data, pos)
+        pos += 2
+        names, columns, sparse = ["id"], [ids], []
+        for j in range(nattrs):
+            attr, pos = _unpack_str(data, pos)
+            values, pos = _decode_column(data, pos, nrecords)
+            if type(values) is list:
+                names.append(attr)
+                columns.append(values)
+            else:
+                sparse.append((attr, values))
+        names.append("__class__")
+        group = [dict(zip(names, row))
+                 for row in zip(*columns, repeat(name, nrecords))]
+        for attr, pairs in sparse:
+            for row, value in pairs:
+                group[row][attr] = value
+        records.update(zip([name + "." + id for id in ids], group))
+    if pos != len(data):
+        raise ValueError("trailing bytes after the last record")
+    return records
+
+
+def _decode_column(data, pos, n):
+    """returns the column of n values encoded at pos, see
+    _encode_column(), and the position after it
+
+    A column not every record has is returned as a tuple of its
+    [row, value] pairs.
+    """
+    kind = data[pos]
+    pos += 1
+    if kind == STR:
+        size, = U32.unpack_from(data, pos)
+        pos += 4
+        text = str(data[pos:pos + size], "utf-8")
+        pos += size
+        ends = list(accumulate(_unarray("I", data[pos:pos + 4 * n])))
+        pos += 4 * n
+        return [text[i:j] for i, j in zip([0] + ends, ends)], pos
+    elif kind == INT or kind == FLOAT:
+        return _unarray("q" if kind == INT else "d",
+                        data[pos:pos + 8 * n]), pos + 8 * n
+    elif kind == JSON:
+        pairs, pos = _unpack_str(data, pos)
+        return tuple(json.loads(pairs)), pos
+    raise ValueError("unknown column kind {}".format(kind))
+
+
+def _decode_rows(data):
+    """returns the records dictionary of a binary snapshot body written
+    record by record, the binary format before the columns"""
+    records = {}
+    count, = U32.unpack_from(data, 0)
+    pos = 4
+    for i in range(count):
+        name, pos = _unpack_str(data, pos)
+        nattrs, = U16.unpack_from(data, pos)
+        pos += 2
+        attrs = []
+        for j in range(nattrs):
+            attr, pos = _unpack_str(data, pos)
+            attrs.append(attr)
+        nrecords, = U32.unpack_from(data, pos)
+        pos += 4
+        for j in range(nrecords):
+            record, pos = _decode_record(data, pos, name, attrs)
+            records[name + "." + record["id"]] = record
+    if pos != len(data):
+        raise ValueError("trailing bytes after the last record")
+    return records
+
+
+def _unpack_str(data, pos):
+    """returns the length-prefixed string at pos and the position after"""
+    n, = U32.unpack_from(data, pos)
+    pos += 4
+    return str(data[pos:pos + n], "utf-8"), pos + n
+
+
+def _decode_record(data, pos, name, attrs):
+    """returns the record encoded at pos and the position after it"""
+    record = {}
+    if data[pos] == 0:
+        record["id"] = _uuid_str(data[pos + 1:pos + 17])
+        pos += 17
+    else:
+        record["id"], pos = _unpack_str(data, pos + 1)
+    created, updated = TIMES.unpack_from(data, pos)
+    pos += 16
+    if created != NO_TIME:
+        record["created_at"] = created
+    if updated != NO_TIME:
+        record["updated_at"] = updated
+    for attr in attrs:
+        tag = data[pos]
+        pos += 1
+        if tag == ABSENT:
+            continue
+        elif tag == NONE:
+            record[attr] = None
+        elif tag == STR:
+            record[attr], pos = _unpack_str(data, pos)
+        elif tag == INT:
+            record[attr], = I64.unpack_from(data, pos)
+            pos += 8
+        elif tag == FLOAT:
+            record[attr], = F64.unpack_from(data, pos)
+            pos += 8
+        elif tag == TRUE or tag == FALSE:
+            record[attr] = tag == TRUE
+        elif tag == JSON:
+            value, pos = _unpack_str(data, pos)
+            record[attr] = json.loads(value)
+        else:
+            raise ValueError("unknown value tag {}".format(tag))
+    record["__class__"] = name
+    return record, pos
+
+
+def convert(src, dst, fmt):
+    """rewrites the snapshot at src, in any format, to dst in format fmt"""
+    write(dst, read(src), fmt)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[3] not in formats:
+        print("usage: {} <source> <destination> json|binary".
+              format(sys.argv[0]))
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2], sys.argv[3])
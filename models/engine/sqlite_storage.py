@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage
+from os import getenv
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with an embedded SQLite database file
+
+    The file is HBNB_SQLITE_PATH, hbnb.db by default. Connections run in
+    WAL mode, so readers do not block the writer, and each commit only
+    writes the rows the session changed.
+    """
+
+    def __init__(self, path=None, replicas=None):
+        """Instantiate a SQLiteStorage object on the database file path
+
+        replicas is a list of paths of copies of it to read from, see
+        DBStorage.
+        """
+        if path is None:
+            path = getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+        if replicas is not None:
+            replicas = ['sqlite:///' + replica for replica in replicas]
+        super().__init__('sqlite:///' + path, replicas)
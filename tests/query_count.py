@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Contains the QueryCounter class and the assert_queries helper
+"""
+
+from contextlib import contextmanager
+import models
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """records the SQL statements an engine runs inside a with block"""
+
+    def __init__(self, engine=None):
+        """Instantiate a QueryCounter on engine, by default the storage's"""
+        if engine is None:
+            engine = models.storage._DBStorage__engine
+        self.engine = engine
+        self.statements = []
+        self.parameters = []
+
+    def _record(self, conn, cursor, statement, parameters, *args):
+        """records a statement about to run and its parameters"""
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+    def __enter__(self):
+        """starts recording"""
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        """stops recording"""
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self):
+        """number of statements recorded"""
+        return len(self.statements)
+
+
+@contextmanager
+def assert_queries(test, count, engine=None):
+    """makes test fail unless the with block runs count SQL statements"""
+    with QueryCounter(engine) as counter:
+        yield counter
+    test.assertEqual(counter.count, count,
+                     "{} queries instead of {}:\n{}".format(
+                         counter.count, count, "\n".join(counter.statements)))
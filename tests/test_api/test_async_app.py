@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+"""
+Contains the TestAsyncAppDocs and TestAsyncApp classes
+"""
+
+from api.v1 import async_app
+from api.v1.app import app
+import asyncio
+import importlib.util
+import inspect
+import json
+import models
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    IsolatedFileStorage
+import unittest
+
+
+class TestAsyncAppDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the async API"""
+
+    def test_pep8_conformance_async_app(self):
+        """Test that api/v1/async_app.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/async_app.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_async_app(self):
+        """Test tests/test_api/test_async_app.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_async_app.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_async_app_docstrings(self):
+        """Test for the docstrings of api/v1/async_app.py"""
+        self.assertTrue(len(async_app.__doc__ or "") >= 1)
+        for name, func in inspect.getmembers(async_app, inspect.isfunction):
+            if func.__module__ == async_app.__name__:
+                self.assertTrue(len(func.__doc__ or "") >= 1,
+                                "{} needs a docstring".format(name))
+
+
+@unittest.skipIf(models.storage_t == 'db' and (
+    models.engine_t != 'sqlite' or
+    importlib.util.find_spec("aiosqlite") is None),
+    "no asyncio driver for the database")
+class TestAsyncApp(IsolatedFileStorage):
+    """Test the endpoints of the ASGI application"""
+    def setUp(self):
+        """Starts the application"""
+        super().setUp()
+        self.runner = asyncio.Runner()
+        self.assertEqual(self.runner.run(self.start()),
+                         {"type": "lifespan.startup.complete"})
+
+    def tearDown(self):
+        """Stops the application"""
+        self.assertEqual(self.runner.run(self.lifespan("shutdown")),
+                         {"type": "lifespan.shutdown.complete"})
+        self.runner.close()
+        if models.storage_t == 'db':
+            # the asyncio engine wrote behind the counters of models.storage
+            models.storage.reconcile()
+        super().tearDown()
+
+    async def start(self):
+        """runs the lifespan of the application and starts it"""
+        self.events = asyncio.Queue()
+        self.answers = asyncio.Queue()
+        self.task = asyncio.create_task(async_app.app(
+            {"type": "lifespan"}, self.events.get, self.answers.put))
+        return await self.lifespan("startup")
+
+    async def lifespan(self, event):
+        """returns the answer of the application to a lifespan event"""
+        await self.events.put({"type": "lifespan." + event})
+        return await self.answers.get()
+
+    def call(self, method, path, body=None, query=""):
+        """returns the status, headers and JSON body answering a request"""
+        scope = {"type": "http", "method": method, "path": path,
+                 "query_string": query.encode()}
+        content = b"" if body is None else \
+            body if isinstance(body, bytes) else json.dumps(body).encode()
+        sent = []
+
+        async def receive():
+            """returns the request body"""
+            return {"type": "http.request", "body": content}
+
+        async def send(message):
+            """records the messages of the response"""
+            sent.append(message)
+
+        async def request():
+            """handles the request in a task of its own"""
+            await async_app.app(scope, receive, send)
+        self.runner.run(request())
+        self.assertEqual(sent[0]["type"], "http.response.start")
+        headers = dict(sent[0]["headers"])
+        self.assertEqual(headers[b"content-type"], b"application/json")
+        self.assertFalse(sent[-1].get("more_body", False))
+        body = b"".join(message["body"] for message in sent[1:])
+        return sent[0]["status"], headers, json.loads(body)
+
+    def test_status(self):
+        """Test /status"""
+        self.assertEqual(self.call("GET", "/api/v1/status")[::2],
+                         (200, {"status": "OK"}))
+
+    def test_state_lifecycle(self):
+        """Test creating, reading, updating and deleting a state"""
+        status, _, state = self.call("POST", "/api/v1/states",
+                                     {"name": "California"})
+        self.assertEqual(status, 201)
+        path = "/api/v1/states/" + state["id"]
+        self.assertEqual(self.call("GET", path)[2]["name"], "California")
+        status, _, updated = self.call("PUT", path, {"name": "Nevada",
+                                                     "id": "other"})
+        self.assertEqual((status, updated["id"], updated["name"]),
+                         (200, state["id"], "Nevada"))
+        ids = [s["id"] for s in self.call("GET", "/api/v1/states/")[2]]
+        self.assertIn(state["id"], ids)
+        self.assertEqual(self.call("DELETE", path)[:3:2], (200, {}))
+        self.assertEqual(self.call("GET", path)[::2],
+                         (404, {"error": "Not found"}))
+
+    def test_bad_requests(self):
+        """Test the 400, 404 and 405 answers"""
+        self.assertEqual(self.call("POST", "/api/v1/states", b"{")[::2],
+                         (400, {"error": "Not a JSON"}))
+        self.assertEqual(self.call("POST", "/api/v1/users",
+                                   {"email": "a@b.c"})[::2],
+                         (400, {"error": "Missing password"}))
+        self.assertEqual(self.call("GET", "/api/v1/cities")[0], 404)
+        self.assertEqual(self.call("GET", "/api/v1/nope/1")[0], 404)
+        self.assertEqual(self.call("POST", "/api/v1/status")[0], 405)
+        self.assertEqual(self.call("GET", "/api/v1/states",
+                                   query="limit=0")[0], 400)
+
+    def test_related(self):
+        """Test the cities of a state and the places of a city"""
+        state = self.call("POST", "/api/v1/states", {"name": "CA"})[2]
+        status, _, city = self.call(
+            "POST", "/api/v1/states/{}/cities".format(state["id"]),
+            {"name": "Fresno", "state_id": "other"})
+        self.assertEqual((status, city["state_id"]), (201, state["id"]))
+        cities = self.call("GET", "/api/v1/states/{}/cities".
+                           format(state["id"]))[2]
+        self.assertEqual([c["id"] for c in cities], [city["id"]])
+        places = "/api/v1/cities/{}/places".format(city["id"])
+        self.assertEqual(self.call("POST", places, {"name": "Home",
+                                                    "user_id": "nope"})[0],
+                         404)
+        user = self.call("POST", "/api/v1/users",
+                         {"email": "a@b.c", "password": "pwd"})[2]
+        place = self.call("POST", places, {"name": "Home",
+                                           "user_id": user["id"]})[2]
+        self.assertEqual([p["id"] for p in self.call("GET", places)[2]],
+                         [place["id"]])
+        self.assertEqual(self.call("GET", "/api/v1/states/{}/places".
+                                   format(state["id"]))[0], 404)
+
+    def test_pages(self):
+        """Test ?limit=&cursor= and the X-Next-Cursor header"""
+        ids = sorted(self.call("POST", "/api/v1/amenities",
+                               {"name": str(i)})[2]["id"] for i in range(3))
+        _, headers, page = self.call(
+            "GET", "/api/v1/amenities", query="limit=2&cursor=" + ids[0])
+        self.assertEqual([a["id"] for a in page], ids[1:])
+        self.assertNotIn(b"x-next-cursor", headers)
+        _, headers, page = self.call(
+            "GET", "/api/v1/amenities", query="limit=1&cursor=" + ids[0])
+        self.assertEqual([a["id"] for a in page], ids[1:2])
+        self.assertEqual(headers[b"x-next-cursor"], ids[1].encode())
+
+    def test_stats(self):
+        """Test that /stats counts the new objects"""
+        before = self.call("GET", "/api/v1/stats")[2]
+        self.call("POST", "/api/v1/states", {"name": "CA"})
+        after = self.call("GET", "/api/v1/stats")[2]
+        self.assertEqual(after["states"], before["states"] + 1)
+        self.assertEqual(after["users"], before["users"])
+
+    def test_streamed_list(self):
+        """Test that a whole collection is streamed in batches"""
+        ids = sorted(self.call("POST", "/api/v1/amenities",
+                               {"name": str(i)})[2]["id"] for i in range(3))
+        batch = async_app.STREAM_BATCH
+        async_app.STREAM_BATCH = 2
+        try:
+            _, headers, amenities = self.call("GET", "/api/v1/amenities")
+        finally:
+            async_app.STREAM_BATCH = batch
+        self.assertNotIn(b"content-length", headers)
+        found = [a["id"] for a in amenities]
+        self.assertEqual(found, sorted(found))
+        self.assertLessEqual(set(ids), set(found))
+
+    def test_same_answers(self):
+        """Test that the ASGI and Flask applications answer alike"""
+        state = self.call("POST", "/api/v1/states", {"name": "CA"})[2]
+        for i in range(3):
+            self.call("POST", "/api/v1/states/{}/cities".format(state["id"]),
+                      {"name": str(i)})
+        # the rows written by the asyncio engine, for models.storage
+        models.storage.reconcile()
+        cities = "/api/v1/states/{}/cities".format(state["id"])
+        first = sorted(c["id"] for c in self.call("GET", cities)[2])[0]
+        requests = [("/api/v1/stats", ""), ("/api/v1/states", ""),
+                    ("/api/v1/states/" + state["id"], ""),
+                    ("/api/v1/states/nope", ""),
+                    ("/api/v1/states", "limit=1"),
+                    ("/api/v1/states", "limit=two"),
+                    (cities, "limit=2"), (cities, "limit=2&cursor=" + first),
+                    (cities, "limit=0"), ("/api/v1/states/nope/cities", "")]
+        client = app.test_client()
+        for path, query in requests:
+            with self.subTest(path=path, query=query):
+                status, headers, body = self.call("GET", path, query=query)
+                r = client.get(path + "?" + query)
+                self.assertEqual(status, r.status_code)
+                self.assertEqual(body, r.get_json())
+                cursor = r.headers.get("X-Next-Cursor")
+                self.assertEqual(headers.get(b"x-next-cursor"),
+                                 cursor and cursor.encode())
+        r = client.get(cities)
+        self.assertEqual(sorted(c["id"] for c in self.call("GET", cities)[2]),
+                         sorted(c["id"] for c in r.get_json()))
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+from api.v1.app import app
+from api.v1.views import pagination
+import inspect
+import models
+from models.city import City
+from models.state import State
+import pep8
+from tests.query_count import QueryCounter
+from tests.test_models.test_engine.test_file_storage import \
+    IsolatedFileStorage
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the pagination"""
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/views/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pagination(self):
+        """Test tests/test_api/test_pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_docstrings(self):
+        """Test for the docstrings of api/v1/views/pagination.py"""
+        self.assertTrue(len(pagination.__doc__ or "") >= 1)
+        for name, func in inspect.getmembers(pagination, inspect.isfunction):
+            if func.__module__ == pagination.__name__:
+                self.assertTrue(len(func.__doc__ or "") >= 1,
+                                "{} needs a docstring".format(name))
+
+
+class TestPagination(IsolatedFileStorage):
+    """Test the pages of the list endpoints"""
+
+    def setUp(self):
+        """Creates a state with five cities"""
+        super().setUp()
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.cities = [City(name=str(i), state_id=self.state.id)
+                       for i in range(5)]
+        models.storage.new(self.state)
+        for city in self.cities:
+            models.storage.new(city)
+        models.storage.save()
+        self.path = "/api/v1/states/{}/cities".format(self.state.id)
+
+    def tearDown(self):
+        """Deletes the state and its cities"""
+        for obj in self.cities + [self.state]:
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+        models.storage.close()
+        super().tearDown()
+
+    def test_bad_limit(self):
+        """Test that a bad limit is a JSON 400 error"""
+        for limit in ["0", "-1", "two"]:
+            with self.subTest(limit=limit):
+                r = self.client.get(self.path + "?limit=" + limit)
+                self.assertEqual(r.status_code, 400)
+                self.assertEqual(r.get_json(),
+                                 {"error": "limit must be a positive integer"})
+
+    def test_related_pages(self):
+        """Test that the cities of a state are paged through by id"""
+        ids = sorted(city.id for city in self.cities)
+        found = []
+        query = "?limit=2"
+        while True:
+            r = self.client.get(self.path + query)
+            self.assertEqual(r.status_code, 200)
+            page = [city["id"] for city in r.get_json()]
+            self.assertLessEqual(len(page), 2)
+            found += page
+            cursor = r.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            query = "?limit=2&cursor=" + cursor
+        self.assertEqual(found, ids)
+        r = self.client.get(self.path)
+        self.assertEqual(sorted(c["id"] for c in r.get_json()), ids)
+
+    def test_related_missing_parent(self):
+        """Test that a page of the cities of no state is a 404"""
+        r = self.client.get("/api/v1/states/nope/cities?limit=2")
+        self.assertEqual(r.status_code, 404)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_related_page_query(self):
+        """Test that a page is read by a bounded query, not a join"""
+        models.storage.close()
+        with QueryCounter() as counter:
+            r = self.client.get(self.path + "?limit=2")
+        self.assertEqual(len(r.get_json()), 2)
+        self.assertIn("LIMIT", counter.statements[-1])
+        self.assertFalse([s for s in counter.statements if "JOIN" in s])
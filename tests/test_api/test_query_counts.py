@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+Contains the TestQueryCountsDocs and TestQueryCounts classes
+"""
+
+from api.v1.app import app
+import importlib
+import models
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+from tests import query_count
+from tests.query_count import assert_queries
+import unittest
+
+
+class TestQueryCountsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the query helpers"""
+
+    def test_pep8_conformance_query_count(self):
+        """Test that tests/query_count.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/query_count.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_query_counts(self):
+        """Test tests/test_api/test_query_counts.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_query_counts.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_query_count_docstrings(self):
+        """Test for the docstrings of tests/query_count.py"""
+        self.assertTrue(len(query_count.__doc__ or "") >= 1)
+        for obj in [query_count.QueryCounter, query_count.assert_queries,
+                    query_count.QueryCounter.__init__,
+                    query_count.QueryCounter.__enter__,
+                    query_count.QueryCounter.__exit__]:
+            self.assertTrue(len(obj.__doc__ or "") >= 1,
+                            "{} needs a docstring".format(obj.__name__))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestQueryCounts(unittest.TestCase):
+    """Test how many queries the endpoints run, whatever the data size"""
+
+    def setUp(self):
+        """Creates states with cities and a city with places"""
+        self.client = app.test_client()
+        self.user = User(email="a@b.c", password="pwd")
+        self.states = [State(name="State {}".format(i)) for i in range(4)]
+        self.cities = [City(name="City {}".format(i), state_id=state.id)
+                       for state in self.states for i in range(3)]
+        self.places = [Place(name="Place {}".format(i),
+                             city_id=self.cities[0].id, user_id=self.user.id)
+                       for i in range(3)]
+        models.storage.bulk_save([self.user] + self.states + self.cities +
+                                 self.places)
+        models.storage.close()
+
+    def tearDown(self):
+        """Removes the objects created by setUp"""
+        for obj in self.places + self.cities + self.states + [self.user]:
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+            models.storage.save()
+        models.storage.close()
+
+    def test_stats(self):
+        """Test that /stats reads the live counters without a query"""
+        with assert_queries(self, 0):
+            self.assertEqual(self.client.get('/api/v1/stats').status_code,
+                             200)
+
+    def test_cities_of_state(self):
+        """Test that the cities of a state are read with their state"""
+        with assert_queries(self, 1):
+            r = self.client.get('/api/v1/states/{}/cities'.
+                                format(self.states[0].id))
+        self.assertEqual(len(r.get_json()), 3)
+
+    def test_places_of_city(self):
+        """Test that the places of a city are read with their city"""
+        with assert_queries(self, 1):
+            r = self.client.get('/api/v1/cities/{}/places'.
+                                format(self.cities[0].id))
+        self.assertEqual(len(r.get_json()), 3)
+
+    def test_states_streamed(self):
+        """Test that the full list of states is streamed from one query"""
+        with assert_queries(self, 1):
+            r = self.client.get('/api/v1/states')
+            self.assertGreaterEqual(len(r.get_json()), 4)
+
+    def test_states_page(self):
+        """Test that a page of states is one query"""
+        with assert_queries(self, 1):
+            r = self.client.get('/api/v1/states?limit=2')
+        self.assertEqual(len(r.get_json()), 2)
+
+    def test_cities_by_states(self):
+        """Test that the cities of every state are read in one query"""
+        web = importlib.import_module("web_flask.8-cities_by_states")
+        with assert_queries(self, 2):
+            r = web.app.test_client().get('/cities_by_states')
+        self.assertEqual(r.status_code, 200)
+        self.assertIn(b"City 2", r.data)
+
+    def test_hbnb_filters(self):
+        """Test that the filters page does not query each state's cities"""
+        web = importlib.import_module("web_flask.10-hbnb_filters")
+        with assert_queries(self, 3):
+            r = web.app.test_client().get('/hbnb_filters')
+        self.assertEqual(r.status_code, 200)
@@ -102,5 +102,8 @@ class TestAmenity(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         amenity = Amenity()
-        string = "[Amenity] ({}) {}".format(amenity.id, amenity.__dict__)
+        attrs = dict(amenity.__dict__)
+        attrs.update(created_at=amenity.created_at,
+                     updated_at=amenity.updated_at)
+        string = "[Amenity] ({}) {}".format(amenity.id, attrs)
         self.assertEqual(string, str(amenity))
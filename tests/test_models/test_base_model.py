@@ -74,10 +74,27 @@ class TestBaseModel(unittest.TestCase):
         for attr, typ in attrs_types.items():
             with self.subTest(attr=attr, typ=typ):
                 self.assertIn(attr, inst.__dict__)
-                self.assertIs(type(inst.__dict__[attr]), typ)
+                self.assertIs(type(getattr(inst, attr)), typ)
         self.assertEqual(inst.name, "Holberton")
         self.assertEqual(inst.number, 89)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_timestamps_micros(self):
+        """Test that timestamps are kept as microseconds since the epoch"""
+        inst = BaseModel()
+        inst.updated_at = datetime(2023, 8, 23, 14, 15, 47, 852978)
+        self.assertEqual(inst.__dict__["updated_at"], 1692800147852978)
+        self.assertEqual(inst.updated_at,
+                         datetime(2023, 8, 23, 14, 15, 47, 852978))
+        self.assertEqual(inst.to_dict()["updated_at"],
+                         "2023-08-23T14:15:47.852978")
+        self.assertEqual(inst.to_record()["updated_at"], 1692800147852978)
+        for value in ("2023-08-23T14:15:47.852978", 1692800147852978):
+            with self.subTest(value=value):
+                copy = BaseModel(id=inst.id, created_at=value,
+                                 updated_at=value)
+                self.assertEqual(copy.updated_at, inst.updated_at)
+
     def test_datetime_attributes(self):
         """Test that two BaseModel instances have different datetime objects
         and that upon creation have identical updated_at and created_at
@@ -141,8 +158,11 @@ class TestBaseModel(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
-        string = "[BaseModel] ({}) {}".format(inst.id, inst.__dict__)
+        attrs = dict(inst.__dict__)
+        attrs.update(created_at=inst.created_at, updated_at=inst.updated_at)
+        string = "[BaseModel] ({}) {}".format(inst.id, attrs)
         self.assertEqual(string, str(inst))
+        self.assertIn(repr(inst.created_at), str(inst))
 
     @mock.patch('models.storage')
     def test_save(self, mock_storage):
@@ -158,3 +178,14 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    @unittest.skipIf(models.storage_t == 'db', "file storage tracks setattr")
+    @mock.patch('models.storage')
+    def test_init_not_touched(self, mock_storage):
+        """Test that building an object does not tell the storage of a
+        change, and that a later attribute write does"""
+        inst = BaseModel(id="1", created_at=1, updated_at=2, name="a")
+        BaseModel()
+        self.assertFalse(mock_storage.touch.called)
+        inst.name = "b"
+        mock_storage.touch.assert_called_once_with(inst)
@@ -110,5 +110,7 @@ class TestCity(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         city = City()
-        string = "[City] ({}) {}".format(city.id, city.__dict__)
+        attrs = dict(city.__dict__)
+        attrs.update(created_at=city.created_at, updated_at=city.updated_at)
+        string = "[City] ({}) {}".format(city.id, attrs)
         self.assertEqual(string, str(city))
@@ -0,0 +1,226 @@
+#!/usr/bin/python3
+"""
+Contains the TestAsyncDBStorageDocs and TestAsyncDBStorage classes
+"""
+
+import asyncio
+import importlib.util
+import inspect
+import models
+from models.engine import async_db_storage
+from models.city import City
+from models.state import State
+import os
+import pep8
+import sqlite3
+import tempfile
+import unittest
+AsyncDBStorage = async_db_storage.AsyncDBStorage
+
+
+class TestAsyncDBStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of AsyncDBStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.dbs_f = inspect.getmembers(AsyncDBStorage, inspect.isfunction)
+
+    def test_pep8_conformance_async_db_storage(self):
+        """Test that models/engine/async_db_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/async_db_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_async_db_storage(self):
+        """Test test_async_db_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_async_db_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_async_db_storage_module_docstring(self):
+        """Test for the async_db_storage.py module docstring"""
+        self.assertIsNot(async_db_storage.__doc__, None,
+                         "async_db_storage.py needs a docstring")
+        self.assertTrue(len(async_db_storage.__doc__) >= 1,
+                        "async_db_storage.py needs a docstring")
+
+    def test_async_db_storage_class_docstring(self):
+        """Test for the AsyncDBStorage class docstring"""
+        self.assertIsNot(AsyncDBStorage.__doc__, None,
+                         "AsyncDBStorage class needs a docstring")
+        self.assertTrue(len(AsyncDBStorage.__doc__) >= 1,
+                        "AsyncDBStorage class needs a docstring")
+
+    def test_async_dbs_func_docstrings(self):
+        """Test for the presence of docstrings in AsyncDBStorage methods"""
+        for func in self.dbs_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+@unittest.skipIf(importlib.util.find_spec("aiosqlite") is None,
+                 "aiosqlite is not installed")
+class TestAsyncDBStorage(unittest.TestCase):
+    """Test the AsyncDBStorage class on a temporary SQLite database"""
+    def setUp(self):
+        """Opens a storage on an empty database file"""
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "hbnb.db")
+        self.storage = AsyncDBStorage("sqlite+aiosqlite:///" + self.path)
+        self.runner = asyncio.Runner()
+        self.runner.run(self.storage.reload())
+
+    def tearDown(self):
+        """Closes the storage and removes the database file"""
+        self.runner.run(self.storage.close())
+        self.runner.run(self.storage.dispose())
+        self.runner.close()
+        self.dir.cleanup()
+
+    def run_task(self, coro):
+        """runs coro as a task of its own, with a session of its own"""
+        async def task():
+            """awaits coro and ends the session of the task"""
+            try:
+                return await coro
+            finally:
+                await self.storage.close()
+        return self.runner.run(task())
+
+    async def run_in(self, coro):
+        """awaits coro in a task of its own and ends its session"""
+        async def task():
+            """awaits coro and ends the session of the task"""
+            try:
+                return await coro
+            finally:
+                await self.storage.close()
+        return await asyncio.create_task(task())
+
+    def add(self, *objs):
+        """saves objs to the database"""
+        async def add():
+            """adds and commits objs"""
+            for obj in objs:
+                self.storage.new(obj)
+            await self.storage.save()
+        self.run_task(add())
+
+    def test_save_writes_rows(self):
+        """Test that save() commits the new objects to the database"""
+        state = State(name="California")
+        self.add(state)
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute("SELECT id, name FROM states").fetchall()
+        self.assertEqual(rows, [(state.id, "California")])
+
+    def test_get(self):
+        """Test that get() reads an object back, None when missing"""
+        state = State(name="California")
+        self.add(state)
+        got = self.run_task(self.storage.get(State, state.id))
+        self.assertEqual(got.name, "California")
+        self.assertIsNone(self.run_task(self.storage.get(State, "nope")))
+        self.assertIsNone(self.run_task(self.storage.get(int, state.id)))
+
+    def test_all_and_pages(self):
+        """Test all() with and without a page of objects"""
+        states = sorted([State(name=str(i)) for i in range(5)],
+                        key=lambda state: state.id)
+        self.add(*states)
+        objs = self.run_task(self.storage.all(State))
+        self.assertEqual(set(objs), {"State." + s.id for s in states})
+        page = self.run_task(self.storage.all(State, limit=2,
+                                              after=states[0].id))
+        self.assertEqual(list(page), ["State." + states[1].id,
+                                      "State." + states[2].id])
+        self.assertEqual(len(self.run_task(self.storage.all())), 5)
+
+    def test_filter(self):
+        """Test that filter() returns the objects matching the criteria"""
+        state = State(name="California")
+        other = State(name="Nevada")
+        city = City(name="Fresno", state_id=state.id)
+        self.add(state, other, city)
+        self.add(City(name="Reno", state_id=other.id))
+        objs = self.run_task(self.storage.filter(City, state_id=state.id))
+        self.assertEqual(list(objs), ["City." + city.id])
+        objs = self.run_task(self.storage.filter("State",
+                                                 name__in=["Nevada"]))
+        self.assertEqual(list(objs), ["State." + other.id])
+
+    def test_count_and_counts(self):
+        """Test count() of a class, of every class, and counts()"""
+        state = State(name="California")
+        self.add(state, City(name="Fresno", state_id=state.id))
+        self.assertEqual(self.run_task(self.storage.count(State)), 1)
+        self.assertEqual(self.run_task(self.storage.count("City")), 1)
+        self.assertEqual(self.run_task(self.storage.count()), 2)
+        counts = self.run_task(self.storage.counts())
+        self.assertEqual(counts["State"], 1)
+        self.assertEqual(counts["User"], 0)
+
+    def test_iter(self):
+        """Test that iter() yields the objects of a class by id"""
+        states = [State(name=str(i)) for i in range(3)]
+        self.add(*states, City(name="Fresno", state_id=states[0].id))
+
+        async def ids():
+            """collects the ids iter() yields"""
+            return [obj.id async for obj in self.storage.iter(State, 2)]
+        self.assertEqual(self.run_task(ids()),
+                         sorted(state.id for state in states))
+
+    def test_counters(self):
+        """Test that counts() follows the commits without a query, and
+        that reconcile() catches up with the other writers"""
+        self.add(State(name="California"))
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("INSERT INTO states (id, created_at, updated_at, "
+                         "name) VALUES ('other', '2017-01-01 00:00:00', "
+                         "'2017-01-01 00:00:00', 'Nevada')")
+        self.assertEqual(self.run_task(self.storage.count(State)), 1)
+        self.assertEqual(self.run_task(self.storage.reconcile()),
+                         {"State": -1})
+        self.assertEqual(self.run_task(self.storage.count(State)), 2)
+
+    def test_delete(self):
+        """Test that delete() and save() remove the row"""
+        state = State(name="California")
+        self.add(state)
+
+        async def delete():
+            """deletes the state"""
+            obj = await self.storage.get(State, state.id)
+            await self.storage.delete(obj)
+            await self.storage.delete(None)
+            await self.storage.save()
+        self.run_task(delete())
+        self.assertEqual(self.run_task(self.storage.count(State)), 0)
+
+    def test_session_per_task(self):
+        """Test that concurrent tasks do not share a session"""
+        async def session():
+            """returns the objects of the session of this task"""
+            self.storage.new(State(name="pending"))
+            await asyncio.sleep(0)
+            return len(await self.storage.all(State))
+
+        async def both():
+            """runs two tasks at once"""
+            return await asyncio.gather(self.run_in(session()),
+                                        self.run_in(session()))
+        self.assertEqual(self.runner.run(both()), [1, 1])
+
+    def test_reload_migrates(self):
+        """Test that reload() applies the schema migrations"""
+        with sqlite3.connect(self.path) as conn:
+            versions = conn.execute(
+                "SELECT version FROM schema_version").fetchall()
+        self.assertEqual(versions, [(1,)])
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Contains the TestAsyncFileStorageDocs and TestAsyncFileStorage classes
+"""
+
+import asyncio
+import inspect
+import models
+from models.city import City
+from models.engine import async_file_storage, snapshot
+from models.state import State
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    IsolatedFileStorage
+import threading
+import unittest
+AsyncFileStorage = async_file_storage.AsyncFileStorage
+
+
+class TestAsyncFileStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of AsyncFileStorage"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.fs_f = inspect.getmembers(AsyncFileStorage, inspect.isfunction)
+
+    def test_pep8_conformance_async_file_storage(self):
+        """Test that models/engine/async_file_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/async_file_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_async_file_storage(self):
+        """Test test_async_file_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_async_file_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_async_file_storage_module_docstring(self):
+        """Test for the async_file_storage.py module docstring"""
+        self.assertIsNot(async_file_storage.__doc__, None,
+                         "async_file_storage.py needs a docstring")
+        self.assertTrue(len(async_file_storage.__doc__) >= 1,
+                        "async_file_storage.py needs a docstring")
+
+    def test_async_file_storage_class_docstring(self):
+        """Test for the AsyncFileStorage class docstring"""
+        self.assertIsNot(AsyncFileStorage.__doc__, None,
+                         "AsyncFileStorage class needs a docstring")
+        self.assertTrue(len(AsyncFileStorage.__doc__) >= 1,
+                        "AsyncFileStorage class needs a docstring")
+
+    def test_async_fs_func_docstrings(self):
+        """Test for the presence of docstrings in AsyncFileStorage methods"""
+        for func in self.fs_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestAsyncFileStorage(IsolatedFileStorage):
+    """Test the AsyncFileStorage class over an isolated FileStorage"""
+    def setUp(self):
+        """Wraps the isolated FileStorage"""
+        super().setUp()
+        self.async_storage = AsyncFileStorage(self.storage)
+
+    def test_reads(self):
+        """Test all(), filter(), get(), count() and counts()"""
+        state = State(name="California")
+        city = City(name="Fresno", state_id=state.id)
+        self.async_storage.new(state)
+        self.async_storage.new(city)
+        s = self.async_storage
+        self.assertEqual(asyncio.run(s.all(State)),
+                         {"State." + state.id: state})
+        self.assertEqual(asyncio.run(s.filter(City, state_id=state.id)),
+                         {"City." + city.id: city})
+        self.assertIs(asyncio.run(s.get(State, state.id)), state)
+        self.assertEqual(asyncio.run(s.count(City)), 1)
+        self.assertEqual(asyncio.run(s.counts())["State"], 1)
+
+    def test_save_in_thread(self):
+        """Test that save() writes the file from another thread"""
+        state = State(name="California")
+        self.async_storage.new(state)
+        threads = []
+        save = self.storage.save
+
+        def recording_save():
+            """records the thread saving"""
+            threads.append(threading.current_thread())
+            save()
+        self.storage.save = recording_save
+        asyncio.run(self.async_storage.save())
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertIn("State." + state.id,
+                      snapshot.read(self.storage._FileStorage__file_path))
+
+    def test_delete_and_reload(self):
+        """Test that delete() and save() survive a reload()"""
+        state = State(name="California")
+        self.async_storage.new(state)
+        asyncio.run(self.async_storage.save())
+        asyncio.run(self.async_storage.delete(state))
+        asyncio.run(self.async_storage.save())
+        asyncio.run(self.async_storage.reload())
+        self.assertEqual(asyncio.run(self.async_storage.count(State)), 0)
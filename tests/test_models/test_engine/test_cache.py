@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Contains the TestObjectCacheDocs and TestObjectCache classes
+"""
+
+import inspect
+from models.engine import cache
+import pep8
+import unittest
+ObjectCache = cache.ObjectCache
+
+
+class TestObjectCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ObjectCache class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = inspect.getmembers(ObjectCache, inspect.isfunction)
+
+    def test_pep8_conformance_cache(self):
+        """Test that models/engine/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test tests/test_models/test_engine/test_cache.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_cache_class_docstring(self):
+        """Test for the ObjectCache class docstring"""
+        self.assertIsNot(ObjectCache.__doc__, None,
+                         "ObjectCache class needs a docstring")
+        self.assertTrue(len(ObjectCache.__doc__) >= 1,
+                        "ObjectCache class needs a docstring")
+
+    def test_cache_func_docstrings(self):
+        """Test for the presence of docstrings in ObjectCache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestObjectCache(unittest.TestCase):
+    """Test the ObjectCache class"""
+
+    def test_hit_and_miss(self):
+        """Test that get returns what put cached and counts hits"""
+        c = ObjectCache(4)
+        self.assertIsNone(c.get(("State", "1")))
+        c.put(("State", "1"), {"name": "Texas"})
+        self.assertEqual(c.get(("State", "1")), {"name": "Texas"})
+        self.assertEqual(c.stats(), {"size": 1, "max_size": 4,
+                                     "hits": 1, "misses": 1})
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        c = ObjectCache(2)
+        c.put("a", 1)
+        c.put("b", 2)
+        c.get("a")
+        c.put("c", 3)
+        self.assertEqual(c.get("a"), 1)
+        self.assertIsNone(c.get("b"))
+        self.assertEqual(c.get("c"), 3)
+
+    def test_ttl(self):
+        """Test that expired entries are misses"""
+        c = ObjectCache(2, ttl=0)
+        c.put("a", 1)
+        self.assertIsNone(c.get("a"))
+        self.assertEqual(c.stats()["size"], 0)
+
+    def test_invalidate(self):
+        """Test that invalidate and clear forget entries"""
+        c = ObjectCache(4)
+        c.put("a", 1)
+        c.put("b", 2)
+        c.invalidate("a")
+        c.invalidate("missing")
+        self.assertIsNone(c.get("a"))
+        self.assertEqual(c.get("b"), 2)
+        c.clear()
+        self.assertIsNone(c.get("b"))
+
+    def test_disabled(self):
+        """Test that a cache of size 0 keeps nothing"""
+        c = ObjectCache(0)
+        c.put("a", 1)
+        self.assertIsNone(c.get("a"))
+        self.assertEqual(c.stats()["size"], 0)
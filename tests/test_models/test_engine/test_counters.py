@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the TestRowCountersDocs and TestRowCounters classes
+"""
+
+import inspect
+import models
+from models.base_model import Base
+from models.engine import counters
+from models.state import State
+import pep8
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import unittest
+RowCounters = counters.RowCounters
+
+
+class TestRowCountersDocs(unittest.TestCase):
+    """Tests to check the documentation and style of RowCounters class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.counters_f = inspect.getmembers(RowCounters, inspect.isfunction)
+
+    def test_pep8_conformance_counters(self):
+        """Test that models/engine/counters.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/counters.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_counters(self):
+        """Test tests/test_models/test_engine/test_counters.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_counters.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_counters_module_docstring(self):
+        """Test for the counters.py module docstring"""
+        self.assertIsNot(counters.__doc__, None,
+                         "counters.py needs a docstring")
+        self.assertTrue(len(counters.__doc__) >= 1,
+                        "counters.py needs a docstring")
+
+    def test_counters_class_docstring(self):
+        """Test for the RowCounters class docstring"""
+        self.assertIsNot(RowCounters.__doc__, None,
+                         "RowCounters class needs a docstring")
+        self.assertTrue(len(RowCounters.__doc__) >= 1,
+                        "RowCounters class needs a docstring")
+
+    def test_counters_func_docstrings(self):
+        """Test for the presence of docstrings in RowCounters methods"""
+        for func in self.counters_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestRowCounters(unittest.TestCase):
+    """Test the RowCounters class on an in-memory database"""
+    def setUp(self):
+        """Creates the tables and counters following a session factory"""
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.counters = RowCounters({"State": State}, reconcile_every=0)
+        self.factory = sessionmaker(bind=self.engine)
+        self.counters.listen(self.factory)
+
+    def tearDown(self):
+        """Closes the database"""
+        self.engine.dispose()
+
+    def test_commit_and_rollback(self):
+        """Test that commits count and rolled back changes do not"""
+        session = self.factory()
+        session.add(State(name="California"))
+        self.assertEqual(self.counters.totals(session), {"State": 1})
+        session.commit()
+        session.add(State(name="Nevada"))
+        session.flush()
+        session.rollback()
+        self.assertEqual(self.counters.totals(session), {"State": 1})
+        session.close()
+
+    def test_reconcile(self):
+        """Test that reconcile recounts the rows and reports the drift"""
+        self.assertTrue(self.counters.due())
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO states (id, created_at, updated_at, name) "
+                "VALUES ('1', '2017-01-01', '2017-01-01', 'Texas')")
+            self.assertEqual(self.counters.reconcile(conn), {"State": -1})
+            self.assertEqual(self.counters.reconcile(conn), {})
+        self.assertFalse(self.counters.due())
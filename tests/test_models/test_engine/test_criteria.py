@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Contains the TestCriteriaDocs and TestCriteria classes
+"""
+
+from models.engine import criteria
+import pep8
+import unittest
+
+
+class TestCriteriaDocs(unittest.TestCase):
+    """Tests to check the documentation and style of criteria.py"""
+
+    def test_pep8_conformance_criteria(self):
+        """Test that models/engine/criteria.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/criteria.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_criteria(self):
+        """Test tests/test_models/test_engine/test_criteria.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_criteria.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_criteria_module_docstring(self):
+        """Test for the criteria.py module docstring"""
+        self.assertIsNot(criteria.__doc__, None,
+                         "criteria.py needs a docstring")
+        self.assertTrue(len(criteria.__doc__) >= 1,
+                        "criteria.py needs a docstring")
+
+    def test_criteria_func_docstrings(self):
+        """Test for the presence of docstrings in criteria functions"""
+        for func in [criteria.parse, criteria.matches]:
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(func.__name__))
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} needs a docstring".format(func.__name__))
+
+
+class TestCriteria(unittest.TestCase):
+    """Test the parsing and evaluation of filter criteria"""
+
+    def test_parse(self):
+        """Test that criteria are split into attribute, operator, value"""
+        parsed = criteria.parse({"name": "Ohio", "id__in": ("a", "b"),
+                                 "number_rooms__gte": 2})
+        self.assertEqual(parsed, [("name", "eq", "Ohio"),
+                                  ("id", "in", ["a", "b"]),
+                                  ("number_rooms", "gte", 2)])
+        with self.assertRaises(ValueError):
+            criteria.parse({"name__like": "O%"})
+
+    def test_matches(self):
+        """Test that values are compared with the criterion operator"""
+        self.assertTrue(criteria.matches(3, "eq", 3))
+        self.assertTrue(criteria.matches("a", "in", ["a", "b"]))
+        self.assertFalse(criteria.matches("c", "in", ["a", "b"]))
+        self.assertTrue(criteria.matches(3, "gt", 2))
+        self.assertTrue(criteria.matches(3, "gte", 3))
+        self.assertFalse(criteria.matches(3, "lt", 3))
+        self.assertTrue(criteria.matches(3, "lte", 3))
+        self.assertTrue(criteria.matches(None, "eq", None))
+        self.assertFalse(criteria.matches(None, "gt", 1))
+        self.assertFalse(criteria.matches("a", "gt", 1))
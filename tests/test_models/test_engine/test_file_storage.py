@@ -7,6 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import file_storage
+from models.engine import snapshot
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,7 +18,11 @@ from models.user import User
 import json
 import os
 import pep8
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -108,11 +113,9 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         FileStorage._FileStorage__objects = save
         for key, value in new_dict.items():
-            new_dict[key] = value.to_dict()
+            new_dict[key] = value.to_record()
         string = json.dumps(new_dict)
-        with open("file.json", "r") as f:
-            js = f.read()
-        self.assertEqual(json.loads(string), json.loads(js))
+        self.assertEqual(json.loads(string), snapshot.read("file.json"))
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_get(self):
@@ -139,3 +142,729 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
+
+
+class IsolatedFileStorage(unittest.TestCase):
+    """Runs each test against empty FileStorage state in a temporary dir"""
+    settings = {}
+
+    def setUp(self):
+        """Point FileStorage at a temporary file and journal"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = {}
+        settings = {"file_path": os.path.join(self.tmp.name, "file.json"),
+                    "journal_path": os.path.join(self.tmp.name, "journal"),
+                    "journaled": False, "journal_max": 1024 * 1024,
+                    "objects": {}, "classes": {}, "changes": {},
+                    "indexes": {}, "indexed": {}, "fingerprints": {},
+                    "journal_classes": set(), "stamp": None,
+                    "lazy": False, "unloaded": {}, "sorted": {},
+                    "durability": "sync", "flusher": None,
+                    "format": "json"}
+        settings.update(self.settings)
+        for name, value in settings.items():
+            attr = "_FileStorage__" + name
+            self.saved[attr] = getattr(FileStorage, attr)
+            setattr(FileStorage, attr, value)
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        """Restore the FileStorage class attributes"""
+        self.storage.flush()
+        for attr, value in self.saved.items():
+            setattr(FileStorage, attr, value)
+        self.tmp.cleanup()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageJournal(IsolatedFileStorage):
+    """Test the journaled mode of the FileStorage class"""
+    settings = {"journaled": True}
+
+    def test_save_appends_changes(self):
+        """Test that save appends to the journal, not the JSON file"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(os.path.exists(FileStorage._FileStorage__file_path))
+        with open(FileStorage._FileStorage__journal_path) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0]),
+                         ["p", "State." + state.id, state.to_record()])
+        self.storage.save()
+        with open(FileStorage._FileStorage__journal_path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_reload_replays_journal(self):
+        """Test that reload applies the journal on top of the JSON file"""
+        kept = State(name="Kept")
+        gone = State(name="Gone")
+        self.storage.new(kept)
+        self.storage.new(gone)
+        self.storage.compact()
+        kept.name = "Renamed"
+        self.storage.new(kept)
+        self.storage.delete(gone)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(list(self.storage.all()), ["State." + kept.id])
+        self.assertEqual(self.storage.get(State, kept.id).name, "Renamed")
+
+    def test_compaction_threshold(self):
+        """Test that a journal past the threshold is folded into the file"""
+        FileStorage._FileStorage__journal_max = 0
+        state = State(name="Nevada")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(
+            os.path.exists(FileStorage._FileStorage__journal_path))
+        self.assertIn("State." + state.id,
+                      snapshot.read(FileStorage._FileStorage__file_path))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageIndexes(IsolatedFileStorage):
+    """Test the class partitions and foreign key indexes of FileStorage"""
+
+    def test_filter(self):
+        """Test that filter supports equality, IN and range criteria"""
+        states = [State(name=name) for name in ["Arizona", "Ohio", "Utah"]]
+        places = [Place(name=str(i), number_rooms=i, city_id="c",
+                        user_id="u") for i in range(5)]
+        for obj in states + places:
+            self.storage.new(obj)
+        self.assertEqual(list(self.storage.filter(State, name="Ohio")
+                              .values()), [states[1]])
+        found = self.storage.filter(State, name__in=("Utah", "Arizona"))
+        self.assertEqual(set(found.values()), {states[0], states[2]})
+        found = self.storage.filter(Place, number_rooms__gte=1,
+                                    number_rooms__lt=3)
+        self.assertEqual(sorted(p.name for p in found.values()), ["1", "2"])
+        found = self.storage.filter(Place, number_rooms__gt=3, city_id="c")
+        self.assertEqual([p.name for p in found.values()], ["4"])
+        found = self.storage.filter("State", id__in=[states[2].id, "nope"])
+        self.assertEqual(list(found.values()), [states[2]])
+        self.assertEqual(self.storage.filter(State, name__gt=None), {})
+        self.assertEqual(self.storage.filter(State, name__gt=3), {})
+        with self.assertRaises(ValueError):
+            self.storage.filter(State, name__like="O%")
+
+    def test_filter_limit(self):
+        """Test that filter with limit returns the first matches by id"""
+        state = State(name="California")
+        cities = [City(name=str(i), state_id=state.id) for i in range(5)]
+        for obj in [state, City(name="other", state_id="x")] + cities:
+            self.storage.new(obj)
+        ids = sorted(city.id for city in cities)
+        found = self.storage.filter(City, limit=2, state_id=state.id)
+        self.assertEqual([c.id for c in found.values()], ids[:2])
+        found = self.storage.filter(City, limit=2, state_id=state.id,
+                                    id__gt=ids[2])
+        self.assertEqual([c.id for c in found.values()], ids[3:])
+        found = self.storage.filter(City, limit=3, name__in=["1", "3"])
+        self.assertEqual(sorted(c.name for c in found.values()), ["1", "3"])
+
+    def test_filter_uses_indexes(self):
+        """Test that foreign key criteria only check the indexed objects"""
+        state = State(name="California")
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        others = [City(name="other", state_id="x") for i in range(3)]
+        for obj in [state] + cities + others:
+            self.storage.new(obj)
+        checked = []
+        value = self.storage._value
+
+        def counting(*args):
+            """counts the objects checked"""
+            checked.append(args[1])
+            return value(*args)
+        self.storage._value = counting
+        found = self.storage.filter(City, state_id=state.id, name__lte="1")
+        self.assertEqual(sorted(c.name for c in found.values()), ["0", "1"])
+        self.assertEqual(len(checked), 6)
+        cities[0].state_id = "moved"
+        found = self.storage.filter(City, state_id__in=[state.id])
+        self.assertEqual(list(found.values()), cities[1:])
+
+    def test_all_pages(self):
+        """Test that all with limit and after pages through ids in order"""
+        states = [State(name=str(i)) for i in range(5)]
+        for state in states:
+            self.storage.new(state)
+        ids = sorted(state.id for state in states)
+        page = self.storage.all(State, limit=2)
+        self.assertEqual([obj.id for obj in page.values()], ids[:2])
+        page = self.storage.all(State, limit=2, after=ids[1])
+        self.assertEqual([obj.id for obj in page.values()], ids[2:4])
+        page = self.storage.all(State, after=ids[3])
+        self.assertEqual([obj.id for obj in page.values()], ids[4:])
+        self.assertEqual(self.storage.all(State, limit=2, after=ids[4]), {})
+        extra = State(name="extra")
+        self.storage.new(extra)
+        self.storage.delete(states[0])
+        page = self.storage.all(State, limit=10)
+        self.assertEqual(list(page.values()),
+                         sorted(states[1:] + [extra], key=lambda o: o.id))
+
+    def test_iter(self):
+        """Test that iter yields the objects by id without copying them"""
+        states = [State(name=str(i)) for i in range(4)]
+        for state in states:
+            self.storage.new(state)
+        city = City(name="Napa", state_id=states[0].id)
+        self.storage.new(city)
+        ordered = sorted(states, key=lambda obj: obj.id)
+        self.assertEqual(list(self.storage.iter(State)), ordered)
+        self.assertEqual(list(self.storage.iter("City")), [city])
+        self.assertEqual(list(self.storage.iter()), [city] + ordered)
+        found = []
+        late = State(name="late")
+        for obj in self.storage.iter(State):
+            found.append(obj)
+            if len(found) == 1:
+                self.storage.delete(ordered[1])
+                self.storage.new(late)
+        expected = sorted(ordered[:1] + ordered[2:] + [late],
+                          key=lambda obj: obj.id)
+        if late.id < ordered[0].id:
+            expected.remove(late)
+        self.assertEqual(found, expected)
+
+    def test_sorted_keys_kept_sorted(self):
+        """Test that adding or deleting an object updates the sorted keys
+        of its class in place instead of sorting them again"""
+        states = [State(name=str(i)) for i in range(4)]
+        for state in states[:3]:
+            self.storage.new(state)
+        keys = self.storage._sorted_keys("State")
+        self.storage.new(states[3])
+        self.storage.delete(states[0])
+        self.assertIs(self.storage._sorted_keys("State"), keys)
+        self.assertEqual(keys, sorted("State." + state.id
+                                      for state in states[1:]))
+
+    def test_all_pages_every_class(self):
+        """Test that all without cls pages through keys across classes"""
+        state = State(name="California")
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for obj in [state] + cities:
+            self.storage.new(obj)
+        keys = sorted(["City." + city.id for city in cities])
+        page = self.storage.all(limit=2)
+        self.assertEqual(list(page), keys[:2])
+        page = self.storage.all(limit=2, after=keys[1])
+        self.assertEqual(list(page), [keys[2], "State." + state.id])
+
+    def test_bulk_save(self):
+        """Test that bulk_save adds objects and dicts with a single write"""
+        state = State(name="California")
+        rows = [state, {"__class__": "City", "name": "Napa",
+                        "state_id": state.id}]
+        rows += [{"name": "Fresno", "state_id": state.id}]
+        stats = self.storage.bulk_save(rows[:2])
+        stats2 = self.storage.bulk_save(rows[2:], City, batch_size=1)
+        self.assertEqual(stats["rows"], 2)
+        self.assertEqual(stats2["rows"], 1)
+        self.assertGreater(stats["rows_per_sec"], 0)
+        self.assertEqual(self.storage.flush_stats()["flushes"], 2)
+        self.assertEqual(self.storage.get(State, state.id), state)
+        records = snapshot.read(FileStorage._FileStorage__file_path)
+        self.assertEqual(len(records), 3)
+        names = sorted(c.name for c in self.storage.all(City).values())
+        self.assertEqual(names, ["Fresno", "Napa"])
+        self.assertEqual(len(self.storage.filter(City, state_id=state.id)),
+                         2)
+
+    def test_counts(self):
+        """Test that counts returns the size of every class partition"""
+        state = State(name="California")
+        for obj in [state, City(name="Napa", state_id=state.id),
+                    City(name="Reno", state_id=state.id)]:
+            self.storage.new(obj)
+        counts = self.storage.counts()
+        self.assertEqual(counts["State"], 1)
+        self.assertEqual(counts["City"], 2)
+        self.assertEqual(counts["User"], 0)
+        self.assertEqual(sum(counts.values()), self.storage.count())
+        self.assertEqual(self.storage.count(City), 2)
+
+    def test_reconcile(self):
+        """Test that reconcile repairs and reports a drifting partition"""
+        states = [State(name="California"), State(name="Nevada")]
+        for state in states:
+            self.storage.new(state)
+        self.assertEqual(self.storage.reconcile(), {})
+        partitions = FileStorage._FileStorage__classes
+        partitions["State"].pop("State." + states[0].id)
+        partitions["User"] = {"User.gone": None}
+        self.assertEqual(self.storage.count(State), 1)
+        self.assertEqual(self.storage.reconcile(), {"State": -1, "User": 1})
+        self.assertEqual(self.storage.counts()["State"], 2)
+        self.assertEqual(self.storage.count(), 2)
+        self.assertEqual(len(self.storage.all(State)), 2)
+        self.assertEqual(self.storage.reconcile(), {})
+
+    def test_filter_indexed(self):
+        """Test that filter on a foreign key returns the children"""
+        state = State(name="California")
+        other = State(name="Nevada")
+        cities = [City(name="Fremont", state_id=state.id),
+                  City(name="Napa", state_id=state.id),
+                  City(name="Reno", state_id=other.id)]
+        for obj in [state, other] + cities:
+            self.storage.new(obj)
+        found = self.storage.filter(City, state_id=state.id)
+        self.assertEqual(list(found.values()), cities[:2])
+        self.assertIn(state.id, FileStorage._FileStorage__indexes[
+            "City.state_id"])
+        self.assertEqual(self.storage.filter(City, state_id="nope"), {})
+
+    def test_filter_after_delete_and_update(self):
+        """Test that deleted or re-parented children are not returned"""
+        state = State(name="California")
+        other = State(name="Nevada")
+        moved = City(name="Tahoe", state_id=state.id)
+        gone = City(name="Gone", state_id=state.id)
+        for obj in [state, other, moved, gone]:
+            self.storage.new(obj)
+        self.storage.delete(gone)
+        moved.state_id = other.id
+        self.assertEqual(self.storage.filter(City, state_id=state.id), {})
+        self.storage.new(moved)
+        found = self.storage.filter(City, state_id=other.id)
+        self.assertEqual(list(found.values()), [moved])
+
+    def test_index_follows_writes(self):
+        """Test that writing a foreign key moves the object between
+        parents at once, and that delete leaves no stale entry"""
+        state = State(name="California")
+        other = State(name="Nevada")
+        city = City(name="Tahoe", state_id=state.id)
+        for obj in [state, other, city]:
+            self.storage.new(obj)
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        self.storage.delete(city)
+        self.assertEqual(other.cities, [])
+        index = FileStorage._FileStorage__indexes["City.state_id"]
+        self.assertNotIn(state.id, index)
+        self.assertNotIn(other.id, index)
+
+    def test_filter_unindexed(self):
+        """Test that filter on an attribute without index scans the class"""
+        state = State(name="California")
+        self.storage.new(state)
+        found = self.storage.filter(State, name="California")
+        self.assertEqual(list(found.values()), [state])
+
+    def test_all_and_count_by_class(self):
+        """Test that all(cls) and count(cls) read the class partition"""
+        states = [State(name="California"), State(name="Nevada")]
+        city = City(name="Reno", state_id=states[1].id)
+        for obj in states + [city]:
+            self.storage.new(obj)
+        self.assertEqual(list(self.storage.all(State).values()), states)
+        self.assertEqual(list(self.storage.all("City").values()), [city])
+        self.assertEqual(self.storage.all(Amenity), {})
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertEqual(self.storage.count("City"), 1)
+        self.assertEqual(self.storage.count(), 3)
+        self.storage.delete(states[0])
+        self.assertEqual(self.storage.count(State), 1)
+        self.assertEqual(self.storage.get(State, states[1].id), states[1])
+
+    def test_relationship_properties(self):
+        """Test State.cities, City.places and Place.reviews"""
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        place = Place(name="Loft", city_id=city.id)
+        review = Review(text="Nice", place_id=place.id)
+        for obj in [state, city, place, review]:
+            self.storage.new(obj)
+        self.assertEqual(state.cities, [city])
+        self.assertEqual(city.places, [place])
+        self.assertEqual(place.reviews, [review])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageClose(IsolatedFileStorage):
+    """Test that close only reloads what another process changed"""
+    def test_close_unchanged_file(self):
+        """Test that close keeps the objects when the file did not move"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Unsaved"
+        self.storage.close()
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertEqual(state.name, "Unsaved")
+
+    def test_close_incremental_reload(self):
+        """Test that close re-instantiates only the changed records"""
+        kept = State(name="Kept")
+        changed = State(name="Changed")
+        gone = State(name="Gone")
+        for obj in [kept, changed, gone]:
+            self.storage.new(obj)
+        self.storage.save()
+        path = FileStorage._FileStorage__file_path
+        records = snapshot.read(path)
+        records["State." + changed.id]["name"] = "Changed elsewhere"
+        del records["State." + gone.id]
+        with open(path, "w") as f:
+            json.dump(records, f)
+        self.storage.close()
+        self.assertIs(self.storage.get(State, kept.id), kept)
+        reloaded = self.storage.get(State, changed.id)
+        self.assertIsNot(reloaded, changed)
+        self.assertEqual(reloaded.name, "Changed elsewhere")
+        self.assertIsNone(self.storage.get(State, gone.id))
+        self.assertEqual(self.storage.count(State), 2)
+
+    def test_reload_keeps_unsaved_objects(self):
+        """Test that objects never saved survive a reload"""
+        self.storage.save()
+        state = State(name="Draft")
+        self.storage.new(state)
+        self.storage.reload()
+        self.assertIs(self.storage.get(State, state.id), state)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageLazy(IsolatedFileStorage):
+    """Test the lazy reload mode of the FileStorage class"""
+    settings = {"lazy": True}
+
+    def setUp(self):
+        """Save two states and a city, then reload them lazily"""
+        super().setUp()
+        self.states = [State(name="California"), State(name="Nevada")]
+        self.city = City(name="Fremont", state_id=self.states[0].id)
+        for obj in self.states + [self.city]:
+            self.storage.new(obj)
+        self.storage.save()
+        for name in ["objects", "classes", "indexes", "fingerprints"]:
+            setattr(FileStorage, "_FileStorage__" + name, {})
+        self.storage.reload()
+
+    def test_reload_instantiates_nothing(self):
+        """Test that reload keeps the records raw but counts them"""
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(self.storage.count(), 3)
+        self.assertEqual(self.storage.count(State), 2)
+
+    def test_get_instantiates_one(self):
+        """Test that get builds only the object asked for"""
+        state = self.storage.get(State, self.states[1].id)
+        self.assertEqual(state.name, "Nevada")
+        self.assertIs(self.storage.get(State, self.states[1].id), state)
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["State." + state.id])
+
+    def test_relationship_instantiates_children(self):
+        """Test that a relationship builds the children it returns"""
+        state = self.storage.get(State, self.states[0].id)
+        self.assertEqual([city.name for city in state.cities], ["Fremont"])
+        self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+
+    def test_filter_instantiates_matches(self):
+        """Test that filter checks raw records and builds the matches"""
+        found = self.storage.filter(State, name__in=["Nevada", "Texas"])
+        self.assertEqual([s.id for s in found.values()],
+                         [self.states[1].id])
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["State." + self.states[1].id])
+        later = self.storage.filter(State, created_at__gte=self.states[1].
+                                    created_at)
+        self.assertIn("State." + self.states[1].id, later)
+
+    def test_all_instantiates_class(self):
+        """Test that all(cls) builds its class and all() everything"""
+        names = [s.name for s in self.storage.all(State).values()]
+        self.assertEqual(sorted(names), ["California", "Nevada"])
+        self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+        self.assertEqual(len(self.storage.all()), 3)
+
+    def test_save_keeps_unloaded_records(self):
+        """Test that records never instantiated are saved back as read"""
+        self.storage.get(State, self.states[0].id).name = "Renamed"
+        self.storage.save()
+        records = snapshot.read(FileStorage._FileStorage__file_path)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records["State." + self.states[0].id]["name"],
+                         "Renamed")
+        self.assertEqual(records["City." + self.city.id],
+                         self.city.to_record())
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageBatched(IsolatedFileStorage):
+    """Test the batched durability of the FileStorage class"""
+    settings = {"durability": "batched", "flush_ms": 60000}
+
+    def test_saves_are_merged(self):
+        """Test that saves wait for flush and are written once"""
+        path = FileStorage._FileStorage__file_path
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.save()
+        self.assertFalse(os.path.exists(path))
+        self.storage.flush()
+        self.assertIn("State." + state.id, snapshot.read(path))
+        stats = self.storage.flush_stats()
+        self.assertEqual(stats["saves"], 2)
+        self.assertEqual(stats["flushes"], 1)
+        self.assertEqual(stats["merged"], 1)
+
+    def test_pending_delete_survives_reload(self):
+        """Test that a delete not flushed yet is kept when another process
+        rewrote the file before close()"""
+        path = FileStorage._FileStorage__file_path
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.flush()
+        self.storage.delete(state)
+        self.storage.save()
+        code = ("from models.engine import snapshot\n"
+                "records = snapshot.read({!r})\n"
+                "records['State.other'] = {{'id': 'other', "
+                "'__class__': 'State', 'name': 'Nevada'}}\n"
+                "snapshot.write({!r}, records)\n").format(path, path)
+        subprocess.run([sys.executable, "-c", code], check=True,
+                       cwd=os.path.dirname(os.path.dirname(
+                           os.path.abspath(models.__file__))))
+        self.storage.close()
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.assertIsNotNone(self.storage.get(State, "other"))
+        self.storage.flush()
+        self.assertNotIn("State." + state.id, snapshot.read(path))
+        self.assertIn("State.other", snapshot.read(path))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageSnapshot(IsolatedFileStorage):
+    """Test that FileStorage snapshots are checked on reload"""
+    def test_corrupted_snapshot(self):
+        """Test that reload refuses a snapshot whose checksum is wrong"""
+        self.storage.new(State(name="California"))
+        self.storage.save()
+        path = FileStorage._FileStorage__file_path
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:-10])
+        with self.assertRaises(snapshot.SnapshotError):
+            self.storage.reload()
+
+    def test_binary_format(self):
+        """Test that a binary snapshot reloads the same objects"""
+        FileStorage._FileStorage__format = "binary"
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__fingerprints = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).to_dict(),
+                         state.to_dict())
+        self.assertEqual(self.storage.get(City, city.id).to_dict(),
+                         city.to_dict())
+
+    def test_missing_snapshot(self):
+        """Test that reload starts empty when there is no file yet"""
+        self.storage.reload()
+        self.assertEqual(self.storage.all(), {})
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageDirty(IsolatedFileStorage):
+    """Test that saves write only the objects changed since the last one"""
+    def test_setattr_marks_dirty(self):
+        """Test that an attribute write makes a stored object pending"""
+        state = State(name="California")
+        self.assertEqual(self.storage.pending()["new"], [])
+        self.storage.new(state)
+        key = "State." + state.id
+        self.assertEqual(self.storage.pending(),
+                         {"new": [key], "dirty": [], "deleted": []})
+        self.storage.save()
+        self.assertEqual(self.storage.pending(),
+                         {"new": [], "dirty": [], "deleted": []})
+        attrs = set(state.__dict__)
+        state.name = "Nevada"
+        self.assertEqual(set(state.__dict__), attrs)
+        self.assertEqual(self.storage.pending()["dirty"], [key])
+        self.storage.save()
+        records = snapshot.read(FileStorage._FileStorage__file_path)
+        self.assertEqual(records[key]["name"], "Nevada")
+        self.storage.delete(state)
+        self.assertEqual(self.storage.pending()["deleted"], [key])
+
+    def test_unstored_object_not_pending(self):
+        """Test that writes to objects not in storage are ignored"""
+        state = State(name="California")
+        state.name = "Nevada"
+        self.assertEqual(self.storage.pending()["dirty"], [])
+        self.assertEqual(FileStorage._FileStorage__changes, {})
+
+    def test_save_fingerprints_nothing(self):
+        """Test that save leaves the fingerprints to reload"""
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            self.storage.new(state)
+        with mock.patch.object(FileStorage, "_fingerprint") as fingerprint:
+            self.storage.save()
+            states[1].name = "changed"
+            self.storage.save()
+        fingerprint.assert_not_called()
+        self.assertEqual(FileStorage._FileStorage__fingerprints,
+                         dict.fromkeys("State." + s.id for s in states))
+        records = snapshot.read(FileStorage._FileStorage__file_path)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records["State." + states[1].id]["name"],
+                         "changed")
+
+    def test_reload_fingerprints_known_keys(self):
+        """Test that reload fingerprints only the records of keys in
+        storage, and keeps them"""
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__fingerprints = {}
+        fingerprint = mock.Mock(wraps=FileStorage._fingerprint)
+        with mock.patch.object(FileStorage, "_fingerprint", fingerprint):
+            self.storage.reload()
+            self.assertEqual(fingerprint.call_count, 0)
+            reloaded = self.storage.get(State, states[0].id)
+            self.storage.reload()
+            self.assertEqual(fingerprint.call_count, 6)
+            self.storage.reload()
+            self.assertEqual(fingerprint.call_count, 9)
+        self.assertIs(self.storage.get(State, states[0].id), reloaded)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageDirtyShards(IsolatedFileStorage):
+    """Test that a sharded save rewrites the shards of changed classes"""
+    settings = {"sharded": True, "shard_min": 1}
+
+    def shards(self):
+        """returns the names of the shard files"""
+        return {f for f in os.listdir(self.tmp.name) if ".shard-" in f}
+
+    def test_changed_class_resharded(self):
+        """Test that only the shards of the changed class are replaced"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.new(City(name="Fresno", state_id=state.id))
+        self.storage.save()
+        old = self.shards()
+        state.name = "Nevada"
+        self.storage.save()
+        new = self.shards()
+        self.assertEqual({f for f in new if "-City-" in f},
+                         {f for f in old if "-City-" in f})
+        self.assertNotEqual({f for f in new if "-State-" in f},
+                            {f for f in old if "-State-" in f})
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__fingerprints = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).name, "Nevada")
+        self.assertEqual(self.storage.count(City), 1)
+
+    def forget(self):
+        """drops the objects in memory and reads the files again"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__sorted = {}
+        FileStorage._FileStorage__fingerprints = {}
+        FileStorage._FileStorage__journal_classes = set()
+        self.storage.reload()
+
+    def test_unchanged_class_not_built(self):
+        """Test that a sharded save builds the records of the changed
+        classes only"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.new(City(name="Fresno", state_id=state.id))
+        self.storage.save()
+        state.name = "Nevada"
+        with mock.patch.object(City, "to_record") as to_record:
+            self.storage.save()
+        to_record.assert_not_called()
+        self.forget()
+        self.assertEqual(self.storage.get(State, state.id).name, "Nevada")
+        self.assertEqual(self.storage.count(City), 1)
+
+    def test_failed_write_keeps_changes(self):
+        """Test that the changes of a failed snapshot are written by the
+        next one"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.new(City(name="Fresno", state_id=state.id))
+        self.storage.save()
+        state.name = "Nevada"
+        with mock.patch.object(snapshot, "_write_file", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.storage.save()
+        self.forget()
+        self.assertEqual(self.storage.get(State, state.id).name, "Nevada")
+
+    def test_failed_append_keeps_changes(self):
+        """Test that the changes of a failed journal append are written by
+        the next one"""
+        FileStorage._FileStorage__journaled = True
+        state = State(name="California")
+        self.storage.new(state)
+        with mock.patch.object(file_storage.Journal, "append",
+                               side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.storage.save()
+        self.forget()
+        self.assertEqual(self.storage.get(State, state.id).name,
+                         "California")
+
+    def test_journaled_compact(self):
+        """Test that compacting writes the classes of the journal"""
+        FileStorage._FileStorage__journaled = True
+        a = State(name="California")
+        self.storage.new(a)
+        self.storage.save()
+        self.storage.compact()
+        b = City(name="Fresno", state_id=a.id)
+        self.storage.new(b)
+        self.storage.save()
+        self.storage.compact()
+        self.forget()
+        self.assertEqual(self.storage.get(State, a.id).name, "California")
+        self.assertEqual(self.storage.get(City, b.id).name, "Fresno")
+
+    def test_compact_after_replay(self):
+        """Test that compacting writes the classes replayed from the
+        journal by reload"""
+        FileStorage._FileStorage__journaled = True
+        a = State(name="California")
+        self.storage.new(a)
+        self.storage.save()
+        self.storage.compact()
+        b = State(name="Nevada")
+        self.storage.new(b)
+        self.storage.save()
+        self.forget()
+        self.storage.compact()
+        self.forget()
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertEqual(self.storage.get(State, b.id).name, "Nevada")
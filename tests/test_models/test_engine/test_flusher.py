@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""
+Contains the TestFlusherDocs and TestFlusher classes
+"""
+
+import inspect
+from models.engine import flusher
+import pep8
+import threading
+import unittest
+Flusher = flusher.Flusher
+
+
+class TestFlusherDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Flusher class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.flusher_f = inspect.getmembers(Flusher, inspect.isfunction)
+
+    def test_pep8_conformance_flusher(self):
+        """Test that models/engine/flusher.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/flusher.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_flusher(self):
+        """Test tests/test_models/test_engine/test_flusher.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_flusher.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_flusher_module_docstring(self):
+        """Test for the flusher.py module docstring"""
+        self.assertIsNot(flusher.__doc__, None,
+                         "flusher.py needs a docstring")
+        self.assertTrue(len(flusher.__doc__) >= 1,
+                        "flusher.py needs a docstring")
+
+    def test_flusher_class_docstring(self):
+        """Test for the Flusher class docstring"""
+        self.assertIsNot(Flusher.__doc__, None,
+                         "Flusher class needs a docstring")
+        self.assertTrue(len(Flusher.__doc__) >= 1,
+                        "Flusher class needs a docstring")
+
+    def test_flusher_func_docstrings(self):
+        """Test for the presence of docstrings in Flusher methods"""
+        for func in self.flusher_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestFlusher(unittest.TestCase):
+    """Test the Flusher class"""
+    def setUp(self):
+        """Count the calls to the flush function"""
+        self.calls = 0
+        self.flushed = threading.Event()
+
+    def flush(self):
+        """flush function recording its calls"""
+        self.calls += 1
+        self.flushed.set()
+
+    def test_unknown_durability(self):
+        """Test that an unknown durability is refused"""
+        with self.assertRaises(ValueError):
+            Flusher(self.flush, "never")
+
+    def test_sync(self):
+        """Test that sync flushes on every request"""
+        f = Flusher(self.flush)
+        f.request()
+        f.request()
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(f.stats()["merged"], 0)
+
+    def test_batched_merges_requests(self):
+        """Test that requests within the delay make a single flush"""
+        f = Flusher(self.flush, "batched", 200)
+        for i in range(5):
+            f.request()
+        self.assertEqual(self.calls, 0)
+        self.assertTrue(self.flushed.wait(5))
+        f.stop()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(f.stats(), {"durability": "batched", "saves": 5,
+                                     "flushes": 1, "merged": 4,
+                                     "errors": 0, "last_error": None})
+
+    def test_async_flushes_in_background(self):
+        """Test that async flushes without waiting for a delay"""
+        f = Flusher(self.flush, "async")
+        f.request()
+        self.assertTrue(self.flushed.wait(5))
+        f.stop()
+        self.assertEqual(self.calls, 1)
+
+    def test_stop_flushes_pending(self):
+        """Test that stop writes what is still pending"""
+        f = Flusher(self.flush, "batched", 60000)
+        f.request()
+        f.request()
+        f.stop()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(f.stats()["merged"], 1)
+
+    def test_failed_flush_raised(self):
+        """Test that a failed background flush is logged, reported and
+        raised by stop()"""
+        def fail():
+            """flush function that fails"""
+            self.flushed.set()
+            raise OSError("disk full")
+        f = Flusher(fail, "async")
+        with self.assertLogs("models.engine.flusher", "ERROR"):
+            f.request()
+            self.assertTrue(self.flushed.wait(5))
+            with self.assertRaises(OSError):
+                f.stop()
+        stats = f.stats()
+        self.assertEqual((stats["flushes"], stats["errors"]), (0, 1))
+        self.assertEqual(stats["last_error"], "OSError('disk full')")
+        f.stop()
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""
+Contains the TestJournalDocs and TestJournal classes
+"""
+
+import inspect
+from models.engine import journal
+import os
+import pep8
+import tempfile
+import unittest
+Journal = journal.Journal
+JournalError = journal.JournalError
+
+
+class TestJournalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Journal class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.journal_f = inspect.getmembers(Journal, inspect.isfunction)
+
+    def test_pep8_conformance_journal(self):
+        """Test that models/engine/journal.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_journal(self):
+        """Test tests/test_models/test_engine/test_journal.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_journal_module_docstring(self):
+        """Test for the journal.py module docstring"""
+        self.assertIsNot(journal.__doc__, None,
+                         "journal.py needs a docstring")
+        self.assertTrue(len(journal.__doc__) >= 1,
+                        "journal.py needs a docstring")
+
+    def test_journal_class_docstring(self):
+        """Test for the Journal class docstring"""
+        self.assertIsNot(Journal.__doc__, None,
+                         "Journal class needs a docstring")
+        self.assertTrue(len(Journal.__doc__) >= 1,
+                        "Journal class needs a docstring")
+
+    def test_journal_func_docstrings(self):
+        """Test for the presence of docstrings in Journal methods"""
+        for func in self.journal_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestJournal(unittest.TestCase):
+    """Test the Journal class"""
+    def setUp(self):
+        """Create a journal in a temporary directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = Journal(os.path.join(self.tmp.name, "journal"))
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp.cleanup()
+
+    def test_replay_missing_file(self):
+        """Test that a journal that was never written replays nothing"""
+        self.assertEqual(list(self.journal.replay()), [])
+        self.assertEqual(self.journal.size(), 0)
+
+    def test_append_and_replay(self):
+        """Test that puts and deletes replay in the order they were made"""
+        self.journal.append([("State.1", {"id": "1", "name": "CA"})])
+        self.journal.append([("State.2", {"id": "2"}), ("State.1", None)])
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"id": "1", "name": "CA"}),
+                          ("State.2", {"id": "2"}),
+                          ("State.1", None)])
+        self.assertGreater(self.journal.size(), 0)
+
+    def test_torn_last_line(self):
+        """Test that a partially written last record is ignored"""
+        self.journal.append([("State.1", {"id": "1"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('["p", "State.2", {"id"')
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"id": "1"})])
+
+    def test_append_after_torn_line(self):
+        """Test that the records appended after a crash are replayed"""
+        self.journal.append([("State.1", {"id": "1"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('["p", "State.2", {"id"')
+        self.journal.append([("State.3", {"id": "3"})])
+        self.journal.append([("State.1", None)], fsync=True)
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"id": "1"}),
+                          ("State.3", {"id": "3"}),
+                          ("State.1", None)])
+
+    def test_torn_only_line(self):
+        """Test that a journal holding only a torn line is emptied"""
+        with open(self.journal.path, 'a') as f:
+            f.write('["p", "State.2"')
+        self.journal.append([("State.1", None)])
+        self.assertEqual(list(self.journal.replay()), [("State.1", None)])
+
+    def test_bad_middle_line(self):
+        """Test that a corrupted record before others raises"""
+        self.journal.append([("State.1", {"id": "1"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('garbage\n')
+        self.journal.append([("State.2", {"id": "2"})])
+        with self.assertRaises(JournalError):
+            list(self.journal.replay())
+
+    def test_truncate(self):
+        """Test that truncate empties the journal"""
+        self.journal.append([("State.1", None)])
+        self.journal.truncate()
+        self.assertEqual(list(self.journal.replay()), [])
+        self.journal.truncate()
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the TestMigrationsDocs and TestMigrations classes
+"""
+
+import models
+from models.engine import migrations
+import os
+import pep8
+from sqlalchemy import create_engine, inspect
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestMigrationsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of migrations.py"""
+
+    def test_pep8_conformance_migrations(self):
+        """Test that models/engine/migrations.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/migrations.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_migrations(self):
+        """Test tests/test_models/test_engine/test_migrations.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_migrations.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_migrations_module_docstring(self):
+        """Test for the migrations.py module docstring"""
+        self.assertIsNot(migrations.__doc__, None,
+                         "migrations.py needs a docstring")
+        self.assertTrue(len(migrations.__doc__) >= 1,
+                        "migrations.py needs a docstring")
+
+    def test_migrations_func_docstrings(self):
+        """Test for the presence of docstrings in migrations functions"""
+        for func in [migrations.migrate, migrations.version, migrations.lock,
+                     migrations.upgrade, migrations.current_version] + \
+                migrations.migrations:
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(func.__name__))
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} needs a docstring".format(func.__name__))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestMigrations(unittest.TestCase):
+    """Test the migrations on a temporary SQLite database"""
+
+    def setUp(self):
+        """Creates the tables of a database predating the indexes"""
+        self.dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.dir.name, "hbnb.db")
+        self.engine = create_engine("sqlite:///" + path)
+        models.base_model.Base.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            for index in self.indexes():
+                conn.exec_driver_sql("DROP INDEX " + index)
+
+    def tearDown(self):
+        """Removes the database"""
+        self.engine.dispose()
+        self.dir.cleanup()
+
+    def indexes(self):
+        """returns the names of the lookup indexes of the database"""
+        inspector = inspect(self.engine)
+        return sorted(index["name"]
+                      for table in ["cities", "places", "reviews", "users"]
+                      for index in inspector.get_indexes(table))
+
+    def test_migrate(self):
+        """Test that migrate adds the indexes once and records it"""
+        self.assertEqual(self.indexes(), [])
+        self.assertEqual(migrations.version(self.engine), 0)
+        self.assertEqual(migrations.migrate(self.engine), 1)
+        self.assertEqual(self.indexes(), [
+            "ix_cities_state_id", "ix_places_city_id", "ix_places_user_id",
+            "ix_reviews_place_id", "ix_reviews_user_id", "ix_users_email"])
+        self.assertEqual(migrations.version(self.engine), 1)
+        self.assertEqual(migrations.migrate(self.engine), 1)
+        with self.engine.connect() as conn:
+            rows = conn.exec_driver_sql(
+                "SELECT version, name FROM schema_version").fetchall()
+        self.assertEqual(rows, [(1, "add_lookup_indexes")])
+
+    def test_migrate_concurrent(self):
+        """Test that a version row inserted by another process counts as
+        the migration being applied"""
+        self.assertEqual(migrations.migrate(self.engine), 1)
+        with mock.patch.object(migrations, "current_version",
+                               side_effect=[0, 1]):
+            self.assertEqual(migrations.migrate(self.engine), 1)
+        with self.engine.connect() as conn:
+            rows = conn.exec_driver_sql(
+                "SELECT version, name FROM schema_version").fetchall()
+        self.assertEqual(rows, [(1, "add_lookup_indexes")])
+
+    def test_lock_mysql(self):
+        """Test that MySQL migrations hold a named lock, and only MySQL's"""
+        conn = mock.MagicMock()
+        conn.dialect.name = "mysql"
+        conn.execute.return_value.scalar.return_value = 1
+        with migrations.lock(conn):
+            self.assertEqual(conn.execute.call_count, 1)
+        statements = [str(call.args[0]) for call in conn.execute.mock_calls
+                      if call.args]
+        self.assertEqual(statements, ["SELECT GET_LOCK(:name, :timeout)",
+                                      "SELECT RELEASE_LOCK(:name)"])
+        conn.execute.return_value.scalar.return_value = 0
+        with self.assertRaises(TimeoutError):
+            with migrations.lock(conn):
+                pass
+        conn = mock.MagicMock()
+        conn.dialect.name = "sqlite"
+        with migrations.lock(conn):
+            pass
+        conn.execute.assert_not_called()
+
+    def test_migrate_new_database(self):
+        """Test that migrating a database created with the indexes works"""
+        self.engine.dispose()
+        path = os.path.join(self.dir.name, "new.db")
+        self.engine = create_engine("sqlite:///" + path)
+        models.base_model.Base.metadata.create_all(self.engine)
+        self.assertEqual(len(self.indexes()), 6)
+        self.assertEqual(migrations.migrate(self.engine), 1)
+        self.assertEqual(len(self.indexes()), 6)
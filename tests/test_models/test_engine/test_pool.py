@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Contains the TestPoolDocs and TestPool classes
+"""
+
+import inspect
+from models.engine import pool
+import os
+import pep8
+from sqlalchemy import create_engine, exc
+import tempfile
+import unittest
+PoolMonitor = pool.PoolMonitor
+TimedQueuePool = pool.TimedQueuePool
+
+
+class TestPoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the pool classes"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pool_f = inspect.getmembers(TimedQueuePool, inspect.isfunction)
+        cls.monitor_f = inspect.getmembers(PoolMonitor, inspect.isfunction)
+
+    def test_pep8_conformance_pool(self):
+        """Test that models/engine/pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pool(self):
+        """Test tests/test_models/test_engine/test_pool.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pool_module_docstring(self):
+        """Test for the pool.py module docstring"""
+        self.assertIsNot(pool.__doc__, None,
+                         "pool.py needs a docstring")
+        self.assertTrue(len(pool.__doc__) >= 1,
+                        "pool.py needs a docstring")
+
+    def test_pool_class_docstrings(self):
+        """Test for the TimedQueuePool and PoolMonitor class docstrings"""
+        for cls in [TimedQueuePool, PoolMonitor]:
+            self.assertIsNot(cls.__doc__, None,
+                             "{} class needs a docstring".format(cls))
+            self.assertTrue(len(cls.__doc__) >= 1,
+                            "{} class needs a docstring".format(cls))
+
+    def test_pool_func_docstrings(self):
+        """Test for the presence of docstrings in the pool functions"""
+        funcs = self.pool_f + self.monitor_f + [("pool_options",
+                                                 pool.pool_options)]
+        for func in funcs:
+            if func[1].__module__ != pool.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestPool(unittest.TestCase):
+    """Test the pool of an engine on a temporary SQLite database"""
+
+    def setUp(self):
+        """Sets the pool environment up for a one-connection pool"""
+        self.dir = tempfile.TemporaryDirectory()
+        self.url = "sqlite:///" + os.path.join(self.dir.name, "pool.db")
+        self.env = {"HBNB_MYSQL_POOL_SIZE": "1",
+                    "HBNB_MYSQL_POOL_OVERFLOW": "1",
+                    "HBNB_MYSQL_POOL_TIMEOUT": "0.05"}
+        os.environ.update(self.env)
+
+    def tearDown(self):
+        """Restores the environment and removes the database"""
+        for name in self.env:
+            del os.environ[name]
+        self.dir.cleanup()
+
+    def engine(self):
+        """returns an engine with the pool options and its monitor"""
+        engine = create_engine(self.url, **pool.pool_options())
+        self.addCleanup(engine.dispose)
+        return engine, PoolMonitor(engine)
+
+    def test_pool_options(self):
+        """Test that the pool arguments come from the environment"""
+        options = pool.pool_options()
+        self.assertIs(options["poolclass"], TimedQueuePool)
+        self.assertEqual(options["pool_size"], 1)
+        self.assertEqual(options["max_overflow"], 1)
+        self.assertEqual(options["pool_timeout"], 0.05)
+        self.assertTrue(options["pool_pre_ping"])
+
+    def test_checkout_stats(self):
+        """Test that checked out connections and overflow are reported"""
+        engine, monitor = self.engine()
+        first = engine.connect()
+        stats = monitor.stats()
+        self.assertEqual(stats["checked_out"], 1)
+        self.assertEqual(stats["overflow"], 0)
+        second = engine.connect()
+        stats = monitor.stats()
+        self.assertEqual(stats["checked_out"], 2)
+        self.assertEqual(stats["overflow"], 1)
+        self.assertEqual(stats["connects"], 2)
+        self.assertEqual(stats["connections"], 2)
+        self.assertGreaterEqual(stats["max_age"], stats["mean_age"])
+        second.close()
+        first.close()
+        stats = monitor.stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["connections"], 1)
+        self.assertEqual(stats["waits"], 2)
+
+    def test_exhausted_pool(self):
+        """Test that a checkout timing out is counted with its wait"""
+        engine, monitor = self.engine()
+        held = [engine.connect(), engine.connect()]
+        with self.assertRaises(exc.TimeoutError):
+            engine.connect()
+        stats = monitor.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreaterEqual(stats["max_wait"], 0.05)
+        for conn in held:
+            conn.close()
@@ -0,0 +1,211 @@
+#!/usr/bin/python3
+"""
+Contains the TestRoutingDocs, TestReplicaSet and TestRoutingSession classes
+"""
+
+import inspect
+import models
+from models.engine import routing
+from models.engine.sqlite_storage import SQLiteStorage
+from models.state import State
+import os
+import pep8
+from sqlalchemy import create_engine
+import sqlite3
+import tempfile
+import unittest
+ReplicaSet = routing.ReplicaSet
+RoutingSession = routing.RoutingSession
+
+
+class TestRoutingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the routing classes"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = [("replica_lag", routing.replica_lag)]
+        for cls_ in [ReplicaSet, RoutingSession]:
+            cls.funcs += [f for f in inspect.getmembers(cls_,
+                                                        inspect.isfunction)
+                          if f[1].__module__ == routing.__name__]
+
+    def test_pep8_conformance_routing(self):
+        """Test that models/engine/routing.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/routing.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_routing(self):
+        """Test tests/test_models/test_engine/test_routing.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_routing.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_routing_module_docstring(self):
+        """Test for the routing.py module docstring"""
+        self.assertIsNot(routing.__doc__, None,
+                         "routing.py needs a docstring")
+        self.assertTrue(len(routing.__doc__) >= 1,
+                        "routing.py needs a docstring")
+
+    def test_routing_class_docstrings(self):
+        """Test for the ReplicaSet and RoutingSession class docstrings"""
+        for cls in [ReplicaSet, RoutingSession]:
+            self.assertIsNot(cls.__doc__, None,
+                             "{} class needs a docstring".format(cls))
+            self.assertTrue(len(cls.__doc__) >= 1,
+                            "{} class needs a docstring".format(cls))
+
+    def test_routing_func_docstrings(self):
+        """Test for the presence of docstrings in the routing functions"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestReplicaSet(unittest.TestCase):
+    """Test the ReplicaSet class"""
+
+    def setUp(self):
+        """Creates three in-memory engines standing in for replicas"""
+        self.engines = [create_engine("sqlite://") for i in range(3)]
+        self.lags = {engine: 0.0 for engine in self.engines}
+
+    def probe(self, engine):
+        """returns the lag set for engine"""
+        return self.lags[engine]
+
+    def test_round_robin(self):
+        """Test that replicas are handed out in turn"""
+        replicas = ReplicaSet(self.engines, probe=self.probe)
+        chosen = [replicas.choose() for i in range(6)]
+        self.assertEqual(chosen, self.engines * 2)
+        stats = replicas.stats()
+        self.assertEqual([r["reads"] for r in stats["replicas"]], [2, 2, 2])
+        self.assertEqual(stats["fallbacks"], 0)
+
+    def test_skips_lagging(self):
+        """Test that lagging or unreachable replicas are skipped"""
+        self.lags[self.engines[0]] = 10.0
+        self.lags[self.engines[2]] = None
+        replicas = ReplicaSet(self.engines, max_lag=5, interval=0,
+                              probe=self.probe)
+        chosen = [replicas.choose() for i in range(3)]
+        self.assertEqual(chosen, [self.engines[1]] * 3)
+        self.lags[self.engines[1]] = 6.0
+        self.assertIsNone(replicas.choose())
+        self.assertEqual(replicas.stats()["fallbacks"], 1)
+        self.lags[self.engines[0]] = 1.0
+        self.assertIs(replicas.choose(), self.engines[0])
+
+    def test_probe_interval(self):
+        """Test that a replica is probed at most once per interval"""
+        probes = []
+
+        def probe(engine):
+            """records the probes"""
+            probes.append(engine)
+            return 0.0
+        replicas = ReplicaSet(self.engines[:1], interval=60, probe=probe)
+        for i in range(5):
+            replicas.choose()
+        self.assertEqual(len(probes), 1)
+
+    def test_replica_lag(self):
+        """Test that a reachable non-MySQL replica does not lag"""
+        self.assertEqual(routing.replica_lag(self.engines[0]), 0.0)
+        broken = create_engine("sqlite:////nonexistent/dir/db.sqlite")
+        self.assertIsNone(routing.replica_lag(broken))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestRoutingSession(unittest.TestCase):
+    """Test DBStorage routing reads to SQLite files standing for replicas"""
+
+    def setUp(self):
+        """Opens a storage on a primary and two replica files"""
+        self.dir = tempfile.TemporaryDirectory()
+        self.paths = [os.path.join(self.dir.name, name + ".db")
+                      for name in ["primary", "replica1", "replica2"]]
+        self.storage = SQLiteStorage(self.paths[0], self.paths[1:])
+        self.storage.reload()
+        self.replicas = []
+        for path in self.paths[1:]:
+            replica = SQLiteStorage(path)
+            replica.reload()
+            self.replicas.append(replica)
+
+    def tearDown(self):
+        """Closes the storages and removes the database files"""
+        for storage in [self.storage] + self.replicas:
+            storage.close()
+        self.dir.cleanup()
+
+    def names(self):
+        """returns the names of the states read through the storage"""
+        return sorted(s.name for s in self.storage.all(State).values())
+
+    def test_reads_from_replicas(self):
+        """Test that each session reads from the next replica"""
+        for i, replica in enumerate(self.replicas):
+            replica.new(State(name="Replica {}".format(i + 1)))
+            replica.save()
+        self.assertEqual(self.names(), ["Replica 1"])
+        self.assertEqual(self.names(), ["Replica 1"])
+        self.storage.close()
+        self.assertEqual(self.names(), ["Replica 2"])
+        self.assertEqual(len(self.storage.filter(State, name="Replica 2")),
+                         1)
+        self.storage.close()
+        stats = self.storage.replica_stats()
+        self.assertEqual([r["reads"] for r in stats["replicas"]], [1, 1])
+
+    def test_writes_go_to_primary(self):
+        """Test that writes reach the primary and later reads follow"""
+        self.replicas[0].new(State(name="Replica"))
+        self.replicas[0].save()
+        self.assertEqual(self.names(), ["Replica"])
+        state = State(name="Primary")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertEqual(self.names(), ["Primary"])
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.storage.close()
+        self.assertEqual(self.names(), [])
+        with sqlite3.connect(self.paths[0]) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM states").fetchone()
+        self.assertEqual(count, (1,))
+
+    def test_lagging_replicas_fall_back(self):
+        """Test that reads go to the primary when every replica lags"""
+        replicas = self.storage._DBStorage__replicas
+        replicas.probe = lambda engine: 60.0
+        self.replicas[0].new(State(name="Replica"))
+        self.replicas[0].save()
+        self.storage.new(State(name="Primary"))
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.names(), ["Primary"])
+        self.assertEqual(self.storage.replica_stats()["fallbacks"], 1)
+
+    def test_replica_reads_not_cached(self):
+        """Test that get caches rows read from the primary only"""
+        state = State(name="Primary")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.close()
+        self.replicas[0].new(State(id=state.id, name="Stale"))
+        self.replicas[0].save()
+        self.assertEqual(self.storage.get(State, state.id).name, "Stale")
+        self.storage.close()
+        self.assertEqual(self.storage.cache_stats()["size"], 0)
+        self.storage.new(State(name="Other"))
+        self.storage.save()
+        self.assertEqual(self.storage.get(State, state.id).name, "Primary")
+        self.storage.close()
+        self.assertEqual(self.storage.cache_stats()["size"], 1)
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializerDocs, TestSerializer and TestSerializerDB
+classes
+"""
+
+import inspect
+import json
+import models
+from models.engine import serializer
+from models.state import State
+from models.user import User
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    IsolatedFileStorage
+import unittest
+
+
+class TestSerializerDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the serializer"""
+
+    def test_pep8_conformance_serializer(self):
+        """Test that models/engine/serializer.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/serializer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_serializer(self):
+        """Test tests/test_models/test_engine/test_serializer.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_serializer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializer_docstrings(self):
+        """Test for the docstrings of the serializer functions"""
+        self.assertTrue(len(serializer.__doc__ or "") >= 1)
+        for name, func in inspect.getmembers(serializer,
+                                             inspect.isfunction):
+            if func.__module__ == serializer.__name__:
+                self.assertTrue(len(func.__doc__ or "") >= 1,
+                                "{} needs a docstring".format(name))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestSerializer(IsolatedFileStorage):
+    """Test the cached encodings of objects in file storage"""
+    def saved_state(self, name="California"):
+        """returns a new state, saved"""
+        state = State(name=name)
+        self.storage.new(state)
+        self.storage.save()
+        return state
+
+    def test_encode_matches_to_dict(self):
+        """Test that encode returns the JSON of to_dict"""
+        state = self.saved_state()
+        self.assertEqual(serializer.encode(state),
+                         json.dumps(state.to_dict(), sort_keys=True,
+                                    separators=(",", ":")).encode())
+
+    def test_clean_object_cached(self):
+        """Test that the encoding of a clean object is reused"""
+        state = self.saved_state()
+        first = serializer.encode(state)
+        self.assertIs(serializer.encode(state), first)
+
+    def test_write_invalidates(self):
+        """Test that an attribute write drops the cached encoding"""
+        state = self.saved_state()
+        serializer.encode(state)
+        state.name = "Nevada"
+        self.assertEqual(json.loads(serializer.encode(state))["name"],
+                         "Nevada")
+        self.storage.save()
+        self.assertEqual(json.loads(serializer.encode(state))["name"],
+                         "Nevada")
+
+    def test_unsaved_not_cached(self):
+        """Test that objects not stored or not saved are not cached"""
+        size = serializer.stats()["size"]
+        state = State(name="California")
+        serializer.encode(state)
+        self.storage.new(state)
+        serializer.encode(state)
+        self.assertEqual(serializer.stats()["size"], size)
+        state.name = "Nevada"
+        self.assertEqual(json.loads(serializer.encode(state))["name"],
+                         "Nevada")
+
+    def test_encode_many(self):
+        """Test that encode_many returns the JSON list of the objects"""
+        self.assertEqual(serializer.encode_many([]), b"[]")
+        states = [self.saved_state(str(i)) for i in range(3)]
+        user = User(email="a@b.c", password="pwd")
+        self.assertEqual(json.loads(serializer.encode_many(states + [user])),
+                         [obj.to_dict() for obj in states + [user]])
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestSerializerDB(unittest.TestCase):
+    """Test the encodings of objects in database storage"""
+    def test_not_cached(self):
+        """Test that database objects are encoded but never cached"""
+        size = serializer.stats()["size"]
+        state = State(name="California")
+        self.assertEqual(json.loads(serializer.encode(state)),
+                         json.loads(json.dumps(state.to_dict())))
+        self.assertEqual(serializer.stats()["size"], size)
@@ -0,0 +1,302 @@
+#!/usr/bin/python3
+"""
+Contains the TestSnapshotDocs and TestSnapshot classes
+"""
+
+import inspect
+from models.engine import snapshot
+import os
+import pep8
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+
+class TestSnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of snapshot module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.snapshot_f = inspect.getmembers(snapshot, inspect.isfunction)
+
+    def test_pep8_conformance_snapshot(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_snapshot(self):
+        """Test tests/test_models/test_engine/test_snapshot.py for PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_snapshot_module_docstring(self):
+        """Test for the snapshot.py module docstring"""
+        self.assertIsNot(snapshot.__doc__, None,
+                         "snapshot.py needs a docstring")
+        self.assertTrue(len(snapshot.__doc__) >= 1,
+                        "snapshot.py needs a docstring")
+
+    def test_snapshot_func_docstrings(self):
+        """Test for the presence of docstrings in snapshot functions"""
+        for func in self.snapshot_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test the snapshot module"""
+    def setUp(self):
+        """Create a temporary directory for the snapshots"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "file.json")
+        self.records = {"State.1": {"id": "1", "__class__": "State"}}
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test that read returns what write wrote"""
+        snapshot.write(self.path, self.records)
+        self.assertEqual(snapshot.read(self.path), self.records)
+        self.assertEqual(os.listdir(self.tmp.name), ["file.json"])
+
+    def test_header(self):
+        """Test that the snapshot starts with a checksum header"""
+        snapshot.write(self.path, self.records)
+        with open(self.path, "rb") as f:
+            header = f.readline()
+        self.assertTrue(header.startswith(snapshot.MAGIC))
+        self.assertIn(b"crc32=", header)
+
+    def test_missing(self):
+        """Test that a missing snapshot reads as empty"""
+        self.assertEqual(snapshot.read(self.path), {})
+
+    def test_legacy_json(self):
+        """Test that a plain JSON file without header is still read"""
+        with open(self.path, "w") as f:
+            f.write('{"State.1": {"id": "1", "__class__": "State"}}')
+        self.assertEqual(snapshot.read(self.path), self.records)
+
+    def test_corrupted(self):
+        """Test that a damaged body or a torn legacy file is refused"""
+        snapshot.write(self.path, self.records)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data.replace(b'"1"', b'"2"', 1))
+        with self.assertRaises(snapshot.SnapshotError):
+            snapshot.read(self.path)
+        with open(self.path, "w") as f:
+            f.write('{"State.1": {"id"')
+        with self.assertRaises(snapshot.SnapshotError):
+            snapshot.read(self.path)
+
+    def test_concurrent_writes(self):
+        """Test that writers saving at the same time do not share a
+        temporary file"""
+        errors = []
+
+        def writer(n):
+            """writes snapshots of n records"""
+            records = {"State.{}".format(i): {"id": str(i),
+                                              "__class__": "State"}
+                       for i in range(n)}
+            try:
+                for i in range(20):
+                    snapshot.write(self.path, records)
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=writer, args=(n,))
+                   for n in (100, 200, 300)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertIn(len(snapshot.read(self.path)), (100, 200, 300))
+        self.assertEqual(os.listdir(self.tmp.name), ["file.json"])
+
+    def test_failed_write_cleaned(self):
+        """Test that a failed write leaves the old snapshot and no
+        temporary file"""
+        snapshot.write(self.path, self.records)
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                snapshot.write(self.path, {})
+        self.assertEqual(os.listdir(self.tmp.name), ["file.json"])
+        self.assertEqual(snapshot.read(self.path), self.records)
+
+    def test_binary_round_trip(self):
+        """Test that the binary format keeps every kind of value"""
+        records = {
+            "Place.0b7c2f4e-9a51-4d0e-8a3c-2f6b1d9e4a10": {
+                "id": "0b7c2f4e-9a51-4d0e-8a3c-2f6b1d9e4a10",
+                "created_at": 1692800147852978,
+                "updated_at": 1692800147000000,
+                "__class__": "Place", "name": "Loft", "number_rooms": 3,
+                "latitude": 37.5, "description": None, "wifi": True,
+                "pets": False, "amenity_ids": ["a", "b"]},
+            "Place.not-a-uuid": {"id": "not-a-uuid", "__class__": "Place",
+                                 "name": "Old"},
+            "State.1": {"id": "1", "__class__": "State", "name": "CA",
+                        "created_at": -1}}
+        snapshot.write(self.path, records, "binary")
+        with open(self.path, "rb") as f:
+            self.assertIn(b" binary ", f.readline())
+        self.assertEqual(snapshot.read(self.path), records)
+
+    def test_binary_string_timestamps(self):
+        """Test that to_dict() timestamps are read back as microseconds"""
+        records = {"State.1": {"id": "1", "__class__": "State",
+                               "created_at": "2023-08-23T14:15:47.852978",
+                               "updated_at": "1969-12-31T23:59:59.999999"}}
+        snapshot.write(self.path, records, "binary")
+        record = snapshot.read(self.path)["State.1"]
+        self.assertEqual(record["created_at"], 1692800147852978)
+        self.assertEqual(record["updated_at"], -1)
+
+    def test_binary_smaller(self):
+        """Test that the binary format does not repeat attribute names"""
+        records = {}
+        for i in range(100):
+            id = "{:08x}-0000-4000-8000-000000000000".format(i)
+            records["User." + id] = {
+                "id": id, "__class__": "User", "email": "a@b.c",
+                "created_at": "2023-08-23T14:15:47.852978",
+                "updated_at": "2023-08-23T14:15:47.852978"}
+        snapshot.write(self.path, records, "json")
+        json_size = os.path.getsize(self.path)
+        snapshot.write(self.path, records, "binary")
+        self.assertLess(os.path.getsize(self.path), json_size / 2)
+
+    def test_binary_columns(self):
+        """Test that columns of mixed or non-ASCII values, or missing from
+        some records, are read back"""
+        records = {"User.{}".format(i): {"id": str(i), "__class__": "User"}
+                   for i in range(4)}
+        records["User.0"]["first_name"] = "Zoë"
+        records["User.1"]["first_name"] = "日本"
+        records["User.2"]["first_name"] = ""
+        records["User.3"]["first_name"] = "a"
+        records["User.0"]["age"] = 3
+        records["User.2"]["age"] = "3"
+        records["User.3"]["big"] = 2 ** 70
+        snapshot.write(self.path, records, "binary")
+        self.assertEqual(snapshot.read(self.path), records)
+
+    def test_binary_rows(self):
+        """Test that a binary body written record by record is still
+        read"""
+        body = b"".join([
+            snapshot.U32.pack(1), snapshot.U32.pack(5), b"State",
+            snapshot.U16.pack(1), snapshot.U32.pack(4), b"name",
+            snapshot.U32.pack(1), b"\x00",
+            bytes.fromhex("0b7c2f4e9a514d0e8a3c2f6b1d9e4a10"),
+            snapshot.TIMES.pack(1692800147852978, snapshot.NO_TIME),
+            bytes((snapshot.STR,)), snapshot.U32.pack(2), b"CA"])
+        self.assertEqual(snapshot.decode_binary(body), {
+            "State.0b7c2f4e-9a51-4d0e-8a3c-2f6b1d9e4a10": {
+                "id": "0b7c2f4e-9a51-4d0e-8a3c-2f6b1d9e4a10",
+                "__class__": "State", "created_at": 1692800147852978,
+                "name": "CA"}})
+
+    def test_unknown_format(self):
+        """Test that write refuses an unknown format"""
+        with self.assertRaises(ValueError):
+            snapshot.write(self.path, self.records, "xml")
+
+    def test_convert(self):
+        """Test converting a snapshot to binary and back"""
+        binary = os.path.join(self.tmp.name, "file.bin")
+        snapshot.write(self.path, self.records)
+        snapshot.convert(self.path, binary, "binary")
+        snapshot.convert(binary, self.path, "json")
+        self.assertEqual(snapshot.read(binary), self.records)
+        self.assertEqual(snapshot.read(self.path), self.records)
+
+    def shard_records(self, n):
+        """returns n State and n City records"""
+        records = {}
+        for name in ["State", "City"]:
+            for i in range(n):
+                id = "{}-{}".format(name, i)
+                records[name + "." + id] = {"id": id, "__class__": name}
+        return records
+
+    def shards(self):
+        """returns the sorted names of the shard files"""
+        return sorted(f for f in os.listdir(self.tmp.name) if ".shard-" in f)
+
+    def test_shards(self):
+        """Test that a big snapshot is split by class and read back"""
+        records = self.shard_records(5)
+        snapshot.write(self.path, records, "binary", shard_min=10,
+                       shard_size=2)
+        shards = self.shards()
+        self.assertEqual(len(shards), 6)
+        self.assertEqual(len([f for f in shards if "-State-" in f]), 3)
+        with open(self.path, "rb") as f:
+            self.assertIn(b" shards ", f.readline())
+        self.assertEqual(snapshot.read(self.path), records)
+        self.assertEqual(snapshot.read(self.path, workers=3), records)
+
+    def test_shards_no_fork_with_threads(self):
+        """Test that shards are decoded in turn while other threads run"""
+        records = self.shard_records(5)
+        snapshot.write(self.path, records, shard_min=10, shard_size=2)
+        done = threading.Event()
+        thread = threading.Thread(target=done.wait)
+        thread.start()
+        try:
+            with mock.patch.object(snapshot, "ProcessPoolExecutor",
+                                   side_effect=AssertionError("forked")):
+                self.assertEqual(snapshot.read(self.path, workers=3),
+                                 records)
+        finally:
+            done.set()
+            thread.join()
+
+    def test_shards_replaced(self):
+        """Test that rewriting a snapshot removes the old shards"""
+        snapshot.write(self.path, self.shard_records(5), shard_min=10,
+                       shard_size=2)
+        old = self.shards()
+        records = self.shard_records(6)
+        snapshot.write(self.path, records, shard_min=10, shard_size=100)
+        self.assertEqual(len(self.shards()), 2)
+        self.assertFalse(set(old) & set(self.shards()))
+        self.assertEqual(snapshot.read(self.path, workers=2), records)
+
+    def test_unchanged_shards_kept(self):
+        """Test that the shards of classes without changes are kept"""
+        records = self.shard_records(5)
+        snapshot.write(self.path, records, shard_min=10, shard_size=2)
+        old = self.shards()
+        records["State.State-0"]["name"] = "California"
+        snapshot.write(self.path, records, shard_min=10, shard_size=2,
+                       changed={"State"})
+        new = self.shards()
+        self.assertEqual([f for f in new if "-City-" in f],
+                         [f for f in old if "-City-" in f])
+        self.assertFalse({f for f in old if "-State-" in f} & set(new))
+        self.assertEqual(len(new), 6)
+        self.assertEqual(snapshot.read(self.path), records)
+
+    def test_small_snapshot_not_sharded(self):
+        """Test that below shard_min a single file is written"""
+        snapshot.write(self.path, self.shard_records(5), shard_min=10,
+                       shard_size=2)
+        records = self.shard_records(2)
+        snapshot.write(self.path, records, shard_min=10, shard_size=2)
+        self.assertEqual(self.shards(), [])
+        self.assertEqual(snapshot.read(self.path), records)
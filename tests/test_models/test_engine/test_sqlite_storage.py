@@ -0,0 +1,466 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+import inspect
+import models
+from models.engine import sqlite_storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import tempfile
+from tests.query_count import QueryCounter, assert_queries
+import unittest
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sqs_f = inspect.getmembers(SQLiteStorage, inspect.isfunction)
+
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_sqlite_storage(self):
+        """Test tests/test_models/test_sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_module_docstring(self):
+        """Test for the sqlite_storage.py module docstring"""
+        self.assertIsNot(sqlite_storage.__doc__, None,
+                         "sqlite_storage.py needs a docstring")
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1,
+                        "sqlite_storage.py needs a docstring")
+
+    def test_sqlite_storage_class_docstring(self):
+        """Test for the SQLiteStorage class docstring"""
+        self.assertIsNot(SQLiteStorage.__doc__, None,
+                         "SQLiteStorage class needs a docstring")
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1,
+                        "SQLiteStorage class needs a docstring")
+
+    def test_sqs_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteStorage methods"""
+        for func in self.sqs_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class on a temporary database file"""
+    def setUp(self):
+        """Opens a storage on an empty database file"""
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "hbnb.db")
+        self.storage = SQLiteStorage(self.path)
+        self.storage.reload()
+
+    def tearDown(self):
+        """Closes the storage and removes the database file"""
+        self.storage.close()
+        self.dir.cleanup()
+
+    def test_path_from_environment(self):
+        """Test that the database file defaults to HBNB_SQLITE_PATH"""
+        os.environ["HBNB_SQLITE_PATH"] = self.path
+        try:
+            storage = SQLiteStorage()
+        finally:
+            del os.environ["HBNB_SQLITE_PATH"]
+        storage.reload()
+        storage.close()
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_wal_mode(self):
+        """Test that connections use WAL mode and foreign keys"""
+        session = self.storage._DBStorage__session()
+        mode = session.connection().exec_driver_sql(
+            "PRAGMA journal_mode").scalar()
+        keys = session.connection().exec_driver_sql(
+            "PRAGMA foreign_keys").scalar()
+        self.assertEqual(mode, "wal")
+        self.assertEqual(keys, 1)
+
+    def test_save_persists(self):
+        """Test that saved objects are read back by a new storage"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        env = os.environ.pop("HBNB_ENV", None)
+        try:
+            other = SQLiteStorage(self.path)
+        finally:
+            if env is not None:
+                os.environ["HBNB_ENV"] = env
+        other.reload()
+        self.assertEqual(other.get(State, state.id).name, "California")
+        self.assertEqual(other.count(State), 1)
+        other.close()
+
+    def test_delete(self):
+        """Test that a deleted object is gone after save"""
+        state = State(name="Nevada")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.delete(state)
+        self.storage.save()
+        self.assertIsNone(self.storage.get(State, state.id))
+
+    def test_counts(self):
+        """Test that count and counts follow the saved rows through the
+        live counters"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        for name in ["Napa", "Fresno"]:
+            self.storage.new(City(name=name, state_id=state.id))
+        self.storage.save()
+        counts = self.storage.counts()
+        self.assertEqual(counts["State"], 1)
+        self.assertEqual(counts["City"], 2)
+        self.assertEqual(counts["User"], 0)
+        self.assertEqual(self.storage.count(), 3)
+        self.assertEqual(self.storage.count(City), 2)
+        self.assertEqual(self.storage.count("State"), 1)
+
+    def test_counts_single_query(self):
+        """Test that counts reads the counters, reconcile one SELECT"""
+        statements = self.count_queries()
+        self.storage.counts()
+        self.assertEqual(statements, [])
+        self.storage.reconcile()
+        self.assertEqual(len(statements), 1)
+        self.assertIn("UNION ALL", statements[0])
+
+    def test_counters_follow_commits(self):
+        """Test that the counters count committed and pending changes"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.assertEqual(self.storage.count(State), 1)
+        self.storage._DBStorage__session.flush()
+        self.assertEqual(self.storage.count(State), 1)
+        self.storage.close()
+        self.assertEqual(self.storage.count(State), 0)
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.count(State), 1)
+        self.storage.delete(self.storage.get(State, state.id))
+        self.storage.save()
+        self.assertEqual(self.storage.count(State), 0)
+        self.storage.bulk_save([State(name=str(i)) for i in range(3)])
+        self.assertEqual(self.storage.counts()["State"], 3)
+        self.assertEqual(self.storage.reconcile(), {})
+
+    def test_reconcile_drift(self):
+        """Test that reconcile corrects and reports the rows of others"""
+        env = os.environ.pop("HBNB_ENV", None)
+        try:
+            other = SQLiteStorage(self.path)
+        finally:
+            if env is not None:
+                os.environ["HBNB_ENV"] = env
+        other.reload()
+        other.new(State(name="California"))
+        other.new(State(name="Nevada"))
+        other.save()
+        other.close()
+        self.assertEqual(self.storage.count(State), 0)
+        self.assertEqual(self.storage.reconcile(), {"State": -2})
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertEqual(self.storage.reconcile(), {})
+
+    def test_pending(self):
+        """Test that pending lists the changes not committed yet"""
+        state = State(name="California")
+        key = "State." + state.id
+        self.storage.new(state)
+        self.assertEqual(self.storage.pending(),
+                         {"new": [key], "dirty": [], "deleted": []})
+        self.storage._DBStorage__session.flush()
+        self.assertEqual(self.storage.pending()["new"], [key])
+        self.storage.save()
+        self.assertEqual(self.storage.pending(),
+                         {"new": [], "dirty": [], "deleted": []})
+        state.name = "Nevada"
+        self.assertEqual(self.storage.pending()["dirty"], [key])
+        self.storage.save()
+        self.storage.delete(state)
+        self.assertEqual(self.storage.pending()["deleted"], [key])
+        self.storage.close()
+        self.assertEqual(self.storage.pending()["deleted"], [])
+
+    def test_is_dirty(self):
+        """Test that is_dirty holds until the changes of an object commit"""
+        state = State(name="California")
+        self.assertTrue(self.storage.is_dirty(state))
+        self.storage.new(state)
+        self.assertTrue(self.storage.is_dirty(state))
+        self.storage.save()
+        self.assertFalse(self.storage.is_dirty(state))
+        state.name = "Nevada"
+        self.assertTrue(self.storage.is_dirty(state))
+        self.storage.save()
+        self.assertFalse(self.storage.is_dirty(state))
+
+    def count_queries(self):
+        """returns a list that collects the statements run on the engine"""
+        self.counter = QueryCounter(self.storage._DBStorage__engine)
+        self.counter.__enter__()
+        self.addCleanup(self.counter.__exit__)
+        return self.counter.statements
+
+    def test_get_cached(self):
+        """Test that get serves objects read earlier from the cache"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, state.id).name, "California")
+        self.storage.close()
+        statements = self.count_queries()
+        cached = self.storage.get(State, state.id)
+        self.assertEqual(statements, [])
+        self.assertEqual(cached.name, "California")
+        self.assertEqual(self.storage.cache_stats()["hits"], 1)
+        self.assertIs(self.storage.get(State, state.id), cached)
+        self.storage.new(City(name="Napa", state_id=state.id))
+        self.storage.save()
+        self.assertEqual(len(cached.cities), 1)
+
+    def test_get_invalidated(self):
+        """Test that saving or deleting an object drops its cached copy"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.close()
+        state = self.storage.get(State, state.id)
+        state.name = "Nevada"
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, state.id).name, "Nevada")
+        self.storage.close()
+        state = self.storage.get(State, state.id)
+        self.storage.delete(state)
+        self.storage.save()
+        self.storage.close()
+        self.assertIsNone(self.storage.get(State, state.id))
+
+    def test_get_cache_disabled(self):
+        """Test that HBNB_DB_CACHE_SIZE=0 makes every get query"""
+        os.environ["HBNB_DB_CACHE_SIZE"] = "0"
+        try:
+            self.storage = SQLiteStorage(self.path)
+        finally:
+            del os.environ["HBNB_DB_CACHE_SIZE"]
+        self.storage.reload()
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.close()
+        self.storage.get(State, state.id)
+        self.storage.close()
+        statements = self.count_queries()
+        self.assertEqual(self.storage.get(State, state.id).name, "California")
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(self.storage.cache_stats()["hits"], 0)
+
+    def test_pool_stats(self):
+        """Test that the storage reports the state of its connection pool"""
+        self.storage.all(State)
+        stats = self.storage.pool_stats()
+        self.assertEqual(stats["checked_out"], 1)
+        self.assertEqual(stats["connections"], 1)
+        self.storage.close()
+        stats = self.storage.pool_stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["timeouts"], 0)
+
+    def test_bulk_save(self):
+        """Test that bulk_save inserts rows with one INSERT per batch"""
+        states = [State(name="State {}".format(i)) for i in range(5)]
+        statements = self.count_queries()
+        stats = self.storage.bulk_save(states, batch_size=2)
+        self.assertEqual(stats["rows"], 5)
+        self.assertEqual(stats["batches"], 3)
+        self.assertEqual(len([s for s in statements
+                              if s.startswith("INSERT")]), 3)
+        self.assertEqual(self.storage.count(State), 5)
+        self.assertEqual(self.storage.get(State, states[3].id).name,
+                         "State 3")
+
+    def test_bulk_save_dicts(self):
+        """Test that bulk_save builds objects from dictionaries"""
+        state = State(name="California")
+        self.storage.bulk_save([state])
+        cities = [{"__class__": "City", "name": "Napa",
+                   "state_id": state.id},
+                  {"name": "Fresno", "state_id": state.id}]
+        self.storage.bulk_save(cities[:1])
+        self.storage.bulk_save(cities[1:], City)
+        self.storage.close()
+        state = self.storage.get(State, state.id)
+        self.assertEqual(sorted(c.name for c in state.cities),
+                         ["Fresno", "Napa"])
+
+    def test_bulk_new(self):
+        """Test that bulk_new adds objects saved by the next save"""
+        objs = self.storage.bulk_new([{"__class__": "State",
+                                       "name": "Texas"}])
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, objs[0].id).name, "Texas")
+
+    def test_all_pages(self):
+        """Test that all with limit and after pages through ids in order"""
+        states = [State(name=str(i)) for i in range(5)]
+        self.storage.bulk_save(states)
+        ids = sorted(state.id for state in states)
+        page = self.storage.all(State, limit=2)
+        self.assertEqual([obj.id for obj in page.values()], ids[:2])
+        page = self.storage.all(State, limit=2, after=ids[1])
+        self.assertEqual([obj.id for obj in page.values()], ids[2:4])
+        page = self.storage.all(State, after=ids[3])
+        self.assertEqual([obj.id for obj in page.values()], ids[4:])
+        city = City(name="Napa", state_id=ids[0])
+        self.storage.bulk_save([city])
+        page = self.storage.all(limit=2)
+        self.assertEqual(list(page), ["City." + city.id, "State." + ids[0]])
+        page = self.storage.all(limit=2, after="City." + city.id)
+        self.assertEqual(list(page), ["State." + id for id in ids[:2]])
+
+    def test_load_relationships(self):
+        """Test that load reads relationships without a query per object"""
+        states = [State(name=str(i)) for i in range(3)]
+        self.storage.bulk_save(states)
+        self.storage.bulk_save([City(name=str(i), state_id=state.id)
+                                for i in range(2) for state in states])
+        self.storage.close()
+        with assert_queries(self, 2, self.storage._DBStorage__engine):
+            found = self.storage.all(State, load=["cities"]).values()
+            self.assertEqual([len(state.cities) for state in found],
+                             [2, 2, 2])
+        self.storage.close()
+        with assert_queries(self, 1, self.storage._DBStorage__engine):
+            state = self.storage.get(State, states[0].id,
+                                     load={"cities": "joined"})
+            self.assertEqual(len(state.cities), 2)
+        self.storage.close()
+        # one query per class, then one for cities and one for places
+        with assert_queries(self, 8, self.storage._DBStorage__engine):
+            found = self.storage.all(load=["cities.places"])
+            self.assertEqual(len(found), 9)
+            for obj in found.values():
+                if isinstance(obj, State):
+                    self.assertEqual([c.places for c in obj.cities],
+                                     [[], []])
+
+    def test_load_unknown(self):
+        """Test that load rejects unknown relationships and strategies"""
+        with self.assertRaises(AttributeError):
+            self.storage.all(State, load=["towns"])
+        with self.assertRaises(ValueError):
+            self.storage.all(State, load={"cities": "lazy"})
+
+    def test_iter(self):
+        """Test that iter streams the objects by id in batches"""
+        states = [State(name=str(i)) for i in range(5)]
+        self.storage.bulk_save(states)
+        city = City(name="Napa", state_id=states[0].id)
+        self.storage.bulk_save([city])
+        ids = sorted(state.id for state in states)
+        with assert_queries(self, 1, self.storage._DBStorage__engine):
+            found = [obj.id for obj in self.storage.iter(State,
+                                                         batch_size=2)]
+        self.assertEqual(found, ids)
+        self.assertEqual([obj.id for obj in self.storage.iter()],
+                         [city.id] + ids)
+        loaded = self.storage.iter(State, load=["cities"])
+        self.assertEqual([len(state.cities) for state in loaded],
+                         [int(id == states[0].id) for id in ids])
+
+    def test_filter(self):
+        """Test that filter runs one query with a WHERE clause"""
+        states = [State(name=name) for name in ["Arizona", "Ohio", "Utah"]]
+        self.storage.bulk_save(states)
+        cities = [City(name=str(i), state_id=states[i % 2].id)
+                  for i in range(4)]
+        self.storage.bulk_save(cities)
+        statements = self.count_queries()
+        found = self.storage.filter(City, state_id=states[0].id,
+                                    name__gte="1")
+        self.assertEqual([c.name for c in found.values()], ["2"])
+        self.assertEqual(len(statements), 1)
+        self.assertIn("WHERE", statements[0])
+        found = self.storage.filter("State", name__in=["Ohio", "Utah"],
+                                    name__lt="Texas")
+        self.assertEqual(list(found), ["State." + states[1].id])
+        found = self.storage.filter(State, created_at__lte=states[2].
+                                    created_at)
+        self.assertEqual(len(found), 3)
+
+    def test_filter_limit(self):
+        """Test that filter with limit runs one bounded keyset query"""
+        state = State(name="California")
+        cities = [City(name=str(i), state_id=state.id) for i in range(5)]
+        self.storage.bulk_save([state] + cities)
+        ids = sorted(city.id for city in cities)
+        statements = self.count_queries()
+        found = self.storage.filter(City, limit=2, state_id=state.id,
+                                    id__gt=ids[1])
+        self.assertEqual([c.id for c in found.values()], ids[2:4])
+        self.assertEqual(len(statements), 1)
+        self.assertIn("LIMIT", statements[0])
+
+    def query_plan(self, statement, parameters=()):
+        """returns the EXPLAIN QUERY PLAN details of a statement"""
+        session = self.storage._DBStorage__session()
+        rows = session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        return " ".join(row[-1] for row in rows)
+
+    def test_relationships_use_indexes(self):
+        """Test that the relationship queries search the lookup indexes"""
+        state = State(name="California")
+        user = User(email="a@b.c", password="pwd")
+        self.storage.bulk_save([state, user])
+        city = City(name="Napa", state_id=state.id)
+        self.storage.bulk_save([city])
+        place = Place(name="Loft", city_id=city.id, user_id=user.id)
+        self.storage.bulk_save([place])
+        self.storage.close()
+        state = self.storage.get(State, state.id)
+        city = self.storage.get(City, city.id)
+        user = self.storage.get(User, user.id)
+        place = self.storage.get(Place, place.id)
+        statements = self.count_queries()
+        for query, index in [(lambda: state.cities, "ix_cities_state_id"),
+                             (lambda: city.places, "ix_places_city_id"),
+                             (lambda: user.places, "ix_places_user_id"),
+                             (lambda: place.reviews, "ix_reviews_place_id"),
+                             (lambda: user.reviews, "ix_reviews_user_id"),
+                             (lambda: self.storage.filter(
+                                 User, email="a@b.c"), "ix_users_email")]:
+            query()
+            plan = self.query_plan(statements[-1],
+                                   self.counter.parameters[-1])
+            self.assertIn("USING INDEX " + index, plan)
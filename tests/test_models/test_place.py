@@ -196,5 +196,7 @@ class TestPlace(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         place = Place()
-        string = "[Place] ({}) {}".format(place.id, place.__dict__)
+        attrs = dict(place.__dict__)
+        attrs.update(created_at=place.created_at, updated_at=place.updated_at)
+        string = "[Place] ({}) {}".format(place.id, attrs)
         self.assertEqual(string, str(place))
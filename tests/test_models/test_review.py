@@ -119,5 +119,8 @@ class TestReview(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         review = Review()
-        string = "[Review] ({}) {}".format(review.id, review.__dict__)
+        attrs = dict(review.__dict__)
+        attrs.update(created_at=review.created_at,
+                     updated_at=review.updated_at)
+        string = "[Review] ({}) {}".format(review.id, attrs)
         self.assertEqual(string, str(review))
@@ -101,5 +101,7 @@ class TestState(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         state = State()
-        string = "[State] ({}) {}".format(state.id, state.__dict__)
+        attrs = dict(state.__dict__)
+        attrs.update(created_at=state.created_at, updated_at=state.updated_at)
+        string = "[State] ({}) {}".format(state.id, attrs)
         self.assertEqual(string, str(state))
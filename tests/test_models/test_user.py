@@ -128,5 +128,7 @@ class TestUser(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         user = User()
-        string = "[User] ({}) {}".format(user.id, user.__dict__)
+        attrs = dict(user.__dict__)
+        attrs.update(created_at=user.created_at, updated_at=user.updated_at)
+        string = "[User] ({}) {}".format(user.id, attrs)
         self.assertEqual(string, str(user))